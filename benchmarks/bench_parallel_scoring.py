@@ -0,0 +1,85 @@
+"""Measure how ``model_pipeline score --workers N`` scales with the number of processes.
+
+Run from project root:
+    python benchmarks/bench_parallel_scoring.py --rows 400000 --max-workers 8
+
+A synthetic CSV is generated once, then scored with 1, 2, 4, ... workers up
+to ``--max-workers`` (default: the CPU count). Each run reports rows/sec,
+speedup over a single worker and parallel efficiency (speedup / workers);
+near-linear scaling shows up as efficiency close to 1.0. Use ``--json`` to
+write the measurements to a file for comparison between commits.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from synthetic import ARTIFACTS_DIR, write_synthetic_csv  # noqa: E402
+
+from batch_scoring import score_csv  # noqa: E402
+from kickstarter_runtime import load_runtime  # noqa: E402
+
+
+def _worker_counts(max_workers: int):
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=400_000)
+    parser.add_argument("--chunksize", type=int, default=25_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--model-dir", default=str(ARTIFACTS_DIR))
+    parser.add_argument("--json", help="Optional path for the JSON results")
+    args = parser.parse_args()
+
+    runtime = load_runtime(Path(args.model_dir))
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = write_synthetic_csv(Path(tmp) / "campaigns.csv", args.rows)
+        baseline = None
+        print(f"{'workers':>8} {'seconds':>9} {'rows/sec':>12} {'speedup':>8} {'efficiency':>10}")
+        for workers in _worker_counts(args.max_workers):
+            summary = score_csv(
+                csv_path,
+                Path(tmp) / "scored.csv",
+                runtime,
+                chunksize=args.chunksize,
+                workers=workers,
+                model_dir=Path(args.model_dir),
+                progress=lambda *_: None,
+            )
+            baseline = baseline or summary["seconds"]
+            speedup = baseline / summary["seconds"]
+            row = {
+                "workers": workers,
+                "seconds": summary["seconds"],
+                "rows_per_sec": summary["rows"] / summary["seconds"],
+                "speedup": speedup,
+                "efficiency": speedup / workers,
+            }
+            results.append(row)
+            print(
+                f"{workers:>8} {row['seconds']:>9.2f} {row['rows_per_sec']:>12,.0f} "
+                f"{row['speedup']:>8.2f} {row['efficiency']:>10.2f}"
+            )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"rows": args.rows, "chunksize": args.chunksize, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
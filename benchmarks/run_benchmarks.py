@@ -0,0 +1,288 @@
+"""Latency and throughput benchmarks for the prediction hot paths.
+
+Run from project root:
+    python benchmarks/run_benchmarks.py --json bench.json
+    python benchmarks/run_benchmarks.py --json new.json --compare bench.json
+
+Every benchmark is timed over several repeats after a warm-up call and
+reported with p50/p95/p99 latency and rows/sec (rows / p50), together with
+the commit, Python and library versions, so results from two commits can be
+compared with ``--compare``. Campaigns are synthetic, drawn from the
+vocabularies in ``artifacts/feature_columns.json`` (see ``synthetic.py``).
+
+Benchmarks:
+
+- ``cold_load_runtime`` / ``cold_load_keras``: import and load the NumPy
+  runtime bundle / the Keras artifacts in a fresh interpreter.
+- ``predict_single``: ``predict_success_probability`` for one campaign.
+- ``predict_batch_<n>``: ``predict_success_probabilities`` for 1, 100,
+  10,000 and 100,000 campaigns.
+- ``preprocess_features_10000``: ``preprocess_features`` alone.
+- ``parse_dates_<n>`` / ``parse_dates_pandas_<n>``: ``parse_date_parts`` on
+  the ``launched`` timestamps, against ``pd.to_datetime`` with format
+  inference; ``parse_dates_single`` is one repeated date (the cached path).
+- ``upload_<n>``: the Flask ``/upload`` route through the test client,
+  with the prediction cache disabled so every request is scored.
+
+``--quick`` uses fewer repeats and skips the 100,000-row batch.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from synthetic import ARTIFACTS_DIR, synthetic_campaigns  # noqa: E402
+
+BATCH_SIZES = [1, 100, 10_000, 100_000]
+UPLOAD_ROWS = 1_000
+DATE_ROWS = 100_000
+
+_COLD_LOAD_SCRIPTS = {
+    "runtime": (
+        "from kickstarter_runtime import load_runtime\n"
+        "runtime = load_runtime(model_dir)\n"
+    ),
+    "keras": (
+        "from model_pipeline import load_artifacts\n"
+        "model, scaler, feature_columns = load_artifacts(model_dir)\n"
+    ),
+}
+
+
+def summarize(timings: List[float], rows: int) -> Dict[str, float]:
+    """Turn per-call wall times (seconds) into latency percentiles and throughput."""
+
+    milliseconds = np.asarray(timings) * 1000.0
+    p50 = float(np.percentile(milliseconds, 50))
+    return {
+        "repeats": len(timings),
+        "rows": rows,
+        "p50_ms": p50,
+        "p95_ms": float(np.percentile(milliseconds, 95)),
+        "p99_ms": float(np.percentile(milliseconds, 99)),
+        "mean_ms": float(milliseconds.mean()),
+        "rows_per_sec": rows / (p50 / 1000.0) if rows and p50 > 0 else None,
+    }
+
+
+def measure(fn: Callable[[], object], *, repeats: int, rows: int, warmup: int = 1) -> Dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return summarize(timings, rows)
+
+
+def cold_load(kind: str, model_dir: Path, repeats: int) -> Dict[str, float]:
+    """Time imports plus artifact loading in fresh interpreters (interpreter start-up excluded)."""
+
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "import sys\n"
+        "from pathlib import Path\n"
+        f"sys.path.insert(0, {str(PROJECT_ROOT / 'src')!r})\n"
+        f"model_dir = Path({str(model_dir)!r})\n"
+        f"{_COLD_LOAD_SCRIPTS[kind]}"
+        "print(time.perf_counter() - start)\n"
+    )
+    timings = []
+    for _ in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=PROJECT_ROOT
+        )
+        timings.append(float(completed.stdout.strip().splitlines()[-1]))
+    return summarize(timings, rows=0)
+
+
+def _upload_client():
+    # Score every request: no cache hits, no background model watcher.
+    os.environ["KICKSTARTER_CACHE_SIZE"] = "0"
+    os.environ.setdefault("MODEL_WATCH_INTERVAL", "0")
+    sys.path.insert(0, str(PROJECT_ROOT / "webapp"))
+    # The app prints start-up messages; keep stdout for the JSON report.
+    with contextlib.redirect_stdout(sys.stderr):
+        from app import app
+
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+def run_benchmarks(model_dir: Path, *, quick: bool = False, only: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """Run the selected benchmarks and return their summaries keyed by name."""
+
+    from kickstarter_runtime import parse_date_parts
+    from model_pipeline import (
+        load_artifacts,
+        predict_success_probabilities,
+        predict_success_probability,
+        preprocess_features,
+    )
+
+    scale = 0.2 if quick else 1.0
+
+    def repeats(count: int) -> int:
+        return max(3, int(count * scale))
+
+    def selected(name: str) -> bool:
+        return not only or any(name.startswith(prefix) for prefix in only)
+
+    results: Dict[str, Dict] = {}
+
+    def record(name: str, summary: Dict[str, float]) -> None:
+        results[name] = summary
+        throughput = f"{summary['rows_per_sec']:>14,.0f} rows/sec" if summary["rows_per_sec"] else ""
+        print(
+            f"{name:<28} p50 {summary['p50_ms']:>10.3f} ms  p95 {summary['p95_ms']:>10.3f} ms  "
+            f"p99 {summary['p99_ms']:>10.3f} ms  {throughput}",
+            file=sys.stderr,
+        )
+
+    if selected("cold_load_runtime"):
+        record("cold_load_runtime", cold_load("runtime", model_dir, repeats(10)))
+    if selected("cold_load_keras"):
+        record("cold_load_keras", cold_load("keras", model_dir, repeats(5)))
+
+    model, scaler, feature_columns = load_artifacts(model_dir)
+    largest = max(BATCH_SIZES[:-1] if quick else BATCH_SIZES)
+    frame = synthetic_campaigns(max(largest, UPLOAD_ROWS), model_dir=model_dir)
+    campaigns = frame.to_dict(orient="records")
+
+    if selected("predict_single"):
+        record(
+            "predict_single",
+            measure(
+                lambda: predict_success_probability(campaigns[0], model, scaler, feature_columns),
+                repeats=repeats(500),
+                rows=1,
+            ),
+        )
+    for size in BATCH_SIZES:
+        name = f"predict_batch_{size}"
+        if size > largest or not selected(name):
+            continue
+        batch = frame.iloc[:size]
+        record(
+            name,
+            measure(
+                lambda: predict_success_probabilities(batch, model, scaler, feature_columns),
+                repeats=repeats(max(5, 2000 // max(size, 1) + 5)),
+                rows=size,
+            ),
+        )
+    if selected("preprocess_features"):
+        sample = frame.iloc[:10_000]
+        record(
+            "preprocess_features_10000",
+            measure(
+                lambda: preprocess_features(sample, feature_columns=feature_columns), repeats=repeats(20), rows=10_000
+            ),
+        )
+    if selected("parse_dates"):
+        dates = synthetic_campaigns(DATE_ROWS, model_dir=model_dir)["launched"].to_numpy(dtype=object)
+        record(
+            f"parse_dates_{DATE_ROWS}",
+            measure(lambda: parse_date_parts(dates), repeats=repeats(20), rows=DATE_ROWS),
+        )
+        record(
+            f"parse_dates_pandas_{DATE_ROWS}",
+            measure(
+                lambda: pd.DatetimeIndex(pd.to_datetime(dates, errors="coerce")).year,
+                repeats=repeats(20),
+                rows=DATE_ROWS,
+            ),
+        )
+        record("parse_dates_single", measure(lambda: parse_date_parts(dates[:1]), repeats=repeats(500), rows=1))
+    if selected("upload"):
+        client = _upload_client()
+        payload = frame.iloc[:UPLOAD_ROWS].to_csv(index=False).encode("utf-8")
+
+        def upload() -> None:
+            response = client.post(
+                "/upload",
+                data={"file": (io.BytesIO(payload), "campaigns.csv")},
+                content_type="multipart/form-data",
+            )
+            if response.status_code != 200:
+                raise RuntimeError(f"/upload returned {response.status_code}: {response.get_data(as_text=True)}")
+
+        record(f"upload_{UPLOAD_ROWS}", measure(upload, repeats=repeats(20), rows=UPLOAD_ROWS))
+
+    return results
+
+
+def environment() -> Dict[str, object]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=PROJECT_ROOT
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def compare(current: Dict[str, Dict], baseline_path: Path) -> None:
+    """Print the p50 change of every benchmark against a previous JSON report."""
+
+    with open(baseline_path, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+    print(f"{'benchmark':<28} {'baseline p50':>14} {'current p50':>14} {'change':>8}")
+    for name, summary in current.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        change = summary["p50_ms"] / previous["p50_ms"] - 1.0 if previous["p50_ms"] else 0.0
+        print(f"{name:<28} {previous['p50_ms']:>11.3f} ms {summary['p50_ms']:>11.3f} ms {change:>+8.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-dir", default=str(ARTIFACTS_DIR))
+    parser.add_argument("--quick", action="store_true", help="Fewer repeats and no 100,000-row batch")
+    parser.add_argument("--only", help="Comma-separated benchmark name prefixes, e.g. predict_batch,upload")
+    parser.add_argument("--json", help="Write the report to this file instead of stdout")
+    parser.add_argument("--compare", help="Previous JSON report to compare p50 latencies against")
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        Path(args.model_dir), quick=args.quick, only=args.only.split(",") if args.only else None
+    )
+    report = {"environment": environment(), "quick": args.quick, "results": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        compare(results, Path(args.compare))
+
+
+if __name__ == "__main__":
+    main()
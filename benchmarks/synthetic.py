@@ -0,0 +1,77 @@
+"""Synthetic Kickstarter campaigns for benchmarks.
+
+Campaigns are drawn from the category, main category, currency and country
+vocabularies stored in ``artifacts/feature_columns.json`` so every one-hot
+column the model knows about can be exercised, with numeric fields and
+dates in the same formats as ``ks-projects-201801.csv``.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ARTIFACTS_DIR = PROJECT_ROOT / "artifacts"
+
+CATEGORICAL_COLUMNS = ["category", "main_category", "currency", "country"]
+
+
+def load_vocabularies(model_dir: Path = ARTIFACTS_DIR) -> Dict[str, List[str]]:
+    """Return the known values of every categorical column."""
+
+    with open(Path(model_dir) / "feature_columns.json", "r", encoding="utf-8") as file:
+        feature_columns = json.load(file)
+
+    vocabularies: Dict[str, List[str]] = {column: [] for column in CATEGORICAL_COLUMNS}
+    for name in feature_columns:
+        for column in sorted(CATEGORICAL_COLUMNS, key=len, reverse=True):
+            if name.startswith(f"{column}_"):
+                vocabularies[column].append(name[len(column) + 1 :])
+                break
+    return vocabularies
+
+
+def synthetic_campaigns(n_rows: int, *, seed: int = 34, model_dir: Path = ARTIFACTS_DIR) -> pd.DataFrame:
+    """Generate ``n_rows`` raw campaigns shaped like the Kickstarter CSV."""
+
+    rng = np.random.default_rng(seed)
+    vocabularies = load_vocabularies(model_dir)
+
+    goal = np.round(rng.lognormal(mean=8.5, sigma=1.3, size=n_rows), 2)
+    pledged = np.round(goal * rng.gamma(shape=0.8, scale=1.0, size=n_rows), 2)
+    launched = pd.Timestamp("2009-05-01") + pd.to_timedelta(rng.integers(0, 3_100, size=n_rows), unit="D")
+    launched = launched + pd.to_timedelta(rng.integers(0, 86_400, size=n_rows), unit="s")
+    deadline = launched.normalize() + pd.to_timedelta(rng.integers(7, 60, size=n_rows), unit="D")
+
+    frame = pd.DataFrame(
+        {
+            "ID": np.arange(n_rows),
+            "name": [f"Campaign {index}" for index in range(n_rows)],
+            "goal": goal,
+            "pledged": pledged,
+            "backers": rng.poisson(lam=np.maximum(pledged / 80.0, 0.1)),
+            "usd pledged": pledged,
+            "usd_pledged_real": pledged,
+            "usd_goal_real": goal,
+            "deadline": deadline.strftime("%Y-%m-%d"),
+            "launched": launched.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+    )
+    for column, values in vocabularies.items():
+        frame[column] = rng.choice(values, size=n_rows)
+    return frame
+
+
+def write_synthetic_csv(path: Path, n_rows: int, *, seed: int = 34, chunk_rows: int = 100_000) -> Path:
+    """Write ``n_rows`` synthetic campaigns to ``path`` without holding them all in memory."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for offset in range(0, n_rows, chunk_rows):
+        frame = synthetic_campaigns(min(chunk_rows, n_rows - offset), seed=seed + offset)
+        frame["ID"] += offset
+        frame.to_csv(path, mode="w" if offset == 0 else "a", header=offset == 0, index=False)
+    return path
@@ -1,22 +1,33 @@
 """
-Excel listener: opens an Excel template and waits for the user to enter a sample campaign in the "Sample Input" row.
-When the row changes, it calls the project's prediction function and writes the probability into the sheet.
+Excel listener: opens an Excel template and scores campaigns as they are entered on the "Predict" sheet.
+Every edited row under the headers is run through the model and its probability is written into the Result column.
 
 Usage:
   1. Activate your project's virtualenv where `xlwings` is installed.
-  2. Run: python excel_listener.py
-  3. Excel will open the template (created automatically if missing). Edit the row under the headers and save.
-  4. The script will detect the change, run the model, and write the probability in the Result column.
+  2. Run: python excel_listener.py [--debounce 0.3] [--model-dir ./artifacts]
+  3. Excel will open the template (created automatically if missing). Enter or paste campaigns from row 2 down.
+  4. The script detects the change, scores every edited row in one batch and writes the probabilities in column L.
+
+How changes are detected:
+- Windows with pywin32: the workbook's SheetChange event reports the edited cells as soon as they change.
+  Nothing is read from Excel until a cell in the input columns changes.
+- Otherwise (macOS, or no pywin32): the saved template's modification time is watched, so predictions
+  update when the workbook is saved. Only a `stat` call runs between saves; the sheet is read once per save.
+
+Edits are debounced: a paste or a burst of typing is scored once, `--debounce` seconds after the last change.
+Each run of consecutive changed rows is read in one range read and its results written back in one range write;
+edits to whole columns only cover the rows up to the end of the sheet's used range.
 
 Notes:
 - Requires xlwings and openpyxl installed in the Python environment used to run this script.
-- Model artifacts are expected in `./artifacts` (kickstarter_model.keras, scaler.pkl, feature_columns.json).
+- Model artifacts are expected in `./artifacts` (kickstarter_runtime.npz or kickstarter_model.keras,
+  scaler.pkl, feature_columns.json).
 """
 
-import time
-import json
+import argparse
 import os
 import sys
+import time
 from pathlib import Path
 
 # Add src/ to path so we can import from the project
@@ -30,8 +41,8 @@ except Exception as e:
 TEMPLATE = "excel_template.xlsx"
 SHEET = "Predict"
 HEADER_RANGE = "A1:J1"
-INPUT_RANGE = "A2:J2"
-RESULT_CELL = "L2"
+FIRST_INPUT_ROW = 2
+RESULT_COLUMN = 12  # column L
 
 EXAMPLE_HEADERS = [
     "goal",
@@ -76,46 +87,196 @@ def create_template(path: str):
     ws.append(EXAMPLE_ROW)
 
     # Add a Result header and leave cell blank for output
-    ws.cell(row=1, column=12, value="Result")
+    ws.cell(row=1, column=RESULT_COLUMN, value="Result")
     wb.save(path)
     print(f"Created template: {path}")
 
 
-def read_input_row(sheet):
-    vals = sheet.range(INPUT_RANGE).value
-    # If user enters a single value in first cell, xlwings may return scalar; normalize to list
-    if vals is None:
-        return None
-    if not isinstance(vals, list):
-        # single cell selected
-        vals = [vals]
-    return vals
-
-
-def build_campaign_from_row(headers, values):
-    # Trim values list to headers length
-    values = values[: len(headers)]
-    campaign = {h: v for h, v in zip(headers, values)}
-    # Try to convert numeric fields back to proper types where reasonable
-    for key in ["goal", "pledged", "backers", "usd pledged"]:
-        if key in campaign and campaign[key] is not None:
-            try:
-                campaign[key] = int(campaign[key])
-            except Exception:
-                try:
-                    campaign[key] = float(campaign[key])
-                except Exception:
-                    pass
-    return campaign
+class ChangeFeed:
+    """Sheet rows edited since the last flush, released once edits pause for ``debounce`` seconds.
+
+    ``last_used_row`` returns the last row of the sheet's used range; edits
+    spanning several rows are clamped to it, so clearing or formatting a whole
+    column queues the rows that hold data rather than all 1,048,576.
+    """
+
+    def __init__(self, debounce: float, last_used_row):
+        self.debounce = debounce
+        self.last_used_row = last_used_row
+        self.rows = set()
+        self.last_change = None
+
+    def add(self, first_row: int, last_row: int):
+        if last_row > first_row:
+            last_row = min(last_row, self.last_used_row())
+        rows = range(max(first_row, FIRST_INPUT_ROW), last_row + 1)
+        if rows:
+            self.rows.update(rows)
+            self.last_change = time.monotonic()
+
+    def timeout(self):
+        """Seconds until pending rows are due, or ``None`` when nothing is pending."""
+        if not self.rows:
+            return None
+        return max(0.0, self.debounce - (time.monotonic() - self.last_change))
+
+    def take(self):
+        rows, self.rows = sorted(self.rows), set()
+        return rows
+
+
+class _WorkbookEvents:
+    """pywin32 event sink for the workbook; ``feed`` and ``n_columns`` are set after connecting."""
+
+    def OnSheetChange(self, sh, target):
+        if sh.Name != SHEET:
+            return
+        for area in target.Areas:
+            # Ignore edits outside the input columns, including our own writes to the Result column.
+            if area.Column > self.n_columns:
+                continue
+            self.feed.add(area.Row, area.Row + area.Rows.Count - 1)
+
+
+class ComChangeSource:
+    """Receives SheetChange events from Excel over COM (Windows with pywin32)."""
+
+    # Longest uninterrupted wait, so Ctrl+C is noticed while idle.
+    IDLE_WAIT = 0.5
+
+    def __init__(self, book, feed: ChangeFeed, n_columns: int):
+        import pythoncom
+        import win32com.client
+        import win32event
+
+        self._pythoncom = pythoncom
+        self._win32event = win32event
+        self._events = win32com.client.WithEvents(book.api, _WorkbookEvents)
+        self._events.feed = feed
+        self._events.n_columns = n_columns
+
+    def wait(self, timeout):
+        """Block until a window message arrives or ``timeout`` expires, then deliver pending events."""
+        seconds = self.IDLE_WAIT if timeout is None else min(timeout, self.IDLE_WAIT)
+        self._win32event.MsgWaitForMultipleObjects(
+            [], False, int(seconds * 1000), self._win32event.QS_ALLINPUT
+        )
+        self._pythoncom.PumpWaitingMessages()
+
+
+class MtimeChangeSource:
+    """Detects saves of the workbook file and diffs the input rows against the previous save."""
+
+    def __init__(self, sheet, path: Path, feed: ChangeFeed, n_columns: int, interval: float):
+        self.sheet = sheet
+        self.path = path
+        self.feed = feed
+        self.n_columns = n_columns
+        self.interval = interval
+        self._mtime = self._stat()
+        self._snapshot = self._read_rows()
+
+    def _stat(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _read_rows(self):
+        last_row = self.sheet.used_range.last_cell.row
+        if last_row < FIRST_INPUT_ROW:
+            return []
+        return self.sheet.range((FIRST_INPUT_ROW, 1), (last_row, self.n_columns)).options(ndim=2).value
+
+    def wait(self, timeout):
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        mtime = self._stat()
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        rows = self._read_rows()
+        for offset in range(max(len(rows), len(self._snapshot))):
+            current = rows[offset] if offset < len(rows) else None
+            previous = self._snapshot[offset] if offset < len(self._snapshot) else None
+            if current != previous:
+                self.feed.add(FIRST_INPUT_ROW + offset, FIRST_INPUT_ROW + offset)
+        self._snapshot = rows
+
+
+def open_change_source(book, sheet, path: Path, feed: ChangeFeed, n_columns: int, interval: float):
+    """Prefer workbook events; fall back to watching the saved file when pywin32 is unavailable."""
+    if sys.platform == "win32":
+        try:
+            source = ComChangeSource(book, feed, n_columns)
+            print("Listening for workbook change events.")
+            return source
+        except Exception as e:
+            print(f"Workbook events unavailable ({e}); watching the saved file instead.")
+    print(f"Watching {path} for saves; predictions update each time the workbook is saved.")
+    return MtimeChangeSource(sheet, path, feed, n_columns, interval)
+
+
+def contiguous_runs(rows):
+    """Group sorted row numbers into ``(first, last)`` pairs of consecutive rows."""
+    runs = []
+    for row in rows:
+        if runs and row == runs[-1][1] + 1:
+            runs[-1][1] = row
+        else:
+            runs.append([row, row])
+    return [(first, last) for first, last in runs]
+
+
+def score_rows(sheet, headers, rows, model_dir):
+    """Score the changed rows and write their Result cells, one range read and write per run of consecutive rows.
+
+    Rows between two edits are left alone, so editing row 2 and row 50,000
+    reads and writes two rows rather than the whole span. The non-blank rows
+    of all runs go to ``predict_rows`` as one batch of row values, without a
+    header row, JSON or a dictionary per campaign.
+    """
+    from excel_integration import predict_rows
+
+    columns = [str(name).strip() if name is not None else "" for name in headers]
+    runs = []
+    # (results of the run, position in the run, row values) for every non-blank row.
+    filled = []
+    for first_row, last_row in contiguous_runs(rows):
+        table = sheet.range((first_row, 1), (last_row, len(columns))).options(ndim=2).value
+        results = [[""] for _ in table]
+        runs.append((first_row, results))
+        for index, row in enumerate(table):
+            if any(value is not None and value != "" for value in row):
+                filled.append((results, index, row))
+
+    if filled:
+        probabilities, errors = predict_rows([row for _, _, row in filled], columns, model_dir)
+        for (results, index, _), probability, error in zip(filled, probabilities, errors):
+            results[index][0] = f"Error: {error}" if error is not None else round(float(probability), 6)
+
+    scored = []
+    for first_row, results in runs:
+        sheet.range((first_row, RESULT_COLUMN)).value = results
+        scored.extend(results)
+    return scored
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Score campaigns on the Predict sheet as they are edited.")
+    parser.add_argument("--template", default=TEMPLATE, help="Workbook to open (created if missing)")
+    parser.add_argument("--model-dir", default="./artifacts", help="Directory with the exported model")
+    parser.add_argument("--debounce", type=float, default=0.3, help="Seconds without edits before scoring")
+    parser.add_argument(
+        "--poll-interval", type=float, default=0.5, help="Seconds between checks of the saved file (fallback mode)"
+    )
+    args = parser.parse_args()
+
     # Generate template if missing
-    path = Path(TEMPLATE)
+    path = Path(args.template)
     if not path.exists():
-        create_template(TEMPLATE)
+        create_template(str(path))
 
-    print("Opening Excel and waiting for input. Edit the sample row (row 2) and save or change a value to trigger prediction.")
+    print("Opening Excel. Enter campaigns from row 2 down; each edited row is scored into column L.")
     app = xw.App(visible=True)
 
     try:
@@ -130,40 +291,34 @@ def main():
     if not headers or not isinstance(headers, list):
         headers = EXAMPLE_HEADERS
 
-    # Read initial state
-    last_values = read_input_row(sheet)
-
     try:
-        # Lazy import of the project's prediction helper
-        from excel_integration import KICKSTARTER_SUCCESS_PROBABILITY
+        # Lazy import of the project's prediction helpers
+        from excel_integration import predict_rows  # noqa: F401
     except Exception as e:
-        print("Warning: could not import excel_integration.KICKSTARTER_SUCCESS_PROBABILITY. Make sure your PYTHONPATH is set and artifacts exist.")
+        print("Warning: could not import excel_integration.predict_rows. Make sure your PYTHONPATH is set and artifacts exist.")
         print(str(e))
         return
 
-    print("Template open. Waiting for changes to the sample input row...")
+    feed = ChangeFeed(args.debounce, lambda: sheet.used_range.last_cell.row)
+    source = open_change_source(wb, sheet, path.resolve(), feed, len(headers), args.poll_interval)
 
     try:
         while True:
-            time.sleep(1)
-            current_values = read_input_row(sheet)
-            if current_values is None:
+            source.wait(feed.timeout())
+            if feed.timeout() != 0.0:
+                continue
+            rows = feed.take()
+            start = time.perf_counter()
+            try:
+                results = score_rows(sheet, headers, rows, args.model_dir)
+            except Exception as e:
+                print("Prediction failed:", e)
                 continue
-            # If changed from last time and not just the example
-            if current_values != last_values:
-                last_values = current_values
-                campaign = build_campaign_from_row(headers, current_values)
-                campaign_json = json.dumps(campaign)
-                print("Detected input change. Running prediction for:")
-                print(campaign)
-
-                try:
-                    prob = KICKSTARTER_SUCCESS_PROBABILITY(campaign_json, model_dir="./artifacts")
-                    # Write probability into the result cell
-                    sheet.range(RESULT_CELL).value = prob
-                    print(f"Probability: {prob:.6f} ({prob*100:.2f}%) written to {RESULT_CELL}")
-                except Exception as e:
-                    print("Prediction failed:", e)
+            scored = sum(1 for (value,) in results if isinstance(value, float))
+            print(
+                f"Scored {scored} campaign(s) for {len(rows)} changed row(s) between rows {rows[0]} and {rows[-1]} "
+                f"in {(time.perf_counter() - start) * 1000:.1f} ms"
+            )
 
     except KeyboardInterrupt:
         print("Listener stopped by user.")
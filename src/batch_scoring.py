@@ -0,0 +1,317 @@
+"""Streaming batch scoring of large campaign files.
+
+``score_csv`` reads the input with ``pd.read_csv(chunksize=...)``, scores
+each chunk with the NumPy runtime and appends it to the output file before
+reading the next one, so memory stays bounded by the chunk size no matter
+how many rows the file has (the full ``ks-projects-201801.csv`` history is
+~380k rows). The output keeps every input column and adds
+``success_probability`` and ``prediction_error``. Missing values are filled
+with training-time values rather than chunk statistics, so the scores do not
+depend on ``--chunksize`` or ``--workers``.
+
+```
+python src/model_pipeline.py score --csv ks-projects-201801.csv --out scored.csv --chunksize 50000
+python src/model_pipeline.py score --csv ks-projects-201801.csv --out scored.parquet
+```
+
+Parquet output requires ``pyarrow``.
+
+With ``--workers N`` the file is split into blocks of complete CSV records
+that a process pool parses, scores and formats in parallel; each worker
+loads the runtime once in its initializer. The main process only splits
+records and writes results, in input order, keeping at most ``2 * N``
+blocks in flight.
+"""
+
+import io
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+import pandas as pd
+
+from kickstarter_runtime import KickstarterRuntime, load_runtime
+
+PROBABILITY_COLUMN = "success_probability"
+ERROR_COLUMN = "prediction_error"
+PARQUET_SUFFIXES = {".parquet", ".pq"}
+DEFAULT_CHUNKSIZE = 50_000
+
+
+def score_frame(runtime: KickstarterRuntime, frame: pd.DataFrame) -> pd.DataFrame:
+    """Return ``frame`` with the probability and error columns appended."""
+
+    probabilities, errors = runtime.predict_probabilities(frame)
+    return frame.assign(**{PROBABILITY_COLUMN: probabilities, ERROR_COLUMN: errors})
+
+
+def iter_csv_chunks(csv_path: Path, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Yield the input file in chunks of at most ``chunksize`` rows."""
+
+    with pd.read_csv(csv_path, chunksize=chunksize, low_memory=False) as reader:
+        yield from reader
+
+
+class ChunkWriter:
+    """Append scored chunks to a CSV or Parquet file, choosing the format from the suffix."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.parquet = self.path.suffix.lower() in PARQUET_SUFFIXES
+        self._parquet_writer = None
+        self._csv_started = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write_csv_text(self, text: str) -> None:
+        """Append rows already formatted as CSV (the header only for the first block)."""
+
+        with open(self.path, "a" if self._csv_started else "w", encoding="utf-8", newline="") as file:
+            file.write(text)
+        self._csv_started = True
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if self.parquet:
+            self._write_parquet(frame)
+        else:
+            frame.to_csv(self.path, mode="a" if self._csv_started else "w", header=not self._csv_started, index=False)
+            self._csv_started = True
+
+    def _write_parquet(self, frame: pd.DataFrame) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise RuntimeError("Parquet output requires pyarrow: pip install pyarrow") from exc
+
+        if self._parquet_writer is None:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            # All-null columns (e.g. no errors in the first chunk) would pin a null type; use strings.
+            schema = pa.schema(
+                [field.with_type(pa.string()) if pa.types.is_null(field.type) else field for field in table.schema]
+            )
+            self._parquet_writer = pq.ParquetWriter(self.path, schema)
+
+        schema = self._parquet_writer.schema
+        try:
+            table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            table = pa.Table.from_pandas(_coerce_to_schema(frame, schema), schema=schema, preserve_index=False)
+        self._parquet_writer.write_table(table)
+
+    def close(self) -> None:
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        elif not self.parquet and not self._csv_started:
+            # Empty input still produces an (empty) output file.
+            self.path.write_text("", encoding="utf-8")
+
+    def __enter__(self) -> "ChunkWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _coerce_to_schema(frame: pd.DataFrame, schema) -> pd.DataFrame:
+    """Make a later chunk fit the schema pinned by the first one.
+
+    Values that do not parse as the column's numeric type become nulls; the
+    ``prediction_error`` column already records why such rows were skipped.
+    """
+
+    import pyarrow as pa
+
+    coerced = frame.copy()
+    for field in schema:
+        if field.name not in coerced.columns:
+            continue
+        if pa.types.is_integer(field.type) or pa.types.is_floating(field.type):
+            coerced[field.name] = pd.to_numeric(coerced[field.name], errors="coerce")
+        elif pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            column = coerced[field.name]
+            coerced[field.name] = column.astype(object).where(column.isna(), column.astype(str))
+    return coerced
+
+
+def _report_progress(stream: TextIO) -> Callable[[int, int, float], None]:
+    def report(rows: int, failed: int, elapsed: float) -> None:
+        rate = rows / elapsed if elapsed > 0 else float("inf")
+        print(f"Scored {rows:,} rows ({failed:,} failed) - {rate:,.0f} rows/sec", file=stream, flush=True)
+
+    return report
+
+
+def iter_csv_record_blocks(csv_path: Path, rows_per_block: int) -> Iterator[Tuple[bytes, bytes]]:
+    """Yield ``(header, block)`` pairs of raw bytes holding up to ``rows_per_block`` records.
+
+    Records are only split on newlines outside quoted fields: a line ends a
+    record when the running count of quote characters is even.
+    """
+
+    with open(csv_path, "rb") as file:
+        header = file.readline()
+        block: List[bytes] = []
+        rows = 0
+        quotes = 0
+        for line in file:
+            block.append(line)
+            quotes += line.count(b'"')
+            if quotes % 2:
+                continue
+            quotes = 0
+            rows += 1
+            if rows >= rows_per_block:
+                yield header, b"".join(block)
+                block, rows = [], 0
+        if block:
+            yield header, b"".join(block)
+
+
+_WORKER_RUNTIME: Optional[KickstarterRuntime] = None
+
+
+def _init_worker(model_dir: str) -> None:
+    """Load the runtime once per worker process."""
+
+    global _WORKER_RUNTIME
+    _WORKER_RUNTIME = load_runtime(Path(model_dir))
+
+
+def _score_block(
+    header: bytes, block: bytes, as_csv: bool, include_header: bool
+) -> Tuple[int, int, Union[str, pd.DataFrame]]:
+    """Parse, score and (for CSV output) format one block inside a worker."""
+
+    frame = pd.read_csv(io.BytesIO(header + block), low_memory=False)
+    scored = score_frame(_WORKER_RUNTIME, frame)
+    failed = int(scored[ERROR_COLUMN].notna().sum())
+    if as_csv:
+        return len(scored), failed, scored.to_csv(index=False, header=include_header)
+    return len(scored), failed, scored
+
+
+MATH_THREAD_VARIABLES = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+@contextmanager
+def math_library_threads(threads: int) -> Iterator[None]:
+    """Limit the BLAS/OpenMP thread pools of processes started inside the block to ``threads``.
+
+    The libraries read these variables only when they load, so they must be
+    set before a worker starts: ``ProcessPoolExecutor`` spawns its workers on
+    ``submit``, so create *and use* the pool inside the block. Processes that
+    already loaded NumPy, this one included, are not affected.
+    """
+
+    previous = {name: os.environ.get(name) for name in MATH_THREAD_VARIABLES}
+    for name in MATH_THREAD_VARIABLES:
+        os.environ[name] = str(threads)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+@contextmanager
+def _scoring_pool(model_dir: Path, workers: int) -> Iterator[ProcessPoolExecutor]:
+    """Spawn-context pool whose workers load the runtime and use one BLAS/OpenMP thread each.
+
+    The pool supplies the parallelism; the thread limit stays set until the
+    pool shuts down, so every worker it starts inherits it.
+    """
+
+    context = multiprocessing.get_context("spawn")
+    with math_library_threads(1):
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=context, initializer=_init_worker, initargs=(str(model_dir),)
+        ) as pool:
+            yield pool
+
+
+def _iter_parallel_results(
+    csv_path: Path, model_dir: Path, *, workers: int, chunksize: int, as_csv: bool
+) -> Iterator[Tuple[int, int, Union[str, pd.DataFrame]]]:
+    """Score record blocks in a process pool, yielding results in input order."""
+
+    with _scoring_pool(model_dir, workers) as pool:
+        pending: Deque = deque()
+        for index, (header, block) in enumerate(iter_csv_record_blocks(csv_path, chunksize)):
+            pending.append(pool.submit(_score_block, header, block, as_csv, index == 0))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def score_csv(
+    csv_path: Path,
+    output_path: Path,
+    runtime: Optional[KickstarterRuntime] = None,
+    *,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    progress: Optional[Callable[[int, int, float], None]] = None,
+    workers: int = 1,
+    model_dir: Optional[Path] = None,
+) -> Dict[str, float]:
+    """Score ``csv_path`` chunk by chunk and stream the results to ``output_path``.
+
+    Args:
+        csv_path: Input CSV with one campaign per row.
+        output_path: Destination ``.csv`` or ``.parquet`` file.
+        runtime: Loaded prediction runtime, used when ``workers`` is 1.
+        chunksize: Rows read, scored and written per step; bounds memory use.
+        progress: Callback receiving ``(rows, failed_rows, elapsed_seconds)``
+            after every chunk. Defaults to a rows/sec line on stderr.
+        workers: Number of scoring processes. Values above 1 shard the file
+            across a process pool; output order still matches input order.
+        model_dir: Artifact directory each worker loads; required when
+            ``workers`` is greater than 1.
+
+    Returns:
+        Summary with ``rows``, ``failed`` and ``seconds``.
+    """
+
+    if chunksize <= 0:
+        raise ValueError("chunksize must be a positive number of rows")
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    progress = progress or _report_progress(sys.stderr)
+
+    rows = failed = 0
+    start = time.perf_counter()
+    with ChunkWriter(output_path) as writer:
+        if workers == 1:
+            if runtime is None:
+                raise ValueError("runtime is required for single-process scoring")
+            for chunk in iter_csv_chunks(csv_path, chunksize):
+                scored = score_frame(runtime, chunk)
+                writer.write(scored)
+                rows += len(scored)
+                failed += int(scored[ERROR_COLUMN].notna().sum())
+                progress(rows, failed, time.perf_counter() - start)
+        else:
+            if model_dir is None:
+                raise ValueError("model_dir is required when scoring with several workers")
+            results = _iter_parallel_results(
+                csv_path, model_dir, workers=workers, chunksize=chunksize, as_csv=not writer.parquet
+            )
+            for block_rows, block_failed, scored in results:
+                if writer.parquet:
+                    writer.write(scored)
+                else:
+                    writer.write_csv_text(scored)
+                rows += block_rows
+                failed += block_failed
+                progress(rows, failed, time.perf_counter() - start)
+
+    return {"rows": rows, "failed": failed, "seconds": time.perf_counter() - start}
@@ -10,15 +10,16 @@ Under Supervision of:
 Excel/xlwings bridge for the Kickstarter success model.
 
 This module exposes light-weight user-defined functions (UDFs) that can be
-registered with the xlwings add-in. The functions load the trained model
-artifacts once, convert JSON from Excel into a Python dictionary, and return
-probabilities that a campaign will succeed.
+registered with the xlwings add-in. The functions load the exported NumPy
+runtime once (no TensorFlow needed), convert JSON from Excel into a Python
+dictionary, and return probabilities that a campaign will succeed.
 
 Usage example inside Excel (after configuring xlwings):
 
 ```
 =KICKSTARTER_SUCCESS_PROBABILITY(A1)
 =KICKSTARTER_SUCCESS_SUMMARY(A1, "artifacts")
+=KICKSTARTER_SCORE_RANGE(A1:J5001)
 ```
 
 Where cell ``A1`` contains a JSON string describing the campaign, e.g.:
@@ -29,40 +30,134 @@ Where cell ``A1`` contains a JSON string describing the campaign, e.g.:
  "currency": "USD", "country": "US",
  "deadline": "2024-12-01", "launched": "2024-10-01"}
 ```
+
+``KICKSTARTER_SCORE_RANGE`` takes a whole table instead: a header row with
+the same field names followed by one campaign per row. It scores every row
+in one vectorised pass and spills one probability per data row, so a sheet
+of 5,000 campaigns needs one UDF call instead of 5,000.
+``KICKSTARTER_SCORE_RANGE_ASYNC`` does the same without blocking Excel
+while it computes. The ``vba_predict`` macro helper scores every row of the
+"Predict" sheet the same way, with one read and one write of the sheet, and
+still returns the row 2 probability; ``vba_predict_sheet`` returns every row.
+
+Python callers that already hold campaigns skip the JSON step:
+``predict_campaign`` takes a dictionary and ``predict_rows`` takes row
+tuples or a 2-D array (columns in ``CAMPAIGN_FIELDS`` order by default).
 """
 
 import json
 import sys
+import time
 from pathlib import Path
-from typing import Dict, Iterable, Tuple
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Sequence, Tuple
 
 import xlwings as xw
 
-# Ensure model_pipeline can be imported from src/
+# Ensure kickstarter_runtime can be imported from src/
 sys.path.insert(0, str(Path(__file__).parent))
 
-from model_pipeline import load_artifacts, predict_success_probability
+from prediction_service import PredictionClient, default_server_address
+
+if TYPE_CHECKING:
+    from kickstarter_runtime import KickstarterRuntime
+    from model_registry import ModelRegistry
+
+
+_REGISTRIES: Dict[str, "ModelRegistry"] = {}
+# Seconds between checks for replaced artifacts; a recalculation fires many UDF calls at once.
+REFRESH_INTERVAL = 2.0
+# model_dir -> time.monotonic() of its last artifact check.
+_LAST_REFRESH: Dict[str, float] = {}
+
+# Campaign fields in the column order of the Predict sheet and the sample templates.
+CAMPAIGN_FIELDS = (
+    "goal",
+    "pledged",
+    "backers",
+    "usd pledged",
+    "category",
+    "main_category",
+    "currency",
+    "country",
+    "deadline",
+    "launched",
+)
 
+# Layout of the "Predict" sheet used by vba_predict: headers in row 1, inputs in A:J, results in L.
+PREDICT_SHEET = "Predict"
+PREDICT_INPUT_COLUMNS = 10
+PREDICT_RESULT_COLUMN = 12
 
-_ARTIFACT_CACHE: Dict[str, Tuple[object, object, Iterable[str]]] = {}
 
+def _load_cached_runtime(model_dir: str) -> "KickstarterRuntime":
+    """Return the active runtime for ``model_dir``, loading it once per workbook session.
 
-def _load_cached_artifacts(model_dir: str) -> Tuple[object, object, Iterable[str]]:
-    """Load model artifacts once per workbook session."""
+    The NumPy bundle (``kickstarter_runtime.npz``) is preferred so Excel does
+    not need TensorFlow; directories without it fall back to the Keras model.
+    At most every ``REFRESH_INTERVAL`` seconds a call checks (with a few
+    ``stat`` calls) whether the artifacts were replaced and, if so, swaps in
+    the new model before scoring.
+    """
+
+    # Imported lazily so vba_predict in client mode never loads NumPy/pandas.
+    from model_registry import ModelRegistry
 
     resolved_dir = str(Path(model_dir).expanduser().resolve())
-    if resolved_dir not in _ARTIFACT_CACHE:
-        model, scaler, feature_columns = load_artifacts(Path(resolved_dir))
-        _ARTIFACT_CACHE[resolved_dir] = (model, scaler, feature_columns)
-    return _ARTIFACT_CACHE[resolved_dir]
+    registry = _REGISTRIES.get(resolved_dir)
+    now = time.monotonic()
+    if registry is None:
+        registry = _REGISTRIES[resolved_dir] = ModelRegistry(Path(resolved_dir), max_versions=1)
+        _LAST_REFRESH[resolved_dir] = now
+    elif now - _LAST_REFRESH[resolved_dir] >= REFRESH_INTERVAL:
+        _LAST_REFRESH[resolved_dir] = now
+        registry.refresh()
+    return registry.get()
+
+
+def predict_campaign(campaign: Mapping[str, object], model_dir: str = "artifacts") -> float:
+    """Predict the success probability of one campaign dictionary.
+
+    Raises:
+        ValueError: If the campaign has missing or non-numeric feature values.
+    """
+
+    from prediction_cache import get_prediction_cache
+
+    runtime = _load_cached_runtime(model_dir)
+    # Recalculating sheets resend identical campaigns; score each one only once per model version.
+    return get_prediction_cache().predict_one(dict(campaign), runtime.predict_probabilities, runtime.version)
+
+
+def predict_rows(
+    rows, columns: Sequence[str] = CAMPAIGN_FIELDS, model_dir: str = "artifacts"
+) -> Tuple[Sequence[float], List[Optional[str]]]:
+    """Predict success probabilities for campaigns given as rows of values.
+
+    The rows go to the runtime's encoder as one ``CampaignTable`` without
+    building a dictionary per campaign. They skip the prediction cache:
+    hashing a row for its cache key costs more than scoring it.
+
+    Args:
+        rows: Sequence of row tuples or lists, a single row, or a 2-D array,
+            with values in ``columns`` order.
+        columns: Field name of each value in a row.
+        model_dir: Directory with the exported model artifacts.
+
+    Returns:
+        probabilities: One probability per row (``NaN`` for rows that could
+            not be scored).
+        errors: ``None`` for scored rows, otherwise the reason.
+    """
+
+    from kickstarter_runtime import CampaignTable
+
+    runtime = _load_cached_runtime(model_dir)
+    return runtime.predict_probabilities(CampaignTable(rows, columns))
 
 
 def _predict_from_json(campaign_json: str, model_dir: str) -> float:
-    model, scaler, feature_columns = _load_cached_artifacts(model_dir)
-    campaign_data = json.loads(campaign_json)
-    return predict_success_probability(
-        campaign_data, model=model, scaler=scaler, feature_columns=feature_columns
-    )
+    # Excel hands UDFs text; this is the only place campaigns are parsed from JSON.
+    return predict_campaign(json.loads(campaign_json), model_dir)
 
 
 @xw.func
@@ -112,33 +207,208 @@ def KICKSTARTER_SUCCESS_SUMMARY(
     verdict = "Likely success" if probability >= 0.5 else "Needs improvement"
     return f"{verdict} — {probability:.2%} predicted success probability"
 
-def vba_predict(model_dir: str = "artifacts") -> float:
-    """Helper intended to be called from Excel VBA via xlwings' RunPython.
+def _table_rows(table: Sequence[Sequence[object]]) -> Tuple[List[str], List[List[object]], List[int], int]:
+    """Split a header row plus campaign rows into named columns and non-blank rows.
+
+    Returns:
+        The named header columns, the non-blank rows restricted to those
+        columns, their positions among the data rows, and the number of
+        data rows.
+    """
+
+    if not table:
+        return [], [], [], 0
+    header, *rows = table
+    named = [(index, str(name).strip()) for index, name in enumerate(header) if name is not None and str(name).strip()]
+    columns = [name for _, name in named]
+
+    values = []
+    filled_rows = []
+    for row_index, row in enumerate(rows):
+        if all(value is None or value == "" for value in row):
+            continue
+        values.append([row[index] if index < len(row) else None for index, _ in named])
+        filled_rows.append(row_index)
+    return columns, values, filled_rows, len(rows)
+
+
+def _table_campaigns(table: Sequence[Sequence[object]]) -> Tuple[List[Dict[str, object]], List[int], int]:
+    """Turn a header row plus campaign rows into dictionaries for the non-blank rows."""
+
+    columns, values, filled_rows, n_rows = _table_rows(table)
+    return [dict(zip(columns, row)) for row in values], filled_rows, n_rows
+
+
+def _result_column(
+    n_rows: int, filled_rows: Sequence[int], probabilities: Sequence[float], errors: Sequence[Optional[str]]
+) -> List[List[object]]:
+    """Lay scores out as one single-cell row per data row: a probability, an error or blank."""
+
+    output: List[List[object]] = [[""] for _ in range(n_rows)]
+    for row_index, probability, error in zip(filled_rows, probabilities, errors):
+        output[row_index][0] = f"Error: {error}" if error is not None else round(float(probability), 6)
+    return output
+
+
+def _score_campaigns(campaigns: List[Dict[str, object]], model_dir: str):
+    """Score campaigns in one batch with the cached runtime, through the prediction cache."""
+
+    from prediction_cache import get_prediction_cache
+
+    runtime = _load_cached_runtime(model_dir)
+    return get_prediction_cache().predict(campaigns, runtime.predict_probabilities, runtime.version)
+
+
+def _score_table(table: Sequence[Sequence[object]], model_dir: str) -> List[List[object]]:
+    """Score a header row plus campaign rows, returning one single-cell row per campaign.
+
+    Blank rows give an empty cell and rows that cannot be scored give their
+    error message, so the output always lines up with the input rows.
+    """
+
+    campaigns, filled_rows, n_rows = _table_campaigns(table)
+    if not n_rows:
+        return [[""]]
+    probabilities, errors = _score_campaigns(campaigns, model_dir) if campaigns else ([], [])
+    return _result_column(n_rows, filled_rows, probabilities, errors)
 
-    Usage (VBA macro example):
-        Sub GetPrediction()
-            RunPython "import sys; sys.path.append(r'/full/path/to/project'); from excel_integration import vba_predict; vba_predict('artifacts')"
-        End Sub
 
-    The function expects a sheet named "Predict" with headers in A1:J1 and
-    the sample input in A2:J2. The computed probability is written to cell L2
-    (header "Result"). Returns the probability (float between 0 and 1).
+@xw.func
+@xw.arg(
+    "table",
+    ndim=2,
+    doc=(
+        "Range with a header row (goal, pledged, backers, usd pledged, category, "
+        "main_category, currency, country, deadline, launched) and one campaign per row."
+    ),
+)
+@xw.arg(
+    "model_dir",
+    doc="Directory containing the exported model artifacts.",
+)
+def KICKSTARTER_SCORE_RANGE(table, model_dir: str = "artifacts"):
+    """Return one success probability per data row of a campaign table, as a dynamic array."""
+
+    return _score_table(table, model_dir)
+
+
+@xw.func(async_mode="threading")
+@xw.arg(
+    "table",
+    ndim=2,
+    doc="Same table accepted by KICKSTARTER_SCORE_RANGE.",
+)
+@xw.arg(
+    "model_dir",
+    doc="Directory containing the exported model artifacts.",
+)
+def KICKSTARTER_SCORE_RANGE_ASYNC(table, model_dir: str = "artifacts"):
+    """Like KICKSTARTER_SCORE_RANGE, but computed in the background so Excel stays responsive."""
+
+    return _score_table(table, model_dir)
+
+
+def score_predict_sheet(
+    sheet, model_dir: str = "artifacts", server: Optional[str] = None
+) -> Tuple[List[object], Dict[str, float]]:
+    """Score every campaign row of a "Predict" sheet with one bulk read and one bulk write.
+
+    The input columns A:J of the used range (headers in row 1) are read in a
+    single range read, all non-blank rows are scored in one batch and the
+    Result column L is written back in a single assignment, so the number of
+    Excel round-trips does not grow with the number of rows.
+
+    Args:
+        sheet: xlwings sheet laid out like the "Predict" template.
+        model_dir: Directory with the exported model artifacts.
+        server: Address of a running prediction daemon to score with instead
+            of loading the model in this process.
+
+    Returns:
+        values: What was written to column L, one entry per data row: the
+            probability, an ``"Error: ..."`` message or ``""`` for blank rows.
+        timings: Seconds spent reading the sheet, scoring and writing back,
+            plus the number of rows scored.
+    """
+
+    start = time.perf_counter()
+    last_row = sheet.used_range.last_cell.row
+    if last_row < 2:
+        elapsed = time.perf_counter() - start
+        return [], {"rows": 0, "read_seconds": elapsed, "score_seconds": 0.0, "write_seconds": 0.0}
+    # Read as plain 2-D lists rather than a DataFrame so client mode never imports pandas.
+    table = sheet.range((1, 1), (last_row, PREDICT_INPUT_COLUMNS)).options(ndim=2).value
+    read_done = time.perf_counter()
+
+    columns, rows, filled_rows, n_rows = _table_rows(table)
+    if not rows:
+        probabilities, errors = [], []
+    elif server:
+        with PredictionClient(server) as client:
+            probabilities, errors = client.predict_probabilities(dict(zip(columns, row)) for row in rows)
+    else:
+        probabilities, errors = predict_rows(rows, columns, model_dir)
+    output = _result_column(n_rows, filled_rows, probabilities, errors)
+    score_done = time.perf_counter()
+
+    sheet.range((2, PREDICT_RESULT_COLUMN)).value = output
+    write_done = time.perf_counter()
+
+    return [value for (value,) in output], {
+        "rows": len(rows),
+        "read_seconds": read_done - start,
+        "score_seconds": score_done - read_done,
+        "write_seconds": write_done - score_done,
+    }
+
+
+def vba_predict_sheet(model_dir: str = "artifacts", server: Optional[str] = None) -> List[object]:
+    """Score every campaign row of the calling workbook's "Predict" sheet.
+
+    Intended for xlwings' RunPython, like ``vba_predict``. The sheet has
+    headers in A1:J1 and one campaign per row from row 2 down. Every row is
+    scored in one batch and its probability (or error message) is written to
+    column L (header "Result"); the read, score and write times are shown in
+    Excel's status bar. Returns the values written to column L.
+
+    When ``server`` (or ``$KICKSTARTER_PREDICTION_SERVER``) names a running
+    ``model_pipeline serve`` daemon, the campaigns are scored there instead of
+    loading the model in the freshly started interpreter.
     """
 
     # When called via RunPython from Excel, Book.caller() returns the calling workbook.
     wb = xw.Book.caller()
-    sheet = wb.sheets["Predict"]
+    sheet = wb.sheets[PREDICT_SHEET]
+
+    values, timings = score_predict_sheet(sheet, model_dir, server or default_server_address())
+    wb.app.status_bar = (
+        f"Kickstarter: scored {timings['rows']} campaigns in "
+        f"{(timings['read_seconds'] + timings['score_seconds'] + timings['write_seconds']) * 1000:.0f} ms "
+        f"(read {timings['read_seconds'] * 1000:.0f} ms, score {timings['score_seconds'] * 1000:.0f} ms, "
+        f"write {timings['write_seconds'] * 1000:.0f} ms)"
+    )
+    return values
 
-    headers = sheet.range("A1:J1").value
-    values = sheet.range("A2:J2").value
-    if not isinstance(values, list):
-        values = [values]
 
-    campaign = {h: v for h, v in zip(headers, values)}
-    campaign_json = json.dumps(campaign)
+def vba_predict(model_dir: str = "artifacts", server: Optional[str] = None) -> float:
+    """Helper intended to be called from Excel VBA via xlwings' RunPython.
 
-    probability = _predict_from_json(campaign_json, model_dir)
+    Usage (VBA macro example):
+        Sub GetPrediction()
+            RunPython "import sys; sys.path.append(r'/full/path/to/project'); from excel_integration import vba_predict; vba_predict('artifacts')"
+        End Sub
+
+    Scores the whole "Predict" sheet like ``vba_predict_sheet`` (every row
+    from row 2 down, results in column L), but keeps the original return
+    value: the probability of the campaign in row 2, a float between 0 and 1.
+    Use ``vba_predict_sheet`` for the values of every row.
+
+    Raises:
+        ValueError: If row 2 is blank or its campaign could not be scored.
+    """
 
-    # Write the numeric probability back into the sheet
-    sheet.range("L2").value = round(probability, 6)
-    return probability
+    values = vba_predict_sheet(model_dir, server)
+    first = values[0] if values else ""
+    if isinstance(first, str):
+        raise ValueError(first[len("Error: "):] if first.startswith("Error: ") else "No campaign in row 2")
+    return float(first)
@@ -0,0 +1,271 @@
+"""Sharded on-disk feature store for out-of-core training.
+
+``train_model`` reads the whole CSV, one-hot encodes it with
+``pd.get_dummies`` and scales it as a float64 matrix, so memory grows with
+the number of campaigns. ``build_feature_store`` streams the CSV instead:
+
+1. A vocabulary pass reads only the categorical, label and ``usd pledged``
+   columns chunk by chunk and collects the category values (the one-hot
+   columns, in ``pd.get_dummies`` order) and the ``usd pledged`` mean.
+2. An encoding pass runs every chunk through ``FeatureEncoder``, assigns
+   each row to the train/validation/test split, fits the ``StandardScaler``
+   with ``partial_fit`` and writes one float32 ``.npy`` shard per split and
+   chunk.
+3. A scaling pass rewrites each shard with the final scaler applied.
+
+Peak memory is bounded by the chunk size rather than the dataset size.
+Training reads the shards back with ``np.load(mmap_mode="r")``:
+
+```
+python src/model_pipeline.py preprocess --csv ks-projects-201801.csv --store-dir features/
+python src/model_pipeline.py train --feature-store features/ --batch-size 1024
+```
+
+The store directory holds ``manifest.json`` (feature columns, shards, row
+and class counts), ``scaler.pkl`` and the shards.
+"""
+
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from kickstarter_runtime import CATEGORICAL_COLUMNS, DATE_COLUMNS, DATE_PARTS, UNNEEDED_COLUMNS, FeatureEncoder
+
+MANIFEST_FILENAME = "manifest.json"
+SCALER_FILENAME = "scaler.pkl"
+STORE_FORMAT_VERSION = 1
+SPLITS = ("train", "validation", "test")
+LABELS = {"successful": 1, "failed": 0}
+DEFAULT_STORE_CHUNKSIZE = 100_000
+
+
+def _feature_columns(header: List[str], vocabularies: Dict[str, set]) -> List[str]:
+    """Reproduce the column order of ``preprocess_features`` on the whole file."""
+
+    excluded = set(UNNEEDED_COLUMNS) | set(CATEGORICAL_COLUMNS) | set(DATE_COLUMNS) | {"state"}
+    columns = [column for column in header if column not in excluded]
+    # _normalize_dataframe appends the date parts after the remaining columns.
+    for column in DATE_COLUMNS:
+        if column in header:
+            columns.extend(f"{column}_{part}" for part in DATE_PARTS)
+    for column in CATEGORICAL_COLUMNS:
+        if column in header:
+            columns.extend(f"{column}_{value}" for value in sorted(vocabularies[column]))
+    return columns
+
+
+def _scan_vocabulary(csv_path: Path, chunksize: int) -> Tuple[List[str], Dict[str, float]]:
+    """Collect the feature columns and the ``usd pledged`` fill value in one pass."""
+
+    header = list(pd.read_csv(csv_path, nrows=0).columns)
+    if "state" not in header:
+        raise ValueError(f"{csv_path} has no 'state' column to train on")
+    wanted = set(CATEGORICAL_COLUMNS) | {"state", "usd pledged"}
+    vocabularies: Dict[str, set] = {column: set() for column in CATEGORICAL_COLUMNS}
+    pledged_sum, pledged_count = 0.0, 0
+
+    reader = pd.read_csv(csv_path, usecols=lambda column: column in wanted, chunksize=chunksize, low_memory=False)
+    with reader:
+        for chunk in reader:
+            if "usd pledged" in chunk.columns:
+                # _normalize_dataframe fills the mean before dropping unlabeled rows.
+                pledged = pd.to_numeric(chunk["usd pledged"], errors="coerce")
+                pledged_sum += float(pledged.sum())
+                pledged_count += int(pledged.count())
+            labeled = chunk[chunk["state"].isin(list(LABELS))]
+            for column in CATEGORICAL_COLUMNS:
+                if column in labeled.columns:
+                    vocabularies[column].update(labeled[column].dropna().astype(str).unique())
+
+    fill_values = {"usd pledged": pledged_sum / pledged_count} if pledged_count else {}
+    return _feature_columns(header, vocabularies), fill_values
+
+
+def build_feature_store(
+    csv_path: Path,
+    store_dir: Path,
+    *,
+    chunksize: int = DEFAULT_STORE_CHUNKSIZE,
+    test_size: float = 0.3,
+    validation_split: float = 0.2,
+    seed: int = 34,
+) -> "FeatureStore":
+    """Encode and scale ``csv_path`` into sharded float32 arrays under ``store_dir``.
+
+    Rows are assigned to splits at random with the same proportions as
+    ``train_model``: ``test_size`` of the labeled rows for testing, and
+    ``validation_split`` of the rest for early stopping. As in
+    ``train_model``, the scaler is fitted on every labeled row.
+
+    Args:
+        csv_path: Kickstarter dataset CSV.
+        store_dir: Output directory; existing shards in it are replaced.
+        chunksize: CSV rows per chunk, which bounds memory and shard size.
+        test_size: Fraction of rows in the test split.
+        validation_split: Fraction of the remaining rows in the validation split.
+        seed: Seed of the split assignment.
+
+    Returns:
+        The written store.
+    """
+
+    from sklearn.preprocessing import StandardScaler
+
+    csv_path = Path(csv_path)
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    # Without a manifest a half-written store cannot be mistaken for a complete one.
+    (store_dir / MANIFEST_FILENAME).unlink(missing_ok=True)
+    for stale in store_dir.glob("*.npy"):
+        stale.unlink()
+
+    feature_columns, fill_values = _scan_vocabulary(csv_path, chunksize)
+    encoder = FeatureEncoder(feature_columns)
+    scaler = StandardScaler()
+    rng = np.random.default_rng(seed)
+    train_fraction = (1.0 - test_size) * (1.0 - validation_split)
+    bounds = np.array([train_fraction, 1.0 - test_size])
+
+    shards: Dict[str, List[Dict[str, object]]] = {split: [] for split in SPLITS}
+    class_counts = {split: [0, 0] for split in SPLITS}
+    with pd.read_csv(csv_path, chunksize=chunksize, low_memory=False) as reader:
+        for index, chunk in enumerate(reader):
+            chunk = chunk[chunk["state"].isin(list(LABELS))].fillna(fill_values)
+            if chunk.empty:
+                continue
+            features = encoder.transform(chunk)
+            labels = chunk["state"].map(LABELS).to_numpy(dtype=np.uint8)
+            scaler.partial_fit(features.astype(np.float64))
+            assignment = np.searchsorted(bounds, rng.random(len(chunk)), side="right")
+            for split_index, split in enumerate(SPLITS):
+                rows = assignment == split_index
+                if not rows.any():
+                    continue
+                name = f"{split}-{index:05d}"
+                np.save(store_dir / f"{name}.features.npy", features[rows])
+                np.save(store_dir / f"{name}.labels.npy", labels[rows])
+                shards[split].append({"name": name, "rows": int(rows.sum())})
+                class_counts[split][0] += int((labels[rows] == 0).sum())
+                class_counts[split][1] += int((labels[rows] == 1).sum())
+
+    if not shards["train"]:
+        raise ValueError(f"{csv_path} has no successful or failed campaigns to train on")
+
+    mean = scaler.mean_.astype(np.float32)
+    scale = scaler.scale_.astype(np.float32)
+    for split in SPLITS:
+        for shard in shards[split]:
+            path = store_dir / f"{shard['name']}.features.npy"
+            scaled = (np.load(path) - mean) / scale
+            partial_path = path.with_suffix(".partial.npy")
+            np.save(partial_path, scaled.astype(np.float32, copy=False))
+            os.replace(partial_path, path)
+
+    with open(store_dir / SCALER_FILENAME, "wb") as file:
+        pickle.dump(scaler, file)
+    manifest = {
+        "format_version": STORE_FORMAT_VERSION,
+        "source": str(csv_path),
+        "feature_columns": feature_columns,
+        "splits": {
+            split: {
+                "rows": sum(shard["rows"] for shard in shards[split]),
+                "class_counts": class_counts[split],
+                "shards": shards[split],
+            }
+            for split in SPLITS
+        },
+    }
+    with open(store_dir / MANIFEST_FILENAME, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+    return FeatureStore(store_dir)
+
+
+class FeatureStore:
+    """Read access to a store written by ``build_feature_store``."""
+
+    def __init__(self, store_dir: Path) -> None:
+        self.store_dir = Path(store_dir)
+        manifest_path = self.store_dir / MANIFEST_FILENAME
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"No feature store manifest at {manifest_path}")
+        with open(manifest_path, "r", encoding="utf-8") as file:
+            self.manifest = json.load(file)
+        if self.manifest.get("format_version") != STORE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported feature store format in {self.store_dir}")
+        self.feature_columns: List[str] = list(self.manifest["feature_columns"])
+        self._scaler = None
+
+    @property
+    def n_features(self) -> int:
+        return len(self.feature_columns)
+
+    @property
+    def scaler(self):
+        """The fitted ``StandardScaler`` (unpickled on first use)."""
+
+        if self._scaler is None:
+            with open(self.store_dir / SCALER_FILENAME, "rb") as file:
+                self._scaler = pickle.load(file)
+        return self._scaler
+
+    def rows(self, split: str) -> int:
+        return int(self.manifest["splits"][split]["rows"])
+
+    def class_counts(self, split: str) -> Tuple[int, int]:
+        failed, successful = self.manifest["splits"][split]["class_counts"]
+        return int(failed), int(successful)
+
+    def n_batches(self, split: str, batch_size: int) -> int:
+        """Batches ``iter_batches`` yields for ``split``; batches never span shards."""
+
+        return sum(-(-shard["rows"] // batch_size) for shard in self.manifest["splits"][split]["shards"])
+
+    def shard_paths(self, split: str) -> List[Tuple[Path, Path]]:
+        return [
+            (self.store_dir / f"{shard['name']}.features.npy", self.store_dir / f"{shard['name']}.labels.npy")
+            for shard in self.manifest["splits"][split]["shards"]
+        ]
+
+    def iter_batches(
+        self, split: str, batch_size: int, *, rng: Optional[np.random.Generator] = None
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yield ``(features, labels)`` batches of ``split``, one memory-mapped shard at a time.
+
+        Args:
+            split: ``"train"``, ``"validation"`` or ``"test"``.
+            batch_size: Rows per batch; the last batch of each shard may be smaller.
+            rng: When given, shards are visited and their rows drawn in random order.
+        """
+
+        shards = self.shard_paths(split)
+        if rng is not None:
+            shards = [shards[index] for index in rng.permutation(len(shards))]
+        for features_path, labels_path in shards:
+            features = np.load(features_path, mmap_mode="r")
+            labels = np.load(labels_path)
+            if rng is None:
+                order = None
+            else:
+                order = rng.permutation(len(labels))
+            for start in range(0, len(labels), batch_size):
+                if order is None:
+                    rows = slice(start, start + batch_size)
+                else:
+                    # Sorted indices keep the reads from the mapped shard mostly sequential.
+                    rows = np.sort(order[start : start + batch_size])
+                yield np.asarray(features[rows], dtype=np.float32), labels[rows].astype(np.float32)
+
+    def load(self, split: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Concatenate a whole split in memory (for evaluation and tests on small stores)."""
+
+        batches = list(self.iter_batches(split, batch_size=1 << 30))
+        if not batches:
+            return np.zeros((0, self.n_features), dtype=np.float32), np.zeros(0, dtype=np.float32)
+        features, labels = zip(*batches)
+        return np.concatenate(features), np.concatenate(labels)
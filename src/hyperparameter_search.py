@@ -0,0 +1,335 @@
+"""Parallel hyperparameter search for the Kickstarter classifier.
+
+``run_search`` samples configurations of ``build_model`` (hidden layer
+widths, dropout, learning rate and batch size) and trains them concurrently
+in a process pool:
+
+```
+python src/model_pipeline.py tune --csv ks-projects-201801.csv --trials 27 --strategy halving
+```
+
+The CSV is preprocessed once (through the preprocessing cache), scaled and
+split exactly like ``train_model``, and written to ``.npy`` files that every
+worker memory-maps, so trials share one copy of the data and never re-parse
+the CSV. Workers are spawned with their TensorFlow and BLAS thread pools
+limited to ``threads_per_trial``, so ``jobs`` concurrent trials do not
+oversubscribe the CPUs.
+
+``strategy="random"`` trains every configuration for ``max_epochs`` (with
+early stopping). ``strategy="halving"`` (successive halving) trains all of
+them for ``min_epochs``, keeps the best ``1 / eta`` by validation AUC,
+multiplies the epoch budget by ``eta`` and repeats until one configuration
+is left or ``max_epochs`` is reached. Survivors are not retrained from
+scratch: each resumes from the model (optimizer state included) saved at
+the end of its previous rung, with ``initial_epoch`` set to the epochs it
+already completed, so a rung only pays for the epochs it adds.
+
+The best configuration by validation AUC is saved as the artifacts, and
+``tuning_leaderboard.json`` next to them lists every trial with its
+validation and test AUC, training time, parameter count and NumPy inference
+cost per row.
+"""
+
+import json
+import math
+import multiprocessing
+import os
+import pickle
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from model_pipeline import (
+    _import_sklearn,
+    _import_tensorflow,
+    _usable_cpus,
+    build_model,
+    configure_tensorflow_threads,
+    export_compiled_predictor,
+    fit_and_evaluate,
+    load_training_data,
+    save_artifacts,
+)
+from batch_scoring import math_library_threads
+from preprocessing_cache import load_or_build
+
+STRATEGIES = ("random", "halving")
+LEADERBOARD_FILENAME = "tuning_leaderboard.json"
+
+# Candidate values; the learning rate is drawn log-uniformly from its range.
+SEARCH_SPACE: Dict[str, Sequence] = {
+    "hidden_units": [(64,), (128,), (64, 32), (128, 64), (256, 128), (256, 128, 64)],
+    "dropout": [0.0, 0.1, 0.2, 0.3, 0.4],
+    "learning_rate": (3e-4, 3e-3),
+    "batch_size": [64, 128, 256, 512, 1024],
+}
+# The configuration ``train_model`` uses, always evaluated as the first trial.
+BASELINE_CONFIGURATION = {"hidden_units": [128, 64], "dropout": 0.2, "learning_rate": 1e-3, "batch_size": 64}
+INFERENCE_TIMING_ROWS = 10_000
+
+Configuration = Dict[str, object]
+
+
+def sample_configurations(n_trials: int, *, seed: int = 34) -> List[Configuration]:
+    """Return the baseline followed by ``n_trials - 1`` random draws from ``SEARCH_SPACE``."""
+
+    rng = np.random.default_rng(seed)
+    low, high = SEARCH_SPACE["learning_rate"]
+    configurations = [dict(BASELINE_CONFIGURATION)]
+    while len(configurations) < n_trials:
+        hidden_units = SEARCH_SPACE["hidden_units"][rng.integers(len(SEARCH_SPACE["hidden_units"]))]
+        configurations.append(
+            {
+                "hidden_units": list(hidden_units),
+                "dropout": float(rng.choice(SEARCH_SPACE["dropout"])),
+                "learning_rate": float(10 ** rng.uniform(math.log10(low), math.log10(high))),
+                "batch_size": int(rng.choice(SEARCH_SPACE["batch_size"])),
+            }
+        )
+    return configurations[:n_trials]
+
+
+def prepare_search_data(
+    csv_path: Path,
+    work_dir: Path,
+    *,
+    validation_split: float = 0.2,
+    use_cache: bool = True,
+    cache_dir: Optional[Path] = None,
+):
+    """Scale and split the dataset once and write the splits for the workers.
+
+    Returns:
+        The fitted scaler and the feature columns.
+    """
+
+    train_test_split, StandardScaler, class_weight = _import_sklearn()
+    if use_cache:
+        features, labels, feature_columns, _ = load_or_build(Path(csv_path), load_training_data, cache_dir=cache_dir)
+    else:
+        features, labels, feature_columns = load_training_data(Path(csv_path))
+
+    scaler = StandardScaler()
+    scaled = scaler.fit_transform(features).astype(np.float32, copy=False)
+    # Same split as train_model: 70/30 stratified, then the last rows of the training part for validation.
+    train_rows, test_rows = train_test_split(
+        np.arange(len(labels)), train_size=0.7, random_state=34, stratify=labels
+    )
+    split_at = int(math.ceil(len(train_rows) * (1.0 - validation_split)))
+    splits = {"train": train_rows[:split_at], "validation": train_rows[split_at:], "test": test_rows}
+    for name, rows in splits.items():
+        np.save(work_dir / f"{name}_features.npy", scaled[rows])
+        np.save(work_dir / f"{name}_labels.npy", labels[rows].astype(np.float32))
+
+    weights = class_weight.compute_class_weight(
+        class_weight="balanced", classes=np.unique(labels[splits["train"]]), y=labels[splits["train"]]
+    )
+    with open(work_dir / "class_weights.json", "w", encoding="utf-8") as file:
+        json.dump([float(weight) for weight in weights], file)
+    with open(work_dir / "scaler.pkl", "wb") as file:
+        pickle.dump(scaler, file)
+    return scaler, feature_columns
+
+
+# Per-worker data, memory-mapped once by the pool initializer.
+_WORKER_DATA: Dict[str, object] = {}
+
+
+def _init_worker(work_dir: str, threads: int) -> None:
+    # BLAS/OpenMP limits come from the environment the parent spawned us with (see run_search).
+    # One banner per worker adds nothing; keep warnings and errors.
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "1")
+    configure_tensorflow_threads(threads, 1)
+
+    work_dir = Path(work_dir)
+    for split in ("train", "validation", "test"):
+        _WORKER_DATA[split] = (
+            np.load(work_dir / f"{split}_features.npy", mmap_mode="r"),
+            np.load(work_dir / f"{split}_labels.npy"),
+        )
+    with open(work_dir / "class_weights.json", "r", encoding="utf-8") as file:
+        _WORKER_DATA["class_weights"] = dict(enumerate(json.load(file)))
+    with open(work_dir / "scaler.pkl", "rb") as file:
+        _WORKER_DATA["scaler"] = pickle.load(file)
+    _WORKER_DATA["work_dir"] = work_dir
+
+
+def _inference_us_per_row(model, scaler, features: np.ndarray) -> float:
+    """Best-of-three time per row of the exported NumPy predictor used for serving."""
+
+    predictor = export_compiled_predictor(model, scaler)
+    # Only the timing matters here, so already-scaled rows stand in for raw ones.
+    rows = np.asarray(features[:INFERENCE_TIMING_ROWS])
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        predictor.predict(rows)
+        timings.append(time.perf_counter() - start)
+    return min(timings) / max(len(rows), 1) * 1e6
+
+
+def _run_trial(
+    trial: int, configuration: Configuration, epochs: int, previous: Optional[Dict[str, object]] = None
+) -> Dict[str, object]:
+    """Train one configuration inside a worker and describe the result.
+
+    With ``previous`` (the trial's result from the last rung) training resumes
+    from its saved model up to ``epochs``; epoch and time totals accumulate.
+    """
+
+    X_train, y_train = _WORKER_DATA["train"]
+    X_validation, y_validation = _WORKER_DATA["validation"]
+    X_test, y_test = _WORKER_DATA["test"]
+
+    if previous is None:
+        model = build_model(
+            X_train.shape[1],
+            learning_rate=configuration["learning_rate"],
+            hidden_units=configuration["hidden_units"],
+            dropout=configuration["dropout"],
+        )
+        initial_epoch, previous_seconds = 0, 0.0
+    else:
+        model = _import_tensorflow().keras.models.load_model(previous["model_path"])
+        initial_epoch, previous_seconds = int(previous["epochs_trained"]), float(previous["train_seconds"])
+    start = time.perf_counter()
+    validation = fit_and_evaluate(
+        model,
+        (X_train, y_train),
+        (X_validation, y_validation),
+        epochs=epochs,
+        samples_per_epoch=len(y_train),
+        verbose=0,
+        validation_data=(X_validation, y_validation),
+        class_weight=_WORKER_DATA["class_weights"],
+        batch_size=configuration["batch_size"],
+        initial_epoch=initial_epoch,
+    )
+    train_seconds = previous_seconds + time.perf_counter() - start
+    test = model.evaluate(X_test, y_test, verbose=0, return_dict=True)
+
+    model_path = _WORKER_DATA["work_dir"] / f"trial-{trial:03d}-{epochs}.keras"
+    model.save(model_path)
+    return {
+        "trial": trial,
+        "configuration": configuration,
+        "epochs": epochs,
+        "initial_epoch": initial_epoch,
+        "epochs_trained": initial_epoch + int(validation["epochs_trained"]),
+        "val_auc": validation["auc"],
+        "val_accuracy": validation["accuracy"],
+        "test_auc": float(test["auc"]),
+        "test_accuracy": float(test["accuracy"]),
+        "train_seconds": train_seconds,
+        "samples_per_second": validation["samples_per_second"],
+        "parameters": int(model.count_params()),
+        "inference_us_per_row": _inference_us_per_row(model, _WORKER_DATA["scaler"], X_test),
+        "model_path": str(model_path),
+    }
+
+
+def _run_rung(
+    pool: ProcessPoolExecutor,
+    candidates: List[Tuple[int, Configuration, Optional[Dict[str, object]]]],
+    epochs: int,
+) -> List[Dict[str, object]]:
+    futures = [
+        pool.submit(_run_trial, trial, configuration, epochs, previous)
+        for trial, configuration, previous in candidates
+    ]
+    return [future.result() for future in futures]
+
+
+def run_search(
+    csv_path: Path,
+    output_dir: Path,
+    *,
+    strategy: str = "halving",
+    trials: int = 12,
+    min_epochs: int = 2,
+    max_epochs: int = 20,
+    eta: int = 3,
+    jobs: Optional[int] = None,
+    threads_per_trial: Optional[int] = None,
+    seed: int = 34,
+    use_cache: bool = True,
+    cache_dir: Optional[Path] = None,
+) -> List[Dict[str, object]]:
+    """Search hyperparameters and save the best model as the artifacts in ``output_dir``.
+
+    Args:
+        csv_path: Kickstarter dataset CSV.
+        output_dir: Where the winning artifacts and the leaderboard are written.
+        strategy: ``"random"`` or ``"halving"``.
+        trials: Number of sampled configurations, the baseline included.
+        min_epochs: Epoch budget of the first successive-halving rung.
+        max_epochs: Epoch budget of random search and of the last rung.
+        eta: Successive-halving reduction factor.
+        jobs: Concurrent trials (default: one per usable CPU, at most ``trials``).
+        threads_per_trial: TensorFlow/BLAS threads per trial (default: CPUs / jobs).
+        seed: Seed of the configuration sampling.
+        use_cache: Load the encoded CSV through the preprocessing cache.
+        cache_dir: Preprocessing cache root.
+
+    Returns:
+        The leaderboard: the last result of every trial, best first.
+    """
+
+    if strategy not in STRATEGIES:
+        raise ValueError(f"strategy must be one of {STRATEGIES}, got {strategy!r}")
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    cpus = _usable_cpus()
+    jobs = max(1, min(jobs or cpus, trials))
+    threads_per_trial = threads_per_trial or max(1, cpus // jobs)
+    output_dir = Path(output_dir)
+    configurations = sample_configurations(trials, seed=seed)
+
+    with tempfile.TemporaryDirectory(prefix="kickstarter-tune-") as work_dir:
+        work_dir = Path(work_dir)
+        scaler, feature_columns = prepare_search_data(csv_path, work_dir, use_cache=use_cache, cache_dir=cache_dir)
+
+        # BLAS reads its thread limit when a worker first imports NumPy, so the limit is set
+        # here, for as long as the pool may spawn workers. TensorFlow is limited in _init_worker.
+        context = multiprocessing.get_context("spawn")
+        latest: Dict[int, Dict[str, object]] = {}
+        with math_library_threads(threads_per_trial), ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(str(work_dir), threads_per_trial),
+        ) as pool:
+            candidates = [(trial, configuration, None) for trial, configuration in enumerate(configurations)]
+            epochs = max_epochs if strategy == "random" else min(min_epochs, max_epochs)
+            rung = 0
+            while True:
+                results = _run_rung(pool, candidates, epochs)
+                for result in results:
+                    result["rung"] = rung
+                    latest[result["trial"]] = result
+                if strategy == "random" or len(candidates) <= 1 or epochs >= max_epochs:
+                    break
+                survivors = sorted(results, key=lambda result: result["val_auc"], reverse=True)
+                survivors = survivors[: max(1, len(results) // eta)]
+                candidates = [(result["trial"], result["configuration"], result) for result in survivors]
+                epochs = min(epochs * eta, max_epochs)
+                rung += 1
+
+        leaderboard = sorted(latest.values(), key=lambda result: (result["rung"], result["val_auc"]), reverse=True)
+        winner = leaderboard[0]
+        model = _import_tensorflow().keras.models.load_model(winner["model_path"])
+        save_artifacts(model, scaler, feature_columns, output_dir)
+
+    for result in leaderboard:
+        del result["model_path"]
+    with open(output_dir / LEADERBOARD_FILENAME, "w", encoding="utf-8") as file:
+        json.dump(
+            {"strategy": strategy, "source": str(csv_path), "winner": winner["trial"], "trials": leaderboard},
+            file,
+            indent=2,
+        )
+    return leaderboard
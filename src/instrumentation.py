@@ -0,0 +1,267 @@
+"""Lightweight latency histograms and counters for the prediction pipeline.
+
+Stages of the pipeline are timed with a context manager or decorator:
+
+```
+from instrumentation import stage, timed
+
+with stage("encode", rows=len(batch)):
+    values = encoder.transform(batch)
+
+@timed("read_upload")
+def read_campaign_file(...): ...
+```
+
+Each stage records a latency histogram (``kickstarter_stage_seconds``) and
+the rows it processed (``kickstarter_stage_rows_total``). The web app adds
+request counters and gauges through the same registry and serves everything
+at ``/metrics`` in the Prometheus text exposition format
+(``render_prometheus``).
+
+Metrics are per process: under gunicorn each worker keeps its own registry
+and a scrape reports the worker that answered it. Set
+``KICKSTARTER_METRICS=0`` to disable recording; ``stage`` then returns a
+shared no-op context manager and costs well under a microsecond.
+"""
+
+import bisect
+import functools
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+METRICS_ENV = "KICKSTARTER_METRICS"
+# Upper bounds in seconds, from sub-millisecond encodes to multi-second uploads.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGE_SECONDS = "kickstarter_stage_seconds"
+STAGE_ROWS = "kickstarter_stage_rows_total"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram of observed values."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Return ``(upper_bound, observations <= upper_bound)`` pairs ending with ``+Inf``."""
+
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+class _StageTimer:
+    """Context manager recording one stage; ``rows`` may be set inside the block."""
+
+    __slots__ = ("registry", "name", "rows", "_start")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, rows: Optional[int]) -> None:
+        self.registry = registry
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self) -> "_StageTimer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.registry.record_stage(self.name, time.perf_counter() - self._start, self.rows)
+
+
+class _NullTimer:
+    __slots__ = ("rows",)
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def _labels(labels: Optional[Dict[str, object]]) -> Labels:
+    return tuple(sorted((str(name), str(value)) for name, value in (labels or {}).items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class MetricsRegistry:
+    """Thread-safe store of histograms, counters and gauges."""
+
+    def __init__(self, *, enabled: bool = True, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        self._help: Dict[str, str] = {
+            STAGE_SECONDS: "Wall time spent in each prediction pipeline stage.",
+            STAGE_ROWS: "Rows processed by each prediction pipeline stage.",
+        }
+
+    def describe(self, metric: str, text: str) -> None:
+        """Set the ``# HELP`` line of ``metric``."""
+
+        self._help[metric] = text
+
+    def stage(self, name: str, rows: Optional[int] = None):
+        """Time a block as pipeline stage ``name``, optionally counting ``rows``."""
+
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, name, rows)
+
+    def timed(self, name: str) -> Callable:
+        """Decorator timing every call of the function as stage ``name``."""
+
+        def decorate(function: Callable) -> Callable:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorate
+
+    def record_stage(self, name: str, seconds: float, rows: Optional[int] = None) -> None:
+        labels = (("stage", name),)
+        self.observe(STAGE_SECONDS, seconds, labels)
+        if rows is not None:
+            self.increment(STAGE_ROWS, rows, labels)
+
+    def observe(self, metric: str, value: float, labels=None) -> None:
+        if not self.enabled:
+            return
+        key = labels if isinstance(labels, tuple) else _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(metric, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def increment(self, metric: str, amount: float = 1, labels=None) -> None:
+        if not self.enabled:
+            return
+        key = labels if isinstance(labels, tuple) else _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(metric, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set_gauge(self, metric: str, value: float, labels=None) -> None:
+        key = labels if isinstance(labels, tuple) else _labels(labels)
+        with self._lock:
+            self._gauges.setdefault(metric, {})[key] = value
+
+    def add_gauge(self, metric: str, delta: float, labels=None) -> None:
+        key = labels if isinstance(labels, tuple) else _labels(labels)
+        with self._lock:
+            series = self._gauges.setdefault(metric, {})
+            series[key] = series.get(key, 0) + delta
+
+    def clear_gauge(self, metric: str) -> None:
+        with self._lock:
+            self._gauges.pop(metric, None)
+
+    def stage_summary(self) -> Dict[str, Dict[str, float]]:
+        """Return count, total and mean seconds and rows per stage."""
+
+        with self._lock:
+            histograms = dict(self._histograms.get(STAGE_SECONDS, {}))
+            rows = dict(self._counters.get(STAGE_ROWS, {}))
+            return {
+                dict(labels)["stage"]: {
+                    "count": histogram.count,
+                    "seconds": histogram.sum,
+                    "mean_seconds": histogram.sum / histogram.count if histogram.count else 0.0,
+                    "rows": rows.get(labels, 0),
+                }
+                for labels, histogram in histograms.items()
+            }
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format (version 0.0.4)."""
+
+        lines: List[str] = []
+        with self._lock:
+            for kind, store in (("counter", self._counters), ("gauge", self._gauges)):
+                for metric in sorted(store):
+                    self._header(lines, metric, kind)
+                    for labels, value in sorted(store[metric].items()):
+                        lines.append(f"{metric}{_format_labels(labels)} {_format_value(value)}")
+            for metric in sorted(self._histograms):
+                self._header(lines, metric, "histogram")
+                for labels, histogram in sorted(self._histograms[metric].items()):
+                    for bound, count in histogram.cumulative():
+                        bucket_labels = _format_labels(labels, ("le", _format_value(bound)))
+                        lines.append(f"{metric}_bucket{bucket_labels} {count}")
+                    lines.append(f"{metric}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                    lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: List[str], metric: str, kind: str) -> None:
+        if metric in self._help:
+            lines.append(f"# HELP {metric} {self._help[metric]}")
+        lines.append(f"# TYPE {metric} {kind}")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+
+_DEFAULT_REGISTRY = MetricsRegistry(enabled=os.environ.get(METRICS_ENV, "1") != "0")
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the process-wide registry the pipeline stages record into."""
+
+    return _DEFAULT_REGISTRY
+
+
+def stage(name: str, rows: Optional[int] = None):
+    """Time a block as a stage of the process-wide registry (see ``MetricsRegistry.stage``)."""
+
+    return _DEFAULT_REGISTRY.stage(name, rows)
+
+
+def timed(name: str) -> Callable:
+    """Decorator form of ``stage`` for the process-wide registry."""
+
+    return _DEFAULT_REGISTRY.timed(name)
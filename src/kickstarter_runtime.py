@@ -0,0 +1,626 @@
+"""NumPy inference runtime for the Kickstarter success model.
+
+This module serves predictions from an exported weight bundle
+(``kickstarter_runtime.npz``) without importing TensorFlow or scikit-learn,
+so web workers and the Excel bridge start quickly and stay small. The bundle
+holds the Dense kernels and biases, the StandardScaler statistics and the
+ordered feature columns; ``model_pipeline.export_runtime_bundle`` writes it
+from the trained Keras artifacts.
+
+Example:
+
+```
+from kickstarter_runtime import load_runtime
+
+runtime = load_runtime(Path("artifacts"))
+probabilities, errors = runtime.predict_probabilities(campaigns)
+```
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import stage
+
+
+CATEGORICAL_COLUMNS = ["category", "main_category", "currency", "country"]
+DATE_COLUMNS = ["deadline", "launched"]
+DATE_PARTS = ["year", "month", "day"]
+# Identifiers dropped before encoding; they carry no signal.
+UNNEEDED_COLUMNS = ["ID", "name"]
+# Numeric columns whose missing values are filled with their training mean instead of rejected.
+IMPUTED_COLUMNS = ["usd pledged"]
+
+# Batches up to this many rows look date strings up in the component cache first;
+# larger ones are parsed in one vectorised pass, which beats per-value lookups.
+DATE_CACHE_MAX_BATCH = 64
+DATE_CACHE_SIZE = 4096
+
+RUNTIME_BUNDLE_FILENAME = "kickstarter_runtime.npz"
+RUNTIME_BUNDLE_VERSION = 1
+# Files whose contents determine the model's predictions.
+MODEL_ARTIFACT_FILENAMES = (
+    RUNTIME_BUNDLE_FILENAME,
+    "kickstarter_model.keras",
+    "scaler.pkl",
+    "feature_columns.json",
+)
+
+DenseLayer = Tuple[np.ndarray, np.ndarray, str]
+
+
+class CampaignTable:
+    """Column-named 2-D block of campaign values, one row per campaign.
+
+    Lets callers that already hold rows (tuples from a sheet, a 2-D array)
+    hand them to the encoder without building a dictionary or a dataframe
+    per row; each column is read as a slice of one object array.
+    """
+
+    __slots__ = ("columns", "values", "_positions")
+
+    def __init__(self, values, columns: Sequence[str]) -> None:
+        values = np.asarray(values, dtype=object)
+        if values.ndim == 1:
+            values = values.reshape(1, -1) if len(values) else values.reshape(0, len(columns))
+        if values.ndim != 2 or values.shape[1] != len(columns):
+            raise ValueError(
+                f"Expected rows of {len(columns)} values ({', '.join(columns)}), got shape {values.shape}"
+            )
+        self.values = values
+        self.columns = list(columns)
+        self._positions = {name: index for index, name in enumerate(self.columns)}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def column(self, name: str) -> Optional[np.ndarray]:
+        position = self._positions.get(name)
+        return None if position is None else self.values[:, position]
+
+
+CampaignBatch = Union[pd.DataFrame, CampaignTable, List[Dict[str, object]]]
+
+
+class FeatureEncoder:
+    """Encode raw campaigns straight into the model feature matrix.
+
+    The encoder is built once from the ordered training feature columns and
+    keeps a precomputed mapping from every categorical value to its one-hot
+    column index. ``transform`` writes numeric values, date components and
+    one-hot flags directly into a preallocated float32 matrix, producing the
+    same values as ``model_pipeline.preprocess_features(..., feature_columns=...)`` without
+    running ``pd.get_dummies`` or inserting missing columns one by one.
+    """
+
+    def __init__(self, feature_columns: Iterable[str], fill_values: Optional[Dict[str, float]] = None) -> None:
+        self.feature_columns: List[str] = list(feature_columns)
+        # Training-time values for missing ``IMPUTED_COLUMNS``; fixed, so a row's
+        # encoding never depends on the other rows in its batch.
+        self.fill_values: Dict[str, float] = {name: float(value) for name, value in (fill_values or {}).items()}
+        self._build_index()
+
+    def _build_index(self) -> None:
+        # Match longer prefixes first so "main_category_*" never lands in "category".
+        prefixes = sorted(CATEGORICAL_COLUMNS, key=len, reverse=True)
+        categories: Dict[str, Dict[str, int]] = {column: {} for column in CATEGORICAL_COLUMNS}
+        self.numeric_index: Dict[str, int] = {}
+
+        for index, name in enumerate(self.feature_columns):
+            for column in prefixes:
+                if name.startswith(f"{column}_"):
+                    categories[column][name[len(column) + 1 :]] = index
+                    break
+            else:
+                self.numeric_index[name] = index
+
+        self.category_index: Dict[str, Dict[str, int]] = {
+            column: mapping for column, mapping in categories.items() if mapping
+        }
+        self._category_lookup = {
+            column: (pd.Index(list(mapping.keys())), np.fromiter(mapping.values(), dtype=np.intp))
+            for column, mapping in self.category_index.items()
+        }
+        self._date_index = {
+            column: {
+                part: self.numeric_index[f"{column}_{part}"]
+                for part in DATE_PARTS
+                if f"{column}_{part}" in self.numeric_index
+            }
+            for column in DATE_COLUMNS
+        }
+
+    def __getstate__(self) -> Dict[str, object]:
+        return {"feature_columns": self.feature_columns, "fill_values": self.fill_values}
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.feature_columns = list(state["feature_columns"])
+        self.fill_values = dict(state.get("fill_values", {}))
+        self._build_index()
+
+    @property
+    def n_features(self) -> int:
+        return len(self.feature_columns)
+
+    def transform(self, campaigns: CampaignBatch) -> np.ndarray:
+        """Encode campaigns into an ``(n_rows, n_features)`` float32 matrix.
+
+        Args:
+            campaigns: Dataframe, ``CampaignTable`` or list of dictionaries, one
+                row per campaign.
+
+        Returns:
+            The unscaled feature matrix in ``feature_columns`` order. Missing
+            ``IMPUTED_COLUMNS`` values take their ``fill_values`` entry; other
+            missing or non-numeric values become ``NaN``. Unknown categories
+            and absent columns are encoded as zeros.
+        """
+
+        n_rows = len(campaigns)
+        matrix = np.zeros((n_rows, self.n_features), dtype=np.float32)
+        if n_rows == 0:
+            return matrix
+
+        derived_columns = set()
+        with stage("parse_dates", rows=n_rows):
+            for column, parts in self._date_index.items():
+                values = _column_values(campaigns, column)
+                if values is None or not parts:
+                    continue
+                components = parse_date_parts(values)
+                for part, index in parts.items():
+                    matrix[:, index] = components[:, DATE_PARTS.index(part)]
+                    derived_columns.add(f"{column}_{part}")
+
+        for name, index in self.numeric_index.items():
+            if name in derived_columns:
+                continue
+            values = _column_values(campaigns, name)
+            if values is None:
+                continue
+            numeric = pd.to_numeric(values, errors="coerce").astype(np.float64)
+            if name in self.fill_values:
+                # Mirror _normalize_dataframe: only genuinely missing values are filled.
+                numeric[pd.isna(values)] = self.fill_values[name]
+            matrix[:, index] = numeric
+
+        for column, (categories, indices) in self._category_lookup.items():
+            values = _column_values(campaigns, column)
+            if values is None:
+                continue
+            present = ~pd.isna(values)
+            positions = categories.get_indexer(values.astype(str))
+            hits = present & (positions >= 0)
+            matrix[np.flatnonzero(hits), indices[positions[hits]]] = 1.0
+
+        return matrix
+
+
+def _column_values(campaigns: CampaignBatch, column: str) -> Optional[np.ndarray]:
+    """Return the raw values of ``column`` as an array, or ``None`` when absent."""
+
+    if isinstance(campaigns, pd.DataFrame):
+        if column not in campaigns.columns:
+            return None
+        return campaigns[column].to_numpy()
+    if isinstance(campaigns, CampaignTable):
+        return campaigns.column(column)
+    if not any(column in record for record in campaigns):
+        return None
+    return np.array([record.get(column) for record in campaigns], dtype=object)
+
+
+_DATE_PART_CACHE: Dict[str, Tuple[float, float, float]] = {}
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+# Character positions in "YYYY-MM-DD HH:MM:SS" (or "YYYY-MM-DDTHH:MM:SS").
+_DATE_DIGITS = [0, 1, 2, 3, 5, 6, 8, 9]
+_TIME_DIGITS = [11, 12, 14, 15, 17, 18]
+
+
+def _character_codes(values: np.ndarray, width: int) -> np.ndarray:
+    """Return the first ``width`` characters of each value's text as a ``(width, n)`` code array."""
+
+    try:
+        raw = values.astype(f"S{width}").view(np.uint8)
+    except UnicodeEncodeError:
+        raw = values.astype(f"U{width}").view(np.uint32)
+    # Rows per character position keep the comparisons below on contiguous memory.
+    return np.ascontiguousarray(raw.reshape(len(values), width).T)
+
+
+def _parse_iso_dates(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorised parser for ``YYYY-MM-DD`` dates and ``YYYY-MM-DD HH:MM:SS`` timestamps.
+
+    Works on the character codes of the values' text, so no Python code runs
+    per value. Returns the ``(n, 3)`` year/month/day components and a mask
+    of the values it parsed; anything else (other layouts, invalid calendar
+    dates, years outside the nanosecond ``Timestamp`` range) is left for
+    ``pd.to_datetime``.
+    """
+
+    # One spare character tells 19-character timestamps from longer strings.
+    codes = _character_codes(values, 20)
+    # Unsigned wrap-around turns every non-digit into a large number.
+    digits = codes - codes.dtype.type(ord("0"))
+
+    valid = (digits[_DATE_DIGITS] < 10).all(axis=0) & (codes[4] == ord("-")) & (codes[7] == ord("-"))
+    date_only = (codes[10] == 0) & (codes[9] != 0)
+    timestamp = (
+        (codes[19] == 0)
+        & (digits[_TIME_DIGITS] < 10).all(axis=0)
+        & ((codes[10] == ord(" ")) | (codes[10] == ord("T")))
+        & (codes[13] == ord(":"))
+        & (codes[16] == ord(":"))
+    )
+    digits = digits.astype(np.int32)
+    timestamp &= (
+        (digits[11] * 10 + digits[12] < 24) & (digits[14] * 10 + digits[15] < 60) & (digits[17] * 10 + digits[18] < 60)
+    )
+    valid &= date_only | timestamp
+
+    year = digits[0] * 1000 + digits[1] * 100 + digits[2] * 10 + digits[3]
+    month = digits[5] * 10 + digits[6]
+    day = digits[8] * 10 + digits[9]
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_ok = (month >= 1) & (month <= 12)
+    days_in_month = _DAYS_IN_MONTH[np.where(month_ok, month, 0)] + ((month == 2) & leap)
+    valid &= month_ok & (day >= 1) & (day <= days_in_month) & (year >= 1678) & (year <= 2261)
+
+    parts = np.full((len(values), 3), np.nan)
+    parts[valid, 0] = year[valid]
+    parts[valid, 1] = month[valid]
+    parts[valid, 2] = day[valid]
+    return parts, valid
+
+
+def _parse_date_values(values: np.ndarray) -> np.ndarray:
+    """Parse an object array: ISO text on the fast path, everything else with ``pd.to_datetime``."""
+
+    parts, parsed = _parse_iso_dates(values)
+    rest = np.flatnonzero(~parsed)
+    if len(rest):
+        fallback = pd.DatetimeIndex(pd.to_datetime(values[rest], errors="coerce"))
+        parts[rest] = np.column_stack([fallback.year, fallback.month, fallback.day])
+    return parts
+
+
+def parse_date_parts(values) -> np.ndarray:
+    """Return the year, month and day of each value as an ``(n, 3)`` float array.
+
+    Gives the same components as ``pd.to_datetime(values, errors="coerce")``
+    with ``NaN`` for missing or unparsable values, but without format
+    inference: ``YYYY-MM-DD`` dates and ``YYYY-MM-DD HH:MM:SS`` Kickstarter
+    timestamps are decoded in one vectorised pass and only other values go
+    through ``pd.to_datetime``. Each value is parsed on its own, so a column
+    mixing formats is not cut down to the format of its first value. Small
+    batches (single predictions) reuse the components of date strings seen
+    before.
+    """
+
+    values = values.to_numpy() if isinstance(values, pd.Series) else np.asarray(values)
+    if values.dtype.kind == "M":
+        index = pd.DatetimeIndex(values)
+        return np.column_stack([index.year, index.month, index.day]).astype(np.float64)
+    values = values.astype(object, copy=False).reshape(-1)
+    if len(values) > DATE_CACHE_MAX_BATCH:
+        return _parse_date_values(values)
+
+    parts = np.full((len(values), 3), np.nan)
+    misses = []
+    for row, value in enumerate(values):
+        cached = _DATE_PART_CACHE.get(value) if type(value) is str else None
+        if cached is None:
+            misses.append(row)
+        else:
+            parts[row] = cached
+    if misses:
+        parsed = _parse_date_values(values[misses])
+        parts[misses] = parsed
+        if len(_DATE_PART_CACHE) + len(misses) > DATE_CACHE_SIZE:
+            _DATE_PART_CACHE.clear()
+        for value, components in zip(values[misses], parsed):
+            if type(value) is str:
+                _DATE_PART_CACHE[value] = tuple(components)
+    return parts
+
+
+def _relu(x: np.ndarray) -> np.ndarray:
+    return np.maximum(x, 0.0, out=x)
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    # tanh form avoids overflow warnings for large negative logits.
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
+def _linear(x: np.ndarray) -> np.ndarray:
+    return x
+
+
+ACTIVATIONS = {"relu": _relu, "sigmoid": _sigmoid, "linear": _linear}
+
+
+class CompiledPredictor:
+    """Dense network with the StandardScaler folded into its first layer.
+
+    Inference is a handful of float32 matrix products in NumPy, which avoids
+    the per-call setup cost of ``model.predict`` for single campaigns and
+    small batches. The predictor consumes the *unscaled* matrix produced by
+    ``FeatureEncoder.transform``.
+    """
+
+    def __init__(self, layers: Iterable[Tuple[np.ndarray, np.ndarray, str]]) -> None:
+        self.layers: List[Tuple[np.ndarray, np.ndarray, str]] = []
+        for kernel, bias, activation in layers:
+            if activation not in ACTIVATIONS:
+                raise ValueError(f"Unsupported activation for compiled inference: {activation}")
+            self.layers.append(
+                (np.asarray(kernel, dtype=np.float32), np.asarray(bias, dtype=np.float32), activation)
+            )
+
+    @property
+    def input_dim(self) -> int:
+        return self.layers[0][0].shape[0]
+
+    def predict(self, features: np.ndarray, *, batch_size: int = 1024) -> np.ndarray:
+        """Return one probability per row of the unscaled feature matrix."""
+
+        features = np.asarray(features, dtype=np.float32)
+        outputs = np.empty(features.shape[0], dtype=np.float32)
+        for start in range(0, features.shape[0], batch_size):
+            hidden = features[start : start + batch_size]
+            for kernel, bias, activation in self.layers:
+                hidden = ACTIVATIONS[activation](hidden @ kernel + bias)
+            outputs[start : start + batch_size] = hidden.reshape(-1)
+        return outputs
+
+
+def fold_scaler(
+    layers: Sequence[DenseLayer], mean: Optional[np.ndarray], scale: Optional[np.ndarray]
+) -> List[DenseLayer]:
+    """Fold a StandardScaler into the first Dense layer.
+
+    ``StandardScaler`` computes ``(x - mean) / scale``, so the first layer
+    ``x_scaled @ W + b`` is rewritten as ``x @ (W / scale) + (b - (mean / scale) @ W)``.
+    """
+
+    if not layers:
+        raise ValueError("Model has no Dense layers to compile")
+
+    first_kernel, first_bias, activation = layers[0]
+    first_kernel = np.asarray(first_kernel, dtype=np.float64)
+    mean = np.zeros(first_kernel.shape[0]) if mean is None else np.asarray(mean, dtype=np.float64)
+    scale = np.ones(first_kernel.shape[0]) if scale is None else np.asarray(scale, dtype=np.float64)
+
+    folded_kernel = first_kernel / scale[:, np.newaxis]
+    folded_bias = np.asarray(first_bias, dtype=np.float64) - (mean / scale) @ first_kernel
+    return [(folded_kernel, folded_bias, activation), *layers[1:]]
+
+
+class KickstarterRuntime:
+    """Feature encoder plus compiled predictor: everything needed to score campaigns."""
+
+    def __init__(self, encoder: FeatureEncoder, predictor: CompiledPredictor) -> None:
+        if encoder.n_features != predictor.input_dim:
+            raise ValueError(
+                f"Encoder produces {encoder.n_features} features but the model expects {predictor.input_dim}"
+            )
+        self.encoder = encoder
+        self.predictor = predictor
+        # Fingerprint of the artifacts this runtime was loaded from (see ``artifact_version``).
+        self.version: Optional[str] = None
+
+    @property
+    def feature_columns(self) -> List[str]:
+        return self.encoder.feature_columns
+
+    def predict_probabilities(
+        self,
+        campaigns: Union[pd.DataFrame, CampaignTable, Dict[str, object], Iterable[Dict[str, object]]],
+        *,
+        batch_size: int = 1024,
+    ) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """Predict success probabilities for many campaigns in one pass.
+
+        Args:
+            campaigns: Dataframe, ``CampaignTable`` or iterable of dictionaries,
+                one row per campaign.
+            batch_size: Number of rows sent through the network per chunk.
+
+        Returns:
+            probabilities: Array with one probability per input row, in input
+                order. Rows that could not be scored are ``NaN``.
+            errors: One entry per input row; ``None`` when the row was scored,
+                otherwise a short reason explaining why it was skipped.
+        """
+
+        batch = as_campaign_batch(campaigns)
+        probabilities = np.full(len(batch), np.nan, dtype=np.float64)
+        errors: List[Optional[str]] = [None] * len(batch)
+        if len(batch) == 0:
+            return probabilities, errors
+
+        with stage("encode", rows=len(batch)):
+            values = self.encoder.transform(batch)
+
+        finite = np.isfinite(values)
+        valid_rows = finite.all(axis=1)
+        for row in np.flatnonzero(~valid_rows):
+            bad_columns = [self.feature_columns[col] for col in np.flatnonzero(~finite[row])]
+            errors[row] = f"Missing or non-numeric values for: {', '.join(bad_columns)}"
+
+        if valid_rows.any():
+            with stage("forward", rows=int(valid_rows.sum())):
+                probabilities[valid_rows] = self.predictor.predict(values[valid_rows], batch_size=batch_size)
+
+        return probabilities, errors
+
+    def predict_probability(self, campaign: Dict[str, object]) -> float:
+        """Predict the success probability for a single campaign.
+
+        Raises:
+            ValueError: If the campaign has missing or non-numeric feature values.
+        """
+
+        probabilities, errors = self.predict_probabilities([campaign])
+        if errors[0] is not None:
+            raise ValueError(errors[0])
+        return float(probabilities[0])
+
+
+def as_campaign_batch(
+    campaigns: Union[pd.DataFrame, CampaignTable, Dict[str, object], Iterable[Dict[str, object]]]
+) -> CampaignBatch:
+    """Coerce a single campaign dict or an iterable of dicts into a list, keeping dataframes and tables as-is."""
+
+    if isinstance(campaigns, pd.DataFrame):
+        return campaigns.reset_index(drop=True)
+    if isinstance(campaigns, CampaignTable):
+        return campaigns
+    if isinstance(campaigns, dict):
+        return [campaigns]
+    return list(campaigns)
+
+
+def scaler_fill_values(feature_columns: Iterable[str], scaler_mean: Optional[np.ndarray]) -> Dict[str, float]:
+    """Return the training means of the ``IMPUTED_COLUMNS``, read from the scaler statistics."""
+
+    if scaler_mean is None:
+        return {}
+    feature_columns = list(feature_columns)
+    return {
+        name: float(scaler_mean[feature_columns.index(name)])
+        for name in IMPUTED_COLUMNS
+        if name in feature_columns
+    }
+
+
+def save_runtime_bundle(
+    path: Path,
+    layers: Sequence[DenseLayer],
+    scaler_mean: Optional[np.ndarray],
+    scaler_scale: Optional[np.ndarray],
+    feature_columns: Iterable[str],
+    fill_values: Optional[Dict[str, float]] = None,
+) -> None:
+    """Write unfolded Dense weights, scaler statistics and feature columns to an ``.npz`` bundle.
+
+    ``fill_values`` default to the scaler means of the ``IMPUTED_COLUMNS``.
+    """
+
+    feature_columns = list(feature_columns)
+    if fill_values is None:
+        fill_values = scaler_fill_values(feature_columns, scaler_mean)
+    arrays: Dict[str, np.ndarray] = {
+        "format_version": np.array(RUNTIME_BUNDLE_VERSION),
+        "feature_columns": np.array(feature_columns, dtype=str),
+        "activations": np.array([activation for _, _, activation in layers], dtype=str),
+        "fill_columns": np.array(list(fill_values), dtype=str),
+        "fill_values": np.array(list(fill_values.values()), dtype=np.float64),
+    }
+    n_inputs = len(feature_columns)
+    arrays["scaler_mean"] = np.zeros(n_inputs) if scaler_mean is None else np.asarray(scaler_mean)
+    arrays["scaler_scale"] = np.ones(n_inputs) if scaler_scale is None else np.asarray(scaler_scale)
+    for index, (kernel, bias, _) in enumerate(layers):
+        arrays[f"kernel_{index}"] = np.asarray(kernel, dtype=np.float32)
+        arrays[f"bias_{index}"] = np.asarray(bias, dtype=np.float32)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as bundle_file:
+        np.savez(bundle_file, **arrays)
+
+
+def load_runtime_bundle(path: Path) -> KickstarterRuntime:
+    """Load a runtime from an ``.npz`` bundle written by ``save_runtime_bundle``."""
+
+    with np.load(path, allow_pickle=False) as bundle:
+        version = int(bundle["format_version"])
+        if version != RUNTIME_BUNDLE_VERSION:
+            raise ValueError(f"Unsupported runtime bundle version {version} in {path}")
+        layers = [
+            (bundle[f"kernel_{index}"], bundle[f"bias_{index}"], str(activation))
+            for index, activation in enumerate(bundle["activations"])
+        ]
+        folded = fold_scaler(layers, bundle["scaler_mean"], bundle["scaler_scale"])
+        feature_columns = bundle["feature_columns"].tolist()
+        if "fill_columns" in bundle:
+            fill_values = dict(zip(bundle["fill_columns"].tolist(), bundle["fill_values"].tolist()))
+        else:  # Bundles written before fill values were stored.
+            fill_values = scaler_fill_values(feature_columns, bundle["scaler_mean"])
+        encoder = FeatureEncoder(feature_columns, fill_values)
+    return KickstarterRuntime(encoder, CompiledPredictor(folded))
+
+
+# model_dir -> (stat signature, content hash) of the last ``artifact_version`` call.
+_VERSION_MEMO: Dict[str, Tuple[Tuple, str]] = {}
+
+
+def artifact_signature(model_dir: Path) -> Tuple:
+    """Return the name, size and modification time of each artifact file; cheap to poll."""
+
+    signature = []
+    for name in MODEL_ARTIFACT_FILENAMES:
+        try:
+            stat = (Path(model_dir) / name).stat()
+        except FileNotFoundError:
+            continue
+        signature.append((name, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def artifact_version(model_dir: Path) -> str:
+    """Return a short content hash of the model artifacts in ``model_dir``.
+
+    The hash covers every file in ``MODEL_ARTIFACT_FILENAMES``, so identical
+    artifacts share a version wherever they live and any retrained model
+    gets a new one. Files are only re-read when their size or modification
+    time changed since the last call, so polling stays cheap.
+    """
+
+    key = str(Path(model_dir).resolve())
+    signature = artifact_signature(model_dir)
+    memo = _VERSION_MEMO.get(key)
+    if memo is not None and memo[0] == signature:
+        return memo[1]
+
+    digest = hashlib.sha256()
+    for name, _, _ in signature:
+        digest.update(name.encode() + b"\0")
+        with open(Path(model_dir) / name, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+    version = digest.hexdigest()[:16]
+    _VERSION_MEMO[key] = (signature, version)
+    return version
+
+
+def load_runtime(model_dir: Path, *, allow_keras_fallback: bool = True) -> KickstarterRuntime:
+    """Load the serving runtime for an artifact directory.
+
+    Uses ``kickstarter_runtime.npz`` when present. Otherwise, and only when
+    ``allow_keras_fallback`` is set, the Keras artifacts are loaded through
+    ``model_pipeline`` (which requires TensorFlow) and compiled in memory.
+    The returned runtime's ``version`` is the ``artifact_version`` of the
+    directory, taken before loading.
+    """
+
+    model_dir = Path(model_dir)
+    version = artifact_version(model_dir)
+    bundle_path = model_dir / RUNTIME_BUNDLE_FILENAME
+    if bundle_path.exists():
+        runtime = load_runtime_bundle(bundle_path)
+    elif not allow_keras_fallback:
+        raise FileNotFoundError(
+            f"{bundle_path} not found. Create it with: python src/model_pipeline.py export --model-dir {model_dir}"
+        )
+    else:
+        from model_pipeline import load_artifacts, build_runtime
+
+        model, scaler, feature_columns = load_artifacts(model_dir)
+        runtime = build_runtime(model, scaler, feature_columns)
+    runtime.version = version
+    return runtime
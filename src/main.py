@@ -17,7 +17,17 @@ from pathlib import Path
 # Add parent directory to path so imports work when called from Excel
 sys.path.insert(0, str(Path(__file__).parent))
 
-from excel_integration import KICKSTARTER_SUCCESS_PROBABILITY, KICKSTARTER_SUCCESS_SUMMARY
+from excel_integration import (
+    KICKSTARTER_SCORE_RANGE,
+    KICKSTARTER_SCORE_RANGE_ASYNC,
+    KICKSTARTER_SUCCESS_PROBABILITY,
+    KICKSTARTER_SUCCESS_SUMMARY,
+)
 
 # Re-export the UDFs so xlwings can discover them
-__all__ = ['KICKSTARTER_SUCCESS_PROBABILITY', 'KICKSTARTER_SUCCESS_SUMMARY']
+__all__ = [
+    'KICKSTARTER_SUCCESS_PROBABILITY',
+    'KICKSTARTER_SUCCESS_SUMMARY',
+    'KICKSTARTER_SCORE_RANGE',
+    'KICKSTARTER_SCORE_RANGE_ASYNC',
+]
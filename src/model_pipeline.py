@@ -11,32 +11,108 @@ Under Supervision of:
 The module reorganizes the original notebook-style workflow into reusable
 functions that can be called from an Excel plugin or any other client. It
 includes helpers to train the TensorFlow model, persist the preprocessing
-and run predictions for a single campaign instance.
+and run predictions for a single campaign or a whole batch of campaigns.
+
+TensorFlow and scikit-learn are imported lazily inside the functions that
+need them, so prediction entry points backed by the NumPy runtime (and
+``--help``) start without paying for either import.
 """
 
+from __future__ import annotations
+
+import time
+
+_MODULE_IMPORT_START = time.perf_counter()
+
 import argparse
 import json
+import math
+import os
 import pickle
+import sys
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.utils import class_weight
-import tensorflow as tf
 
+from kickstarter_runtime import (
+    CATEGORICAL_COLUMNS,
+    DATE_COLUMNS,
+    DATE_PARTS,
+    RUNTIME_BUNDLE_FILENAME,
+    UNNEEDED_COLUMNS,
+    CompiledPredictor,
+    DenseLayer,
+    FeatureEncoder,
+    KickstarterRuntime,
+    fold_scaler,
+    load_runtime,
+    parse_date_parts,
+    save_runtime_bundle,
+    scaler_fill_values,
+)
+from batch_scoring import DEFAULT_CHUNKSIZE, score_csv
+from feature_store import DEFAULT_STORE_CHUNKSIZE, FeatureStore, build_feature_store
+from instrumentation import stage
+from preprocessing_cache import CACHE_DIR_ENV, load_or_build
+from prediction_service import SERVER_ADDRESS_ENV, PredictionClient, default_server_address, serve
+
+if TYPE_CHECKING:
+    import tensorflow as tf
+    from sklearn.preprocessing import StandardScaler
+
+
+FEATURE_ENCODER_FILENAME = "feature_encoder.pkl"
+
+# Adam's default step size, tuned for the original batch size of 64.
+BASE_LEARNING_RATE = 1e-3
+BASE_BATCH_SIZE = 64
+INPUT_PIPELINES = ("numpy", "tfdata")
+
+# Wall-clock seconds spent in startup stages, reported by ``--profile-startup``.
+STARTUP_TIMINGS: Dict[str, float] = {}
+
+
+@contextmanager
+def _startup_stage(name: str) -> Iterator[None]:
+    """Record how long the first execution of a startup stage takes."""
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STARTUP_TIMINGS.setdefault(name, time.perf_counter() - start)
 
-UNNEEDED_COLUMNS = ["ID", "name"]
-CATEGORICAL_COLUMNS = ["category", "main_category", "currency", "country"]
 
+def _import_tensorflow():
+    """Import TensorFlow on first use."""
 
-def _normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    with _startup_stage("import tensorflow"):
+        import tensorflow as tf
+    return tf
+
+
+def _import_sklearn():
+    """Import the scikit-learn helpers used for training on first use."""
+
+    with _startup_stage("import sklearn"):
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.utils import class_weight
+    return train_test_split, StandardScaler, class_weight
+
+
+def _normalize_dataframe(df: pd.DataFrame, fill_values: Optional[Dict[str, float]] = None) -> pd.DataFrame:
     """Clean and enrich the raw Kickstarter dataframe.
 
     Args:
         df: Raw dataframe loaded from the CSV file.
+        fill_values: Fixed values for missing ``usd pledged`` entries. Training
+            leaves this unset and fills with the mean of ``df``; inference
+            passes the training-time value so rows do not affect each other.
 
     Returns:
         A dataframe with unused columns removed, outcome encoded as 0/1,
@@ -49,7 +125,8 @@ def _normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
 
     # Replace missing pledged values with the mean to keep the numerical scale stable.
     if "usd pledged" in normalized.columns:
-        normalized["usd pledged"] = normalized["usd pledged"].fillna(normalized["usd pledged"].mean())
+        fill_value = (fill_values or {}).get("usd pledged", normalized["usd pledged"].mean())
+        normalized["usd pledged"] = normalized["usd pledged"].fillna(fill_value)
 
     # Limit labels to the binary outcomes the model understands.
     if "state" in normalized.columns:
@@ -57,19 +134,24 @@ def _normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
         normalized["state"] = normalized["state"].map({"successful": 1, "failed": 0})
 
     # Convert dates to structured components for the neural network.
-    for column in ["deadline", "launched"]:
+    for column in DATE_COLUMNS:
         if column in normalized.columns:
-            normalized[column] = pd.to_datetime(normalized[column], errors="coerce")
-            normalized[f"{column}_year"] = normalized[column].dt.year
-            normalized[f"{column}_month"] = normalized[column].dt.month
-            normalized[f"{column}_day"] = normalized[column].dt.day
+            components = parse_date_parts(normalized[column])
+            # Keep the dtypes of the ``.dt`` accessors: int32, or float64 once a date is missing.
+            if not np.isnan(components).any():
+                components = components.astype(np.int32)
+            for position, part in enumerate(DATE_PARTS):
+                normalized[f"{column}_{part}"] = components[:, position]
             normalized = normalized.drop(columns=[column])
 
     return normalized.reset_index(drop=True)
 
 
 def preprocess_features(
-    df: pd.DataFrame, *, feature_columns: Optional[Iterable[str]] = None
+    df: pd.DataFrame,
+    *,
+    feature_columns: Optional[Iterable[str]] = None,
+    fill_values: Optional[Dict[str, float]] = None,
 ) -> Tuple[pd.DataFrame, Optional[pd.Series], List[str]]:
     """Prepare model-ready features.
 
@@ -79,6 +161,8 @@ def preprocess_features(
             provided, the returned dataframe will contain exactly this set of
             columns (missing values are filled with zeros) to keep inference
             aligned with training.
+        fill_values: Training-time values for missing ``usd pledged``
+            entries (see ``FeatureEncoder.fill_values``).
 
     Returns:
         features: Numerical dataframe ready for scaling.
@@ -87,13 +171,15 @@ def preprocess_features(
             construct the features matrix.
     """
 
-    normalized = _normalize_dataframe(df)
+    with stage("normalize", rows=len(df)):
+        normalized = _normalize_dataframe(df, fill_values)
     labels = normalized["state"] if "state" in normalized.columns else None
     if "state" in normalized.columns:
         normalized = normalized.drop(columns=["state"])
 
     categorical = [col for col in CATEGORICAL_COLUMNS if col in normalized.columns]
-    encoded = pd.get_dummies(normalized, columns=categorical, drop_first=False)
+    with stage("get_dummies", rows=len(normalized)):
+        encoded = pd.get_dummies(normalized, columns=categorical, drop_first=False)
 
     if feature_columns is None:
         used_columns = list(encoded.columns)
@@ -108,38 +194,358 @@ def preprocess_features(
     return features, labels, used_columns
 
 
-def build_model(input_dim: int) -> tf.keras.Model:
-    """Create a small feedforward neural network for binary classification."""
+EncoderKey = Tuple[Tuple[str, ...], Tuple[Tuple[str, float], ...]]
+_ENCODER_CACHE: Dict[EncoderKey, FeatureEncoder] = {}
+
+
+def _encoder_key(feature_columns: Iterable[str], fill_values: Optional[Dict[str, float]]) -> EncoderKey:
+    return tuple(feature_columns), tuple(sorted((name, float(value)) for name, value in (fill_values or {}).items()))
+
+
+def get_feature_encoder(
+    feature_columns: Union[FeatureEncoder, Iterable[str]], fill_values: Optional[Dict[str, float]] = None
+) -> FeatureEncoder:
+    """Return a cached encoder for ``feature_columns`` and ``fill_values`` (or the encoder itself)."""
+
+    if isinstance(feature_columns, FeatureEncoder):
+        return feature_columns
+    key = _encoder_key(feature_columns, fill_values)
+    if key not in _ENCODER_CACHE:
+        _ENCODER_CACHE[key] = FeatureEncoder(key[0], fill_values)
+    return _ENCODER_CACHE[key]
+
 
+def build_model(
+    input_dim: int,
+    *,
+    learning_rate: float = BASE_LEARNING_RATE,
+    hidden_units: Sequence[int] = (128, 64),
+    dropout: float = 0.2,
+) -> tf.keras.Model:
+    """Create a small feedforward neural network for binary classification.
+
+    Args:
+        input_dim: Number of input features.
+        learning_rate: Adam step size.
+        hidden_units: Width of each ReLU hidden layer.
+        dropout: Dropout rate after every hidden layer but the last.
+    """
+
+    tf = _import_tensorflow()
     inputs = tf.keras.Input(shape=(input_dim,))
-    x = tf.keras.layers.Dense(128, activation="relu")(inputs)
-    x = tf.keras.layers.Dropout(0.2)(x)
-    x = tf.keras.layers.Dense(64, activation="relu")(x)
-    outputs = tf.keras.layers.Dense(1, activation="sigmoid")(x)
+    x = inputs
+    for index, units in enumerate(hidden_units):
+        x = tf.keras.layers.Dense(units, activation="relu")(x)
+        if dropout and index < len(hidden_units) - 1:
+            x = tf.keras.layers.Dropout(dropout)(x)
+    # Keep the output in float32 so the sigmoid and loss stay stable under mixed precision.
+    outputs = tf.keras.layers.Dense(1, activation="sigmoid", dtype="float32")(x)
 
     model = tf.keras.Model(inputs, outputs)
     model.compile(
-        optimizer="adam",
+        optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate),
         loss="binary_crossentropy",
         metrics=["accuracy", tf.keras.metrics.AUC(name="auc")],
     )
     return model
 
 
+def _dense_layers(model: tf.keras.Model) -> List[DenseLayer]:
+    """Extract ``(kernel, bias, activation)`` for every Dense layer of ``model``.
+
+    Dropout layers are identity at inference time and are skipped.
+
+    Raises:
+        ValueError: If the model contains layers other than Dense and Dropout.
+    """
+
+    tf = _import_tensorflow()
+    layers: List[DenseLayer] = []
+    for layer in model.layers:
+        if isinstance(layer, (tf.keras.layers.InputLayer, tf.keras.layers.Dropout)):
+            continue
+        if not isinstance(layer, tf.keras.layers.Dense):
+            raise ValueError(f"Cannot compile layer {layer.name!r} of type {type(layer).__name__}")
+        weights = layer.get_weights()
+        kernel = weights[0]
+        bias = weights[1] if layer.use_bias else np.zeros(kernel.shape[1], dtype=kernel.dtype)
+        layers.append((kernel, bias, layer.activation.__name__))
+    return layers
+
+
+def export_compiled_predictor(model: tf.keras.Model, scaler: StandardScaler) -> CompiledPredictor:
+    """Fold the scaler into the model weights and return a NumPy predictor."""
+
+    return CompiledPredictor(fold_scaler(_dense_layers(model), scaler.mean_, scaler.scale_))
+
+
+def export_runtime_bundle(
+    model: tf.keras.Model,
+    scaler: StandardScaler,
+    feature_columns: Iterable[str],
+    output_dir: Path,
+) -> Path:
+    """Write the TensorFlow-free ``kickstarter_runtime.npz`` bundle for serving."""
+
+    bundle_path = output_dir / RUNTIME_BUNDLE_FILENAME
+    save_runtime_bundle(bundle_path, _dense_layers(model), scaler.mean_, scaler.scale_, feature_columns)
+    return bundle_path
+
+
+def build_runtime(
+    model: tf.keras.Model, scaler: StandardScaler, feature_columns: Union[FeatureEncoder, Iterable[str]]
+) -> KickstarterRuntime:
+    """Wrap in-memory artifacts in a ``KickstarterRuntime``.
+
+    Missing ``usd pledged`` values are filled with the scaler's training mean
+    unless ``feature_columns`` is an encoder that carries its own fill values.
+    """
+
+    if not isinstance(feature_columns, FeatureEncoder):
+        feature_columns = list(feature_columns)
+        feature_columns = get_feature_encoder(feature_columns, scaler_fill_values(feature_columns, scaler.mean_))
+    return KickstarterRuntime(feature_columns, get_compiled_predictor(model, scaler))
+
+
+# Keyed weakly by model so compiled weights are dropped together with the model.
+_COMPILED_CACHE: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def get_compiled_predictor(model: tf.keras.Model, scaler: StandardScaler) -> CompiledPredictor:
+    """Return the compiled predictor for ``model``/``scaler``, exporting it on first use."""
+
+    cached = _COMPILED_CACHE.get(model)
+    if cached is None or cached[0] is not scaler:
+        cached = (scaler, export_compiled_predictor(model, scaler))
+        _COMPILED_CACHE[model] = cached
+    return cached[1]
+
+
+def load_training_data(csv_path: Path) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """Parse and encode a labeled CSV into a float32 feature matrix, labels and feature columns."""
+
+    features, labels, feature_columns = preprocess_features(pd.read_csv(csv_path))
+    return features.to_numpy(dtype=np.float32), labels.to_numpy(dtype=np.uint8), feature_columns
+
+
+def scaled_learning_rate(batch_size: int, base_learning_rate: float = BASE_LEARNING_RATE) -> float:
+    """Scale the learning rate with the square root of the batch size.
+
+    Larger batches take fewer, less noisy steps per epoch. Square-root scaling
+    keeps Adam stable where the linear rule overshoots at a few thousand rows
+    per batch, and leaves the original batch size of 64 unchanged.
+    """
+
+    return base_learning_rate * math.sqrt(batch_size / BASE_BATCH_SIZE)
+
+
+def _usable_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def configure_tensorflow_threads(intra_op: Optional[int] = None, inter_op: Optional[int] = None) -> None:
+    """Set TensorFlow's intra-op and inter-op thread pool sizes.
+
+    Must run before TensorFlow executes its first operation; afterwards the
+    pools are fixed and a note is printed instead.
+
+    Args:
+        intra_op: Threads used inside one operation (the matrix multiplies).
+            ``None`` keeps TensorFlow's default.
+        inter_op: Operations run concurrently. ``None`` keeps the default.
+    """
+
+    tf = _import_tensorflow()
+    try:
+        if intra_op:
+            tf.config.threading.set_intra_op_parallelism_threads(intra_op)
+        if inter_op:
+            tf.config.threading.set_inter_op_parallelism_threads(inter_op)
+    except RuntimeError:
+        print("TensorFlow is already initialized; keeping its current thread settings", file=sys.stderr)
+
+
+@contextmanager
+def _precision_policy(mixed_precision: bool) -> Iterator[None]:
+    """Build models under ``mixed_bfloat16`` for the duration of the block."""
+
+    if not mixed_precision:
+        yield
+        return
+    tf = _import_tensorflow()
+    previous = tf.keras.mixed_precision.global_policy().name
+    tf.keras.mixed_precision.set_global_policy("mixed_bfloat16")
+    try:
+        yield
+    finally:
+        tf.keras.mixed_precision.set_global_policy(previous)
+
+
+def make_dataset(
+    features: np.ndarray,
+    labels: np.ndarray,
+    *,
+    batch_size: int,
+    mean: np.ndarray,
+    scale: np.ndarray,
+    class_weights: Optional[Dict[int, float]] = None,
+    shuffle: bool = False,
+    cache: bool = False,
+    seed: int = 34,
+) -> tf.data.Dataset:
+    """Build a batched ``tf.data`` pipeline over unscaled features.
+
+    Scaling and class weighting run as a parallel map over whole batches, so
+    they overlap with training instead of being materialized up front, and
+    ``prefetch`` prepares the next batch while the current one trains.
+
+    Args:
+        features: Unscaled feature matrix.
+        labels: Binary labels.
+        batch_size: Rows per batch.
+        mean: Per-feature mean subtracted in the map.
+        scale: Per-feature scale divided by in the map.
+        class_weights: Optional ``{label: weight}``, emitted as sample weights.
+        shuffle: Reshuffle the rows every epoch.
+        cache: Keep the prepared batches in memory after the first epoch.
+            Only useful without ``shuffle`` (e.g. validation data).
+        seed: Shuffle seed.
+
+    Returns:
+        A dataset of ``(features, labels)`` or ``(features, labels, weights)`` batches.
+    """
+
+    tf = _import_tensorflow()
+    autotune = tf.data.AUTOTUNE
+    features = tf.constant(np.asarray(features, dtype=np.float32))
+    labels = tf.constant(np.asarray(labels, dtype=np.float32).reshape(-1, 1))
+    mean = tf.constant(np.asarray(mean, dtype=np.float32))
+    scale = tf.constant(np.asarray(scale, dtype=np.float32))
+    weights = None
+    if class_weights is not None:
+        weights = tf.constant([class_weights[0], class_weights[1]], dtype=tf.float32)
+
+    # Shuffle row indices rather than rows, then gather each batch in one vectorized op.
+    dataset = tf.data.Dataset.range(int(features.shape[0]))
+    if shuffle:
+        dataset = dataset.shuffle(int(features.shape[0]), seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.batch(batch_size)
+
+    def prepare(indices):
+        batch_labels = tf.gather(labels, indices)
+        batch_features = (tf.gather(features, indices) - mean) / scale
+        if weights is None:
+            return batch_features, batch_labels
+        return batch_features, batch_labels, tf.gather(weights, tf.cast(batch_labels[:, 0], tf.int32))
+
+    dataset = dataset.map(prepare, num_parallel_calls=autotune)
+    if cache:
+        dataset = dataset.cache()
+    return dataset.prefetch(autotune)
+
+
+def _epoch_timer(samples_per_epoch: int, *, verbose: bool = True):
+    """Return a Keras callback that records (and optionally prints) epoch wall time and throughput."""
+
+    tf = _import_tensorflow()
+
+    class EpochTimer(tf.keras.callbacks.Callback):
+        def __init__(self) -> None:
+            super().__init__()
+            self.epoch_seconds: List[float] = []
+            self._start = 0.0
+
+        def on_epoch_begin(self, epoch, logs=None):
+            self._start = time.perf_counter()
+
+        def on_epoch_end(self, epoch, logs=None):
+            seconds = time.perf_counter() - self._start
+            self.epoch_seconds.append(seconds)
+            if verbose:
+                print(f"Epoch {epoch + 1}: {seconds:.2f}s, {samples_per_epoch / seconds:,.0f} samples/sec")
+
+        def summary(self) -> Dict[str, float]:
+            total = sum(self.epoch_seconds)
+            return {
+                "epochs_trained": float(len(self.epoch_seconds)),
+                "epoch_seconds": total / len(self.epoch_seconds) if self.epoch_seconds else 0.0,
+                "samples_per_second": samples_per_epoch * len(self.epoch_seconds) / total if total else 0.0,
+            }
+
+    return EpochTimer()
+
+
 def train_model(
     csv_path: Path,
     *,
     batch_size: int = 64,
     epochs: int = 50,
     validation_split: float = 0.2,
+    input_pipeline: str = "numpy",
+    learning_rate: Optional[float] = None,
+    intra_op_threads: Optional[int] = None,
+    inter_op_threads: Optional[int] = None,
+    mixed_precision: bool = False,
+    use_cache: bool = True,
+    cache_dir: Optional[Path] = None,
 ) -> Tuple[tf.keras.Model, StandardScaler, List[str], Dict[str, float]]:
-    """Train the Kickstarter classifier and report evaluation metrics."""
+    """Train the Kickstarter classifier and report evaluation metrics.
+
+    Args:
+        csv_path: Kickstarter dataset CSV.
+        batch_size: Rows per training step.
+        epochs: Maximum number of epochs; early stopping usually ends sooner.
+        validation_split: Fraction of the training rows held out for early stopping.
+        input_pipeline: ``"numpy"`` feeds ``fit`` the scaled matrix directly;
+            ``"tfdata"`` streams batches through ``make_dataset``. Both use
+            the same split, scaler and class weights.
+        learning_rate: Adam step size. Defaults to ``scaled_learning_rate(batch_size)``.
+        intra_op_threads: Threads per TensorFlow operation. The ``tfdata``
+            pipeline defaults to one per usable CPU.
+        inter_op_threads: Concurrent TensorFlow operations. The ``tfdata``
+            pipeline defaults to 2, enough for the input pipeline to run
+            next to the training step.
+        mixed_precision: Train hidden layers in bfloat16. Only faster on CPUs
+            with native bfloat16 support (AVX512-BF16/AMX).
+        use_cache: Reuse the encoded matrix from the preprocessing cache
+            when ``csv_path`` was preprocessed before (see ``preprocessing_cache``).
+        cache_dir: Preprocessing cache root; defaults to ``$KICKSTARTER_PREPROCESS_CACHE``.
+
+    Returns:
+        The model, fitted scaler, feature columns and metrics: the test-set
+        evaluation plus ``preprocess_seconds``, ``epochs_trained``,
+        ``epoch_seconds`` (mean) and ``samples_per_second``.
+    """
 
-    data = pd.read_csv(csv_path)
-    features, labels, feature_columns = preprocess_features(data)
+    if input_pipeline not in INPUT_PIPELINES:
+        raise ValueError(f"input_pipeline must be one of {INPUT_PIPELINES}, got {input_pipeline!r}")
+    if input_pipeline == "tfdata":
+        intra_op_threads = intra_op_threads or _usable_cpus()
+        inter_op_threads = inter_op_threads or 2
+    # Thread pools can only be sized before TensorFlow runs its first op.
+    configure_tensorflow_threads(intra_op_threads, inter_op_threads)
+    train_test_split, StandardScaler, class_weight = _import_sklearn()
+
+    start = time.perf_counter()
+    if use_cache:
+        features, labels, feature_columns, cache_hit = load_or_build(
+            Path(csv_path), load_training_data, cache_dir=cache_dir
+        )
+    else:
+        features, labels, feature_columns = load_training_data(Path(csv_path))
+        cache_hit = False
+    preprocess_seconds = time.perf_counter() - start
+    print(f"Preprocessing: {preprocess_seconds:.2f}s ({'cache hit' if cache_hit else 'parsed and encoded the CSV'})")
 
     scaler = StandardScaler()
-    X = scaler.fit_transform(features)
+    if input_pipeline == "numpy":
+        X = scaler.fit_transform(features)
+    else:
+        # The dataset scales batch by batch; keep the raw float32 matrix.
+        scaler.fit(features)
+        X = features
     X_train, X_test, y_train, y_test = train_test_split(
         X, labels, train_size=0.7, random_state=34, stratify=labels
     )
@@ -148,28 +554,159 @@ def train_model(
         class_weight="balanced", classes=np.unique(y_train), y=y_train
     )
     class_weights = dict(enumerate(weights))
+    if learning_rate is None:
+        learning_rate = scaled_learning_rate(batch_size)
+
+    with _precision_policy(mixed_precision):
+        model = build_model(X_train.shape[1], learning_rate=learning_rate)
+
+    if input_pipeline == "numpy":
+        metrics = fit_and_evaluate(
+            model,
+            (X_train, y_train),
+            (X_test, y_test),
+            epochs=epochs,
+            samples_per_epoch=int(math.ceil(len(X_train) * (1.0 - validation_split))),
+            validation_split=validation_split,
+            class_weight=class_weights,
+            batch_size=batch_size,
+        )
+    else:
+        # Hold out the last rows for validation exactly like ``validation_split`` does.
+        split_at = int(math.ceil(len(X_train) * (1.0 - validation_split)))
+        y_train = np.asarray(y_train)
+        dataset_args = {"batch_size": batch_size, "mean": scaler.mean_, "scale": scaler.scale_}
+        train_dataset = make_dataset(
+            X_train[:split_at], y_train[:split_at], class_weights=class_weights, shuffle=True, **dataset_args
+        )
+        metrics = fit_and_evaluate(
+            model,
+            (train_dataset,),
+            (make_dataset(X_test, np.asarray(y_test), **dataset_args),),
+            epochs=epochs,
+            samples_per_epoch=split_at,
+            validation_data=make_dataset(X_train[split_at:], y_train[split_at:], cache=True, **dataset_args),
+            shuffle=False,  # The dataset reshuffles itself.
+        )
+
+    metrics["preprocess_seconds"] = preprocess_seconds
+    return model, scaler, feature_columns, metrics
 
-    model = build_model(X_train.shape[1])
-    history = model.fit(
-        X_train,
-        y_train,
-        validation_split=validation_split,
-        class_weight=class_weights,
-        batch_size=batch_size,
-        epochs=epochs,
-        callbacks=[
-            tf.keras.callbacks.EarlyStopping(
-                monitor="val_loss", patience=3, restore_best_weights=True, verbose=1
-            )
-        ],
-        verbose=2,
+
+def fit_and_evaluate(
+    model: tf.keras.Model,
+    train_data: Tuple,
+    test_data: Tuple,
+    *,
+    epochs: int,
+    samples_per_epoch: int,
+    verbose: int = 2,
+    **fit_kwargs: object,
+) -> Dict[str, float]:
+    """Fit with early stopping and epoch timing, then evaluate on the test data.
+
+    ``verbose`` is passed to ``fit``; ``0`` also silences the epoch timing lines.
+    """
+
+    tf = _import_tensorflow()
+    early_stopping = tf.keras.callbacks.EarlyStopping(
+        monitor="val_loss", patience=3, restore_best_weights=True, verbose=min(verbose, 1)
     )
+    timer = _epoch_timer(samples_per_epoch, verbose=bool(verbose))
+    model.fit(*train_data, epochs=epochs, callbacks=[early_stopping, timer], verbose=verbose, **fit_kwargs)
+    evaluation = model.evaluate(*test_data, verbose=0, return_dict=True)
 
-    evaluation = model.evaluate(X_test, y_test, verbose=0)
-    metric_names = model.metrics_names
-    metrics = {name: float(value) for name, value in zip(metric_names, evaluation)}
+    # ``metrics_names`` groups the compiled metrics under one name in Keras 3; the dict keeps them apart.
+    metrics = {name: float(value) for name, value in evaluation.items()}
+    metrics.update(timer.summary())
+    return metrics
 
-    return model, scaler, feature_columns, metrics
+
+def make_store_dataset(
+    store: FeatureStore,
+    split: str,
+    *,
+    batch_size: int,
+    class_weights: Optional[Dict[int, float]] = None,
+    shuffle: bool = False,
+    seed: int = 34,
+) -> tf.data.Dataset:
+    """Stream a feature store split from disk as a prefetched ``tf.data`` pipeline.
+
+    Only the shard being read is mapped into memory. With ``shuffle`` every
+    epoch visits the shards, and the rows within each shard, in a new order.
+    """
+
+    tf = _import_tensorflow()
+    autotune = tf.data.AUTOTUNE
+    # One generator shared by all epochs, so each epoch draws a new order.
+    rng = np.random.default_rng(seed) if shuffle else None
+    dataset = tf.data.Dataset.from_generator(
+        lambda: store.iter_batches(split, batch_size, rng=rng),
+        output_signature=(
+            tf.TensorSpec(shape=(None, store.n_features), dtype=tf.float32),
+            tf.TensorSpec(shape=(None,), dtype=tf.float32),
+        ),
+    )
+    weights = None
+    if class_weights is not None:
+        weights = tf.constant([class_weights[0], class_weights[1]], dtype=tf.float32)
+
+    # A known length lets Keras show progress and end epochs without an "ran out of data" warning.
+    dataset = dataset.apply(tf.data.experimental.assert_cardinality(store.n_batches(split, batch_size)))
+
+    def prepare(features, labels):
+        labels = tf.expand_dims(labels, -1)
+        if weights is None:
+            return features, labels
+        return features, labels, tf.gather(weights, tf.cast(labels[:, 0], tf.int32))
+
+    return dataset.map(prepare, num_parallel_calls=autotune).prefetch(autotune)
+
+
+def train_model_from_store(
+    store_dir: Path,
+    *,
+    batch_size: int = 64,
+    epochs: int = 50,
+    learning_rate: Optional[float] = None,
+    intra_op_threads: Optional[int] = None,
+    inter_op_threads: Optional[int] = None,
+    mixed_precision: bool = False,
+) -> Tuple[tf.keras.Model, StandardScaler, List[str], Dict[str, float]]:
+    """Train on a store written by ``feature_store.build_feature_store``, streaming it from disk.
+
+    Memory stays bounded by the shard size, so this scales to datasets that
+    do not fit in memory. The split, scaler and feature columns come from
+    the store; the other arguments behave as in ``train_model``.
+    """
+
+    configure_tensorflow_threads(intra_op_threads or _usable_cpus(), inter_op_threads or 2)
+    store = FeatureStore(store_dir)
+
+    failed, successful = store.class_counts("train")
+    total = failed + successful
+    # Same formula as sklearn's compute_class_weight("balanced").
+    class_weights = {
+        0: total / (2.0 * failed) if failed else 1.0,
+        1: total / (2.0 * successful) if successful else 1.0,
+    }
+    if learning_rate is None:
+        learning_rate = scaled_learning_rate(batch_size)
+
+    with _precision_policy(mixed_precision):
+        model = build_model(store.n_features, learning_rate=learning_rate)
+
+    metrics = fit_and_evaluate(
+        model,
+        (make_store_dataset(store, "train", batch_size=batch_size, class_weights=class_weights, shuffle=True),),
+        (make_store_dataset(store, "test", batch_size=batch_size),),
+        epochs=epochs,
+        samples_per_epoch=store.rows("train"),
+        validation_data=make_store_dataset(store, "validation", batch_size=batch_size),
+        shuffle=False,  # The dataset reshuffles itself.
+    )
+    return model, store.scaler, store.feature_columns, metrics
 
 
 def save_artifacts(
@@ -189,18 +726,60 @@ def save_artifacts(
     with open(output_dir / "feature_columns.json", "w", encoding="utf-8") as features_file:
         json.dump(list(feature_columns), features_file, indent=2)
 
+    save_feature_encoder(scaler, feature_columns, output_dir)
+    export_runtime_bundle(model, scaler, feature_columns, output_dir)
+
+
+def save_feature_encoder(scaler: StandardScaler, feature_columns: Iterable[str], output_dir: Path) -> Path:
+    """Pickle the fitted feature encoder, with its training-time fill values, next to ``scaler.pkl``."""
+
+    feature_columns = list(feature_columns)
+    encoder_path = output_dir / FEATURE_ENCODER_FILENAME
+    with open(encoder_path, "wb") as encoder_file:
+        pickle.dump(FeatureEncoder(feature_columns, scaler_fill_values(feature_columns, scaler.mean_)), encoder_file)
+    return encoder_path
+
 
 def load_artifacts(model_dir: Path) -> Tuple[tf.keras.Model, StandardScaler, List[str]]:
     """Load a previously trained model and preprocessing assets."""
 
-    model = tf.keras.models.load_model(model_dir / "kickstarter_model.keras")
+    tf = _import_tensorflow()
+    _import_sklearn()
+    with _startup_stage("load keras artifacts"):
+        model = tf.keras.models.load_model(model_dir / "kickstarter_model.keras")
     with open(model_dir / "scaler.pkl", "rb") as scaler_file:
         scaler: StandardScaler = pickle.load(scaler_file)
     with open(model_dir / "feature_columns.json", "r", encoding="utf-8") as features_file:
         feature_columns: List[str] = json.load(features_file)
+    encoder = load_feature_encoder(model_dir, feature_columns)
+    if not encoder.fill_values:  # Saved before fill values were recorded.
+        encoder.fill_values = scaler_fill_values(feature_columns, scaler.mean_)
+    _ENCODER_CACHE[_encoder_key(encoder.feature_columns, encoder.fill_values)] = encoder
     return model, scaler, feature_columns
 
 
+def load_feature_encoder(
+    model_dir: Path, feature_columns: Optional[Iterable[str]] = None
+) -> FeatureEncoder:
+    """Load the fitted feature encoder saved next to ``scaler.pkl``.
+
+    Older artifact directories without ``feature_encoder.pkl`` fall back to
+    building the encoder from ``feature_columns`` (or ``feature_columns.json``).
+    """
+
+    encoder_path = model_dir / FEATURE_ENCODER_FILENAME
+    if encoder_path.exists():
+        with open(encoder_path, "rb") as encoder_file:
+            encoder: FeatureEncoder = pickle.load(encoder_file)
+        if feature_columns is None or encoder.feature_columns == list(feature_columns):
+            return encoder
+
+    if feature_columns is None:
+        with open(model_dir / "feature_columns.json", "r", encoding="utf-8") as features_file:
+            feature_columns = json.load(features_file)
+    return FeatureEncoder(feature_columns)
+
+
 def predict_success_probability(
     campaign_data: Dict[str, object],
     model: tf.keras.Model,
@@ -217,19 +796,72 @@ def predict_success_probability(
 
     Returns:
         Probability that the campaign will be successful.
+
+    Raises:
+        ValueError: If the campaign has missing or non-numeric feature values.
+    """
+
+    probabilities, errors = predict_success_probabilities(
+        [campaign_data], model=model, scaler=scaler, feature_columns=feature_columns
+    )
+    if errors[0] is not None:
+        raise ValueError(errors[0])
+    return float(probabilities[0])
+
+
+def predict_success_probabilities(
+    campaigns: Union[pd.DataFrame, Iterable[Dict[str, object]]],
+    model: tf.keras.Model,
+    scaler: StandardScaler,
+    feature_columns: Union[FeatureEncoder, Iterable[str]],
+    *,
+    batch_size: int = 1024,
+) -> Tuple[np.ndarray, List[Optional[str]]]:
+    """Predict success probabilities for many campaigns in one pass.
+
+    The whole batch is encoded once with a ``FeatureEncoder`` and sent in
+    chunks of ``batch_size`` rows through a ``CompiledPredictor`` (the model
+    with the scaler folded into its weights), instead of paying the full
+    preprocessing and ``model.predict`` cost for every campaign.
+
+    Args:
+        campaigns: Dataframe or iterable of dictionaries, one row per campaign.
+        model: Trained TensorFlow model.
+        scaler: StandardScaler fitted on the training data.
+        feature_columns: Ordered list of training feature columns, or a
+            ``FeatureEncoder`` built from them.
+        batch_size: Number of rows sent to the model per forward pass.
+
+    Returns:
+        probabilities: Array with one probability per input row, in input
+            order. Rows that could not be scored are ``NaN``.
+        errors: One entry per input row; ``None`` when the row was scored,
+            otherwise a short reason explaining why it was skipped.
     """
 
-    campaign_df = pd.DataFrame([campaign_data])
-    features, _, _ = preprocess_features(campaign_df, feature_columns=feature_columns)
-    scaled_features = scaler.transform(features)
-    prediction = model.predict(scaled_features, verbose=0)[0][0]
-    return float(prediction)
+    runtime = build_runtime(model, scaler, feature_columns)
+    return runtime.predict_probabilities(campaigns, batch_size=batch_size)
 
 
 def _cli_train(args: argparse.Namespace) -> None:
-    model, scaler, feature_columns, metrics = train_model(
-        Path(args.csv), batch_size=args.batch_size, epochs=args.epochs
-    )
+    options = {
+        "batch_size": args.batch_size,
+        "epochs": args.epochs,
+        "learning_rate": args.learning_rate,
+        "intra_op_threads": args.intra_op_threads,
+        "inter_op_threads": args.inter_op_threads,
+        "mixed_precision": args.mixed_precision,
+    }
+    if args.feature_store:
+        model, scaler, feature_columns, metrics = train_model_from_store(Path(args.feature_store), **options)
+    else:
+        model, scaler, feature_columns, metrics = train_model(
+            Path(args.csv),
+            input_pipeline=args.pipeline,
+            use_cache=not args.no_preprocess_cache,
+            cache_dir=Path(args.preprocess_cache) if args.preprocess_cache else None,
+            **options,
+        )
     save_artifacts(model, scaler, feature_columns, Path(args.output_dir))
 
     print("Training complete. Metrics:")
@@ -237,42 +869,271 @@ def _cli_train(args: argparse.Namespace) -> None:
         print(f"  {name}: {value:.4f}")
 
 
+def _cli_tune(args: argparse.Namespace) -> None:
+    # Imported here because hyperparameter_search itself builds on this module.
+    from hyperparameter_search import LEADERBOARD_FILENAME, run_search
+
+    leaderboard = run_search(
+        Path(args.csv),
+        Path(args.output_dir),
+        strategy=args.strategy,
+        trials=args.trials,
+        min_epochs=args.min_epochs,
+        max_epochs=args.max_epochs,
+        eta=args.eta,
+        jobs=args.jobs,
+        threads_per_trial=args.threads_per_trial,
+        seed=args.seed,
+        use_cache=not args.no_preprocess_cache,
+        cache_dir=Path(args.preprocess_cache) if args.preprocess_cache else None,
+    )
+
+    print(f"{'trial':>5} {'epochs':>6} {'val_auc':>8} {'test_auc':>8} {'train_s':>8} {'us/row':>7}  configuration")
+    for result in leaderboard:
+        print(
+            f"{result['trial']:>5} {result['epochs']:>6} {result['val_auc']:>8.4f} {result['test_auc']:>8.4f} "
+            f"{result['train_seconds']:>8.1f} {result['inference_us_per_row']:>7.2f}  {result['configuration']}"
+        )
+    print(f"Best model saved to {args.output_dir}; leaderboard in {Path(args.output_dir) / LEADERBOARD_FILENAME}")
+
+
+def _cli_preprocess(args: argparse.Namespace) -> None:
+    start = time.perf_counter()
+    store = build_feature_store(Path(args.csv), Path(args.store_dir), chunksize=args.chunksize)
+    rows = ", ".join(f"{split} {store.rows(split):,}" for split in ("train", "validation", "test"))
+    print(
+        f"Feature store written to {args.store_dir} in {time.perf_counter() - start:.1f}s: "
+        f"{store.n_features} features; rows: {rows}"
+    )
+
+
 def _cli_predict(args: argparse.Namespace) -> None:
-    model, scaler, feature_columns = load_artifacts(Path(args.model_dir))
     with open(args.json_path, "r", encoding="utf-8") as file:
         campaign_data = json.load(file)
+    campaigns = [campaign_data] if isinstance(campaign_data, dict) else campaign_data
+
+    server_address = args.server or default_server_address()
+    if server_address:
+        with _startup_stage("connect to server"):
+            client = PredictionClient(server_address)
+        with client:
+            probabilities, errors = client.predict_probabilities(campaigns)
+    else:
+        with _startup_stage("load runtime"):
+            runtime = load_runtime(Path(args.model_dir))
+        probabilities, errors = runtime.predict_probabilities(campaigns)
+
+    if isinstance(campaign_data, dict):
+        if errors[0] is not None:
+            raise ValueError(errors[0])
+        print(f"Predicted success probability: {probabilities[0]:.4f}")
+        return
+
+    for index, (probability, error) in enumerate(zip(probabilities, errors), start=1):
+        if error is None:
+            print(f"Campaign {index}: predicted success probability: {probability:.4f}")
+        else:
+            print(f"Campaign {index}: skipped ({error})")
+
+
+def _cli_serve(args: argparse.Namespace) -> None:
+    serve(args.socket, Path(args.model_dir), watch_interval=args.watch_interval)
+
+
+def _cli_score(args: argparse.Namespace) -> None:
+    runtime = None
+    if args.workers == 1:
+        with _startup_stage("load runtime"):
+            runtime = load_runtime(Path(args.model_dir))
+    summary = score_csv(
+        Path(args.csv),
+        Path(args.out),
+        runtime,
+        chunksize=args.chunksize,
+        workers=args.workers,
+        model_dir=Path(args.model_dir),
+    )
 
-    probability = predict_success_probability(
-        campaign_data, model=model, scaler=scaler, feature_columns=feature_columns
+    rate = summary["rows"] / summary["seconds"] if summary["seconds"] > 0 else float("inf")
+    print(
+        f"Scored {summary['rows']:,} campaigns ({summary['failed']:,} failed) in "
+        f"{summary['seconds']:.1f}s ({rate:,.0f} rows/sec). Results written to {args.out}"
     )
-    print(f"Predicted success probability: {probability:.4f}")
+
+
+def _cli_export(args: argparse.Namespace) -> None:
+    model_dir = Path(args.model_dir)
+    model, scaler, feature_columns = load_artifacts(model_dir)
+    bundle_path = export_runtime_bundle(model, scaler, feature_columns, model_dir)
+    encoder_path = save_feature_encoder(scaler, feature_columns, model_dir)
+    print(f"Runtime bundle written to {bundle_path}, feature encoder to {encoder_path}")
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Kickstarter success model utilities")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report import and artifact-load timings on stderr after the command finishes",
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     train_parser = subparsers.add_parser("train", help="Train a new model")
-    train_parser.add_argument("--csv", required=True, help="Path to the Kickstarter dataset CSV")
+    train_source = train_parser.add_mutually_exclusive_group(required=True)
+    train_source.add_argument("--csv", help="Path to the Kickstarter dataset CSV")
+    train_source.add_argument(
+        "--feature-store", help="Directory written by 'preprocess'; shards are streamed from disk"
+    )
     train_parser.add_argument(
         "--output-dir", default="artifacts", help="Directory to store the trained model and preprocessors"
     )
     train_parser.add_argument("--batch-size", type=int, default=64)
     train_parser.add_argument("--epochs", type=int, default=50)
+    train_parser.add_argument(
+        "--pipeline",
+        choices=INPUT_PIPELINES,
+        default="numpy",
+        help="Feed --csv training from an in-memory NumPy matrix or a prefetched tf.data pipeline",
+    )
+    train_parser.add_argument(
+        "--learning-rate",
+        type=float,
+        help=f"Adam learning rate (default: {BASE_LEARNING_RATE} scaled by sqrt(batch size / {BASE_BATCH_SIZE}))",
+    )
+    train_parser.add_argument(
+        "--intra-op-threads", type=int, help="Threads per TensorFlow op (tfdata default: one per CPU)"
+    )
+    train_parser.add_argument(
+        "--inter-op-threads", type=int, help="TensorFlow ops run concurrently (tfdata default: 2)"
+    )
+    train_parser.add_argument(
+        "--mixed-precision",
+        action="store_true",
+        help="Train in mixed bfloat16; only faster on CPUs with native bfloat16 support",
+    )
+    train_parser.add_argument(
+        "--preprocess-cache",
+        help=f"Directory caching encoded --csv datasets between runs (default: ${CACHE_DIR_ENV} or ~/.cache/kickstarter)",
+    )
+    train_parser.add_argument(
+        "--no-preprocess-cache", action="store_true", help="Always parse and encode the CSV from scratch"
+    )
     train_parser.set_defaults(func=_cli_train)
 
-    predict_parser = subparsers.add_parser("predict", help="Predict for a single campaign")
+    tune_parser = subparsers.add_parser(
+        "tune", help="Search layer widths, dropout, learning rate and batch size in parallel"
+    )
+    tune_parser.add_argument("--csv", required=True, help="Path to the Kickstarter dataset CSV")
+    tune_parser.add_argument(
+        "--output-dir", default="artifacts", help="Directory to store the best model and the leaderboard"
+    )
+    tune_parser.add_argument("--strategy", choices=["random", "halving"], default="halving")
+    tune_parser.add_argument("--trials", type=int, default=12, help="Configurations to sample, baseline included")
+    tune_parser.add_argument("--min-epochs", type=int, default=2, help="Epochs of the first successive-halving rung")
+    tune_parser.add_argument("--max-epochs", type=int, default=20, help="Epochs of random search and the last rung")
+    tune_parser.add_argument("--eta", type=int, default=3, help="Keep the best 1/eta trials per rung")
+    tune_parser.add_argument("--jobs", type=int, help="Concurrent trials (default: one per CPU)")
+    tune_parser.add_argument("--threads-per-trial", type=int, help="TensorFlow threads per trial (default: CPUs / jobs)")
+    tune_parser.add_argument("--seed", type=int, default=34)
+    tune_parser.add_argument("--preprocess-cache", help="Directory caching encoded datasets between runs")
+    tune_parser.add_argument(
+        "--no-preprocess-cache", action="store_true", help="Always parse and encode the CSV from scratch"
+    )
+    tune_parser.set_defaults(func=_cli_tune)
+
+    preprocess_parser = subparsers.add_parser(
+        "preprocess", help="Encode and scale a CSV into a sharded feature store for out-of-core training"
+    )
+    preprocess_parser.add_argument("--csv", required=True, help="Path to the Kickstarter dataset CSV")
+    preprocess_parser.add_argument("--store-dir", required=True, help="Directory to write the shards to")
+    preprocess_parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=DEFAULT_STORE_CHUNKSIZE,
+        help="CSV rows per chunk; bounds memory use and shard size",
+    )
+    preprocess_parser.set_defaults(func=_cli_preprocess)
+
+    predict_parser = subparsers.add_parser("predict", help="Predict for one or more campaigns")
     predict_parser.add_argument("--model-dir", default="artifacts", help="Directory containing saved artifacts")
-    predict_parser.add_argument("--json-path", required=True, help="Path to a JSON file describing the campaign")
+    predict_parser.add_argument(
+        "--json-path",
+        required=True,
+        help="Path to a JSON file describing a campaign, or a list of campaigns",
+    )
+    predict_parser.add_argument(
+        "--server",
+        help=(
+            "Address of a running 'serve' daemon (socket path or host:port). "
+            f"Defaults to ${SERVER_ADDRESS_ENV} when set"
+        ),
+    )
     predict_parser.set_defaults(func=_cli_predict)
 
+    serve_parser = subparsers.add_parser(
+        "serve", help="Keep the model warm and answer newline-delimited JSON requests"
+    )
+    serve_parser.add_argument("--model-dir", default="artifacts", help="Directory containing saved artifacts")
+    serve_parser.add_argument(
+        "--socket",
+        required=True,
+        help="Unix socket path, or host:port / port for a localhost TCP server",
+    )
+    serve_parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between checks for new artifacts to hot-reload (0 disables)",
+    )
+    serve_parser.set_defaults(func=_cli_serve)
+
+    score_parser = subparsers.add_parser(
+        "score", help="Stream-score a large CSV file chunk by chunk with bounded memory"
+    )
+    score_parser.add_argument("--model-dir", default="artifacts", help="Directory containing saved artifacts")
+    score_parser.add_argument("--csv", required=True, help="Path to the CSV file with campaigns to score")
+    score_parser.add_argument(
+        "--out", required=True, help="Output file; a .parquet suffix writes Parquet, anything else CSV"
+    )
+    score_parser.add_argument(
+        "--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Rows read and scored per chunk"
+    )
+    score_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of scoring processes; each loads the artifacts once and output order is preserved",
+    )
+    score_parser.set_defaults(func=_cli_score)
+
+    export_parser = subparsers.add_parser(
+        "export", help="Export the TensorFlow-free runtime bundle for existing artifacts"
+    )
+    export_parser.add_argument("--model-dir", default="artifacts", help="Directory containing saved artifacts")
+    export_parser.set_defaults(func=_cli_export)
+
     return parser
 
 
+def _print_startup_profile(command_seconds: float) -> None:
+    print("Startup profile:", file=sys.stderr)
+    for name, seconds in STARTUP_TIMINGS.items():
+        print(f"  {name}: {seconds * 1000:.1f} ms", file=sys.stderr)
+    print(f"  command total: {command_seconds * 1000:.1f} ms", file=sys.stderr)
+
+
 def main(argv: Optional[List[str]] = None) -> None:
     parser = build_arg_parser()
     args = parser.parse_args(argv)
-    args.func(args)
+    start = time.perf_counter()
+    try:
+        args.func(args)
+    finally:
+        if args.profile_startup:
+            _print_startup_profile(time.perf_counter() - start)
+
+
+STARTUP_TIMINGS["import model_pipeline"] = time.perf_counter() - _MODULE_IMPORT_START
 
 
 if __name__ == "__main__":
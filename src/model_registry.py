@@ -0,0 +1,219 @@
+"""Versioned, hot-reloadable registry of prediction runtimes.
+
+Long-running processes (the web app, the prediction daemon, Excel) used to
+load ``artifacts/`` once and serve that model until restarted. A
+``ModelRegistry`` keeps up to ``max_versions`` runtimes resident, keyed by
+the content hash of their artifacts (``artifact_version``), with one of them
+active:
+
+```
+registry = ModelRegistry(Path("artifacts"), max_versions=2)
+registry.start_watching(interval=5.0)      # reload when artifacts/ changes
+runtime = registry.get()                   # active model
+runtime = registry.get("c6f93d17df33fb47") # a specific resident version (A/B)
+```
+
+A reload loads and warms up the new runtime while the old one keeps
+serving, then swaps the active reference under a lock. Callers hold on to
+the runtime they fetched, so requests already in flight finish on the model
+they started with and nothing is dropped. A failed reload leaves the active
+model in place and records the error in ``last_error``.
+"""
+
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from kickstarter_runtime import KickstarterRuntime, artifact_signature, artifact_version, load_runtime
+
+
+def _warm_up(runtime: KickstarterRuntime) -> None:
+    """Run the encoder and forward pass once so the first real request is not slower."""
+
+    runtime.predict_probabilities([{}])
+
+
+class ModelRegistry:
+    """Resident model versions with an atomically swappable active one."""
+
+    def __init__(self, model_dir: Optional[Path], *, max_versions: int = 2) -> None:
+        """Create the registry and load ``model_dir`` (if given) as the active version.
+
+        Args:
+            model_dir: Artifact directory to serve and, when watching, to poll.
+            max_versions: Runtimes kept in memory, the active one included.
+        """
+
+        if max_versions < 1:
+            raise ValueError("max_versions must be at least 1")
+        self.model_dir = Path(model_dir) if model_dir is not None else None
+        self.max_versions = max_versions
+        self.last_error: Optional[str] = None
+
+        self._lock = threading.Lock()
+        # Only one load runs at a time; serving never waits on this lock.
+        self._load_lock = threading.Lock()
+        self._versions: "OrderedDict[str, KickstarterRuntime]" = OrderedDict()
+        self._info: Dict[str, Dict[str, object]] = {}
+        self._active: Optional[KickstarterRuntime] = None
+        # Version most recently loaded from model_dir; refresh() compares against it.
+        self._dir_version: Optional[str] = None
+        self._watch_interval: Optional[float] = None
+        self._watch_thread: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+
+        if self.model_dir is not None:
+            self.load(self.model_dir)
+
+    @classmethod
+    def from_runtime(cls, runtime: KickstarterRuntime) -> "ModelRegistry":
+        """Wrap an already loaded runtime as a single-version registry."""
+
+        registry = cls(None, max_versions=1)
+        registry._register(runtime, source=None, activate=True)
+        return registry
+
+    def _register(self, runtime: KickstarterRuntime, source: Optional[Path], activate: bool) -> str:
+        version = runtime.version or f"runtime-{id(runtime):x}"
+        runtime.version = version
+        with self._lock:
+            self._versions[version] = runtime
+            self._versions.move_to_end(version)
+            self._info.setdefault(
+                version, {"version": version, "source": str(source) if source else None, "loaded_at": time.time()}
+            )
+            if activate:
+                self._active = runtime
+            # Evict the least recently loaded versions, never the active one.
+            for stale in list(self._versions):
+                if len(self._versions) <= self.max_versions:
+                    break
+                if self._versions[stale] is not self._active:
+                    del self._versions[stale]
+                    del self._info[stale]
+        return version
+
+    def load(self, path: Optional[Path] = None, *, activate: bool = True) -> str:
+        """Load, warm up and register the artifacts in ``path`` (default ``model_dir``).
+
+        Args:
+            path: Artifact directory to load.
+            activate: Make the loaded version the active one. Pass ``False``
+                to keep it resident for explicit (A/B) requests only.
+
+        Returns:
+            The loaded version.
+        """
+
+        path = Path(path) if path is not None else self.model_dir
+        if path is None:
+            raise ValueError("No artifact directory to load")
+        with self._load_lock:
+            version = artifact_version(path)
+            with self._lock:
+                runtime = self._versions.get(version)
+            if runtime is None:
+                runtime = load_runtime(path)
+                _warm_up(runtime)
+            version = self._register(runtime, path, activate)
+            if self.model_dir is not None and path.resolve() == self.model_dir.resolve():
+                self._dir_version = version
+        self.last_error = None
+        return version
+
+    def refresh(self) -> bool:
+        """Load and activate ``model_dir`` if its artifacts changed since it was last loaded.
+
+        Returns:
+            ``True`` when a new version was activated.
+        """
+
+        if self.model_dir is None or artifact_version(self.model_dir) == self._dir_version:
+            return False
+        self.load(self.model_dir)
+        return True
+
+    def get(self, version: Optional[str] = None) -> KickstarterRuntime:
+        """Return the active runtime, or the resident runtime for ``version``.
+
+        Raises:
+            LookupError: If ``version`` is not loaded.
+        """
+
+        with self._lock:
+            if not version:
+                if self._active is None:
+                    raise LookupError("No model version is active")
+                return self._active
+            if version not in self._versions:
+                raise LookupError(f"Model version {version!r} is not loaded")
+            return self._versions[version]
+
+    def activate(self, version: str) -> None:
+        """Make a resident version the active one."""
+
+        runtime = self.get(version)
+        with self._lock:
+            self._active = runtime
+
+    @property
+    def active_version(self) -> Optional[str]:
+        with self._lock:
+            return self._active.version if self._active is not None else None
+
+    def versions(self) -> List[Dict[str, object]]:
+        """Describe every resident version, oldest first."""
+
+        with self._lock:
+            return [
+                dict(self._info[version], active=runtime is self._active)
+                for version, runtime in self._versions.items()
+            ]
+
+    def start_watching(self, interval: float = 5.0) -> None:
+        """Poll ``model_dir`` every ``interval`` seconds and reload when it changes.
+
+        A change is only loaded once the files have stopped changing for one
+        interval, so a half-written export is never picked up.
+        """
+
+        if self.model_dir is None:
+            raise ValueError("Only registries with a model_dir can be watched")
+        first_start = self._watch_interval is None
+        self._watch_interval = interval
+        self._stop_watching.clear()
+        if self._watch_thread is None or not self._watch_thread.is_alive():
+            self._watch_thread = threading.Thread(target=self._watch, name="model-watcher", daemon=True)
+            self._watch_thread.start()
+        if first_start and hasattr(os, "register_at_fork"):
+            # Threads do not survive fork (e.g. gunicorn preload); restart the watcher in each child.
+            reference = weakref.ref(self)
+            os.register_at_fork(after_in_child=lambda: _restart_watcher(reference))
+
+    def stop_watching(self) -> None:
+        self._stop_watching.set()
+
+    def _watch(self) -> None:
+        seen = artifact_signature(self.model_dir)
+        while not self._stop_watching.wait(self._watch_interval):
+            signature = artifact_signature(self.model_dir)
+            if signature != seen:
+                seen = signature  # Still being written; check again next interval.
+                continue
+            try:
+                self.refresh()
+            except Exception as exc:  # Keep serving the current model.
+                self.last_error = f"{type(exc).__name__}: {exc}"
+
+
+def _restart_watcher(reference: "weakref.ref[ModelRegistry]") -> None:
+    registry = reference()
+    if registry is not None and registry._watch_interval is not None and not registry._stop_watching.is_set():
+        registry._lock = threading.Lock()
+        registry._load_lock = threading.Lock()
+        registry._watch_thread = None
+        registry.start_watching(registry._watch_interval)
@@ -0,0 +1,203 @@
+"""Content-addressed cache of campaign predictions.
+
+Excel recalculates constantly, so the same campaign is scored over and over.
+``PredictionCache`` remembers ``(probability, error)`` per campaign under a
+SHA-256 of the campaign's canonical JSON plus the version of the model that
+scored it, evicting the least recently used entries beyond ``max_entries``
+and entries older than ``ttl`` seconds. Hashing a row costs more than
+scoring it inside a large batch, so batches above ``max_batch_rows`` bypass
+the cache; it is meant for the many small, repetitive requests.
+
+The version comes from ``KickstarterRuntime.version`` (an
+``artifact_version`` fingerprint) and is part of the key, so once a
+retrained model is loaded the previous model's entries can no longer be hit;
+they age out through LRU eviction and the TTL.
+
+``get_prediction_cache()`` returns the process-wide instance used by the
+Excel UDFs, ``vba_predict``, the prediction daemon and the web app. Its size
+and TTL come from ``KICKSTARTER_CACHE_SIZE`` (0 disables caching) and
+``KICKSTARTER_CACHE_TTL``.
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from numbers import Integral, Real
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+CACHE_SIZE_ENV = "KICKSTARTER_CACHE_SIZE"
+CACHE_TTL_ENV = "KICKSTARTER_CACHE_TTL"
+DEFAULT_CACHE_SIZE = 10_000
+DEFAULT_CACHE_TTL = 3600.0
+DEFAULT_MAX_BATCH_ROWS = 256
+
+CachedPrediction = Tuple[float, Optional[str]]
+PredictFn = Callable[[List[Dict[str, object]]], Tuple[Sequence[float], List[Optional[str]]]]
+
+
+def _canonical_value(value: object) -> object:
+    """Map equal cell values to one JSON form: 5000, 5000.0 and np.int64(5000) hash alike."""
+
+    kind = type(value)
+    if kind is str or kind is int or kind is bool or value is None:
+        return value
+    if kind is not float:
+        # NumPy scalars and other numbers; the ABC checks are slow, so only reach them here.
+        if isinstance(value, np.bool_):
+            return bool(value)
+        if isinstance(value, Integral):
+            return int(value)
+        if not isinstance(value, Real):
+            return str(value)
+        value = float(value)
+    if math.isnan(value):
+        return None
+    return int(value) if value.is_integer() else value
+
+
+def campaign_key(campaign: Dict[str, object], version: Optional[str]) -> str:
+    """Hash a campaign together with the model version that scores it."""
+
+    canonical = {str(name): _canonical_value(value) for name, value in campaign.items()}
+    payload = json.dumps([version, canonical], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PredictionCache:
+    """Thread-safe LRU cache of predictions with a time-to-live."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_SIZE,
+        ttl: float = DEFAULT_CACHE_TTL,
+        *,
+        max_batch_rows: int = DEFAULT_MAX_BATCH_ROWS,
+    ) -> None:
+        if max_entries < 0:
+            raise ValueError("max_entries must not be negative")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_batch_rows = max_batch_rows
+        self._entries: "OrderedDict[str, Tuple[float, CachedPrediction]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._bypassed_rows = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def predict(
+        self, campaigns: Sequence[Dict[str, object]], predict_fn: PredictFn, version: Optional[str]
+    ) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """Score ``campaigns``, calling ``predict_fn`` only for rows not already cached.
+
+        Args:
+            campaigns: Campaign dictionaries.
+            predict_fn: Batch scorer with the ``predict_probabilities`` contract.
+            version: Version of the model behind ``predict_fn``.
+
+        Returns:
+            Probabilities (``NaN`` for failed rows) and per-row errors, in input order.
+        """
+
+        campaigns = list(campaigns)
+        if not self.enabled or len(campaigns) > self.max_batch_rows:
+            if self.enabled:
+                with self._lock:
+                    self._bypassed_rows += len(campaigns)
+            probabilities, errors = predict_fn(campaigns)
+            return np.asarray(probabilities, dtype=np.float64), list(errors)
+
+        keys = [campaign_key(campaign, version) for campaign in campaigns]
+        results: List[Optional[CachedPrediction]] = [None] * len(campaigns)
+        # Rows still to score, by key, so duplicates within one call are scored once.
+        missing: Dict[str, List[int]] = {}
+        now = time.monotonic()
+        with self._lock:
+            for row, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(key)
+                    results[row] = entry[1]
+                    self._hits += 1
+                else:
+                    missing.setdefault(key, []).append(row)
+                    self._misses += 1
+
+        if missing:
+            first_rows = [rows[0] for rows in missing.values()]
+            probabilities, errors = predict_fn([campaigns[row] for row in first_rows])
+            expires = time.monotonic() + self.ttl
+            with self._lock:
+                for (key, rows), probability, error in zip(missing.items(), probabilities, errors):
+                    value = (float(probability), error)
+                    for row in rows:
+                        results[row] = value
+                    self._entries[key] = (expires, value)
+                    self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+
+        probabilities = np.array([probability for probability, _ in results], dtype=np.float64)
+        return probabilities, [error for _, error in results]
+
+    def predict_one(self, campaign: Dict[str, object], predict_fn: PredictFn, version: Optional[str]) -> float:
+        """Score a single campaign through the cache.
+
+        Raises:
+            ValueError: If the campaign has missing or non-numeric feature values.
+        """
+
+        probabilities, errors = self.predict([campaign], predict_fn, version)
+        if errors[0] is not None:
+            raise ValueError(errors[0])
+        return float(probabilities[0])
+
+    def stats(self) -> Dict[str, object]:
+        """Return hit/miss counters and the current size."""
+
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "bypassed_rows": self._bypassed_rows,
+                "max_batch_rows": self.max_batch_rows,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_DEFAULT_CACHE: Optional[PredictionCache] = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_prediction_cache() -> PredictionCache:
+    """Return the process-wide cache, configured from the environment on first use."""
+
+    global _DEFAULT_CACHE
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = PredictionCache(
+                max_entries=int(os.environ.get(CACHE_SIZE_ENV, DEFAULT_CACHE_SIZE)),
+                ttl=float(os.environ.get(CACHE_TTL_ENV, DEFAULT_CACHE_TTL)),
+            )
+        return _DEFAULT_CACHE
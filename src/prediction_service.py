@@ -0,0 +1,269 @@
+"""Persistent prediction daemon and its client.
+
+Loading artifacts and starting a fresh interpreter dominate the latency of
+one-off predictions (the ``predict`` CLI, VBA ``RunPython`` macros). The
+daemon keeps a ``KickstarterRuntime`` warm and answers newline-delimited
+JSON requests over a Unix socket or a localhost TCP port:
+
+```
+python src/model_pipeline.py serve --socket /tmp/kickstarter.sock
+python src/model_pipeline.py serve --socket 127.0.0.1:8765
+```
+
+Each request is one JSON object per line and gets exactly one JSON line back:
+
+```
+{"id": 1, "campaigns": [{"goal": 5000, ...}, ...]}
+{"id": 1, "probabilities": [0.93, null], "errors": [null, "Missing or non-numeric values for: goal"]}
+```
+
+A single campaign may be sent as ``{"campaign": {...}}``,
+``{"command": "ping"}`` checks that the daemon is alive and
+``{"command": "stats"}`` returns the prediction cache counters. Repeated
+campaigns are answered from the shared ``PredictionCache``.
+
+The daemon serves the active version of a ``ModelRegistry`` and reloads it
+when the artifact directory changes (``--watch-interval``, default 5s);
+``{"command": "models"}`` lists the resident versions and a request may
+pin one with ``"model_version"``. The client half of this module only uses
+the standard library so it can be imported cheaply.
+"""
+
+import errno
+import json
+import os
+import socket
+import socketserver
+import stat
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+SERVER_ADDRESS_ENV = "KICKSTARTER_PREDICTION_SERVER"
+
+Address = Union[str, Tuple[str, int]]
+
+
+def parse_address(address: str) -> Address:
+    """Turn ``host:port`` or a bare port into a TCP address, anything else into a socket path."""
+
+    host, _, port = address.rpartition(":")
+    if port.isdigit():
+        return (host or "127.0.0.1", int(port))
+    return address
+
+
+def default_server_address() -> Optional[str]:
+    """Return the daemon address configured through ``KICKSTARTER_PREDICTION_SERVER``, if any."""
+
+    return os.environ.get(SERVER_ADDRESS_ENV) or None
+
+
+class _PredictionRequestHandler(socketserver.StreamRequestHandler):
+    """Answer newline-delimited JSON requests until the client disconnects."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.server.answer(json.loads(line))
+            except Exception as exc:  # Keep the connection alive on bad requests.
+                response = {"error": str(exc)}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _PredictionServerMixin:
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def answer(self, request: Dict[str, object]) -> Dict[str, object]:
+        response: Dict[str, object] = {}
+        if "id" in request:
+            response["id"] = request["id"]
+
+        runtime = self.registry.get(request.get("model_version"))
+        if request.get("command") == "ping":
+            response.update(ok=True, n_features=len(runtime.feature_columns), model_version=runtime.version)
+            return response
+        if request.get("command") == "stats":
+            response["cache"] = self.cache.stats()
+            return response
+        if request.get("command") == "models":
+            response["models"] = self.registry.versions()
+            return response
+
+        if "campaign" in request:
+            campaigns = [request["campaign"]]
+        elif "campaigns" in request:
+            campaigns = request["campaigns"]
+        else:
+            raise ValueError("Request must contain 'campaign', 'campaigns' or 'command'")
+
+        probabilities, errors = self.cache.predict(campaigns, runtime.predict_probabilities, runtime.version)
+        response["probabilities"] = [
+            None if error is not None else float(probability)
+            for probability, error in zip(probabilities, errors)
+        ]
+        response["errors"] = errors
+        return response
+
+
+class _TCPPredictionServer(_PredictionServerMixin, socketserver.ThreadingTCPServer):
+    pass
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class _UnixPredictionServer(_PredictionServerMixin, socketserver.ThreadingUnixStreamServer):
+        pass
+
+
+def _remove_stale_socket(socket_path: Path) -> None:
+    """Delete a socket file left behind by a daemon that is no longer running.
+
+    Raises:
+        OSError: ``EADDRINUSE`` if ``socket_path`` is not a socket, or a
+            server still accepts connections on it.
+    """
+
+    try:
+        mode = socket_path.stat().st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(errno.EADDRINUSE, f"Address in use: {socket_path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(socket_path))
+    except ConnectionRefusedError:
+        socket_path.unlink()
+        return
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, f"Address in use: a server is already listening on {socket_path}")
+
+
+def create_server(address: Address, runtime) -> socketserver.BaseServer:
+    """Bind a threaded prediction server to ``address``.
+
+    ``runtime`` is a ``KickstarterRuntime`` or a ``ModelRegistry`` whose
+    active version answers requests. A leftover Unix socket file is replaced
+    only when nothing is listening on it.
+
+    Raises:
+        OSError: If the address is already in use.
+    """
+
+    from model_registry import ModelRegistry
+    from prediction_cache import get_prediction_cache
+
+    if isinstance(address, tuple):
+        server = _TCPPredictionServer(address, _PredictionRequestHandler)
+    else:
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise ValueError("Unix sockets are not available on this platform; use host:port instead")
+        socket_path = Path(address)
+        _remove_stale_socket(socket_path)
+        server = _UnixPredictionServer(str(socket_path), _PredictionRequestHandler)
+    server.registry = runtime if isinstance(runtime, ModelRegistry) else ModelRegistry.from_runtime(runtime)
+    server.cache = get_prediction_cache()
+    return server
+
+
+def serve(address: str, model_dir: Path, *, watch_interval: float = 5.0) -> None:
+    """Serve the model in ``model_dir`` on ``address`` until interrupted.
+
+    The registry warms the model up before the first request and, unless
+    ``watch_interval`` is 0, reloads it whenever the artifacts change.
+    """
+
+    from model_registry import ModelRegistry
+
+    registry = ModelRegistry(Path(model_dir))
+    if watch_interval > 0:
+        registry.start_watching(watch_interval)
+
+    parsed = parse_address(address)
+    server = create_server(parsed, registry)
+    print(f"Serving predictions from {model_dir} (version {registry.active_version}) on {address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Prediction server stopped by user.")
+    finally:
+        server.server_close()
+        if isinstance(parsed, str) and Path(parsed).exists():
+            Path(parsed).unlink()
+
+
+class PredictionClient:
+    """Persistent connection to a running prediction daemon."""
+
+    def __init__(self, address: str, *, timeout: float = 10.0) -> None:
+        parsed = parse_address(address)
+        family = socket.AF_INET if isinstance(parsed, tuple) else socket.AF_UNIX
+        self._socket = socket.socket(family, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(parsed)
+        self._reader = self._socket.makefile("rb")
+        self._next_id = 0
+
+    def __enter__(self) -> "PredictionClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._reader.close()
+        self._socket.close()
+
+    def request(self, payload: Dict[str, object]) -> Dict[str, object]:
+        """Send one request and wait for its response line."""
+
+        self._next_id += 1
+        payload = dict(payload, id=self._next_id)
+        # default=str covers dates and other cell values handed over by Excel.
+        self._socket.sendall(json.dumps(payload, default=str).encode("utf-8") + b"\n")
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Prediction server closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise RuntimeError(f"Prediction server error: {response['error']}")
+        return response
+
+    def ping(self) -> bool:
+        return bool(self.request({"command": "ping"}).get("ok"))
+
+    def models(self) -> List[Dict[str, object]]:
+        """Describe the model versions resident in the daemon."""
+
+        return self.request({"command": "models"})["models"]
+
+    def cache_stats(self) -> Dict[str, object]:
+        """Return the daemon's prediction cache counters."""
+
+        return self.request({"command": "stats"})["cache"]
+
+    def predict_probabilities(
+        self, campaigns: Iterable[Dict[str, object]]
+    ) -> Tuple[List[float], List[Optional[str]]]:
+        """Score campaigns remotely; failed rows come back as ``NaN`` with an error reason."""
+
+        response = self.request({"campaigns": list(campaigns)})
+        probabilities = [float("nan") if value is None else value for value in response["probabilities"]]
+        return probabilities, response["errors"]
+
+    def predict_probability(self, campaign: Dict[str, object]) -> float:
+        """Score a single campaign remotely.
+
+        Raises:
+            ValueError: If the campaign has missing or non-numeric feature values.
+        """
+
+        probabilities, errors = self.predict_probabilities([campaign])
+        if errors[0] is not None:
+            raise ValueError(errors[0])
+        return probabilities[0]
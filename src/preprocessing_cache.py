@@ -0,0 +1,103 @@
+"""Content-addressed cache of preprocessed training data.
+
+Every ``train`` run used to re-parse the CSV, re-run ``_normalize_dataframe``
+(two date-parsing passes) and ``pd.get_dummies``, even when only the
+hyperparameters changed. ``load_or_build`` stores the encoded feature matrix
+(float32), labels and feature columns under a key made of the CSV's SHA-256
+and ``PREPROCESSING_VERSION``, and later runs memory-map the arrays instead
+of rebuilding them. Editing the CSV changes the key; changing the
+preprocessing code must bump ``PREPROCESSING_VERSION``.
+
+The cache lives in ``$KICKSTARTER_PREPROCESS_CACHE`` (default
+``~/.cache/kickstarter/preprocessed``), one directory per key:
+
+```
+<key>/features.npy        float32 (n_rows, n_features)
+<key>/labels.npy          uint8 (n_rows,)
+<key>/feature_columns.json
+```
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+CACHE_DIR_ENV = "KICKSTARTER_PREPROCESS_CACHE"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "kickstarter" / "preprocessed"
+# Bump whenever preprocess_features or _normalize_dataframe change their output.
+PREPROCESSING_VERSION = 2
+
+Preprocessed = Tuple[np.ndarray, np.ndarray, List[str]]
+BuildFn = Callable[[Path], Preprocessed]
+
+
+def default_cache_dir() -> Path:
+    return Path(os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR))
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 of a file's contents, read in ``chunk_size`` blocks."""
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(csv_path: Path, version: int = PREPROCESSING_VERSION) -> str:
+    return f"v{version}-{file_digest(csv_path)[:32]}"
+
+
+def load_or_build(
+    csv_path: Path,
+    build_fn: BuildFn,
+    *,
+    cache_dir: Optional[Path] = None,
+    version: int = PREPROCESSING_VERSION,
+) -> Tuple[np.ndarray, np.ndarray, List[str], bool]:
+    """Return the preprocessed ``csv_path``, building and storing it on a miss.
+
+    Args:
+        csv_path: Raw dataset CSV.
+        build_fn: Returns ``(features, labels, feature_columns)`` for a CSV path.
+        cache_dir: Cache root. Defaults to ``default_cache_dir()``.
+        version: Preprocessing version mixed into the key.
+
+    Returns:
+        ``features`` (read-only, memory-mapped float32 on a hit), ``labels``,
+        ``feature_columns`` and whether the cache was hit.
+    """
+
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    entry = cache_dir / cache_key(csv_path, version)
+    if (entry / "feature_columns.json").exists():
+        with open(entry / "feature_columns.json", "r", encoding="utf-8") as file:
+            feature_columns = json.load(file)
+        features = np.load(entry / "features.npy", mmap_mode="r")
+        labels = np.load(entry / "labels.npy")
+        return features, labels, feature_columns, True
+
+    features, labels, feature_columns = build_fn(csv_path)
+    features = np.asarray(features, dtype=np.float32)
+    labels = np.asarray(labels, dtype=np.uint8)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # Write into a temporary sibling and rename it, so concurrent runs never see a partial entry.
+    staging = Path(tempfile.mkdtemp(prefix=f".{entry.name}-", dir=cache_dir))
+    try:
+        np.save(staging / "features.npy", features)
+        np.save(staging / "labels.npy", labels)
+        with open(staging / "feature_columns.json", "w", encoding="utf-8") as file:
+            json.dump(list(feature_columns), file)
+        os.replace(staging, entry)
+    except OSError:
+        # Another run stored the same entry first, or the cache is not writable.
+        shutil.rmtree(staging, ignore_errors=True)
+    return features, labels, list(feature_columns), False
@@ -0,0 +1,137 @@
+"""
+Tests for streaming CSV scoring.
+
+Run from project root:
+    python -m pytest tests/test_batch_scoring.py
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from batch_scoring import (  # noqa: E402
+    ERROR_COLUMN,
+    MATH_THREAD_VARIABLES,
+    PROBABILITY_COLUMN,
+    _scoring_pool,
+    iter_csv_record_blocks,
+    score_csv,
+)
+from kickstarter_runtime import load_runtime  # noqa: E402
+
+ARTIFACTS_DIR = PROJECT_ROOT / "artifacts"
+SAMPLE_FILES = sorted((PROJECT_ROOT / "data").glob("sample_campaign_*.json"))
+
+
+@pytest.fixture(scope="module")
+def runtime():
+    return load_runtime(ARTIFACTS_DIR, allow_keras_fallback=False)
+
+
+@pytest.fixture
+def campaigns_csv(tmp_path):
+    rows = []
+    for index in range(7):
+        with open(SAMPLE_FILES[index % len(SAMPLE_FILES)], "r", encoding="utf-8") as file:
+            rows.append(dict(json.load(file), ID=index, goal=1000 * (index + 1)))
+    rows[4]["backers"] = "unknown"
+    path = tmp_path / "campaigns.csv"
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return path
+
+
+def test_score_csv_streams_chunks_in_order(runtime, campaigns_csv, tmp_path):
+    output_path = tmp_path / "scored.csv"
+    progress = []
+
+    summary = score_csv(
+        campaigns_csv, output_path, runtime, chunksize=3, progress=lambda *args: progress.append(args)
+    )
+
+    scored = pd.read_csv(output_path)
+    expected, expected_errors = runtime.predict_probabilities(pd.read_csv(campaigns_csv))
+
+    assert summary["rows"] == 7 and summary["failed"] == 1
+    assert [rows for rows, _, _ in progress] == [3, 6, 7]
+    assert scored["ID"].tolist() == list(range(7))
+    np.testing.assert_allclose(scored[PROBABILITY_COLUMN], expected, atol=1e-6)
+    assert scored[ERROR_COLUMN].isna().tolist() == [error is None for error in expected_errors]
+    assert "backers" in scored.loc[4, ERROR_COLUMN]
+
+
+def test_scores_do_not_depend_on_chunk_size(runtime, campaigns_csv, tmp_path):
+    frame = pd.read_csv(campaigns_csv)
+    # Rows 2-3 form a whole chunk without any usd pledged value at chunksize=2.
+    frame.loc[[2, 3, 5], "usd pledged"] = np.nan
+    frame.to_csv(campaigns_csv, index=False)
+
+    outputs = []
+    for chunksize in (2, 7):
+        output_path = tmp_path / f"scored-{chunksize}.csv"
+        score_csv(campaigns_csv, output_path, runtime, chunksize=chunksize, progress=lambda *args: None)
+        outputs.append(pd.read_csv(output_path))
+
+    pd.testing.assert_frame_equal(outputs[0], outputs[1])
+    assert outputs[0].loc[[2, 3, 5], ERROR_COLUMN].isna().all()
+
+
+def test_score_csv_writes_parquet(runtime, campaigns_csv, tmp_path):
+    pytest.importorskip("pyarrow")
+    output_path = tmp_path / "scored.parquet"
+
+    score_csv(campaigns_csv, output_path, runtime, chunksize=4, progress=lambda *args: None)
+
+    scored = pd.read_parquet(output_path)
+    assert len(scored) == 7
+    assert scored[PROBABILITY_COLUMN].notna().sum() == 6
+
+
+def test_record_blocks_keep_quoted_newlines_together(tmp_path):
+    path = tmp_path / "quoted.csv"
+    path.write_bytes(b'ID,name\n1,"multi\nline ""name"""\n2,plain\n3,"a,b"\n')
+
+    blocks = list(iter_csv_record_blocks(path, rows_per_block=2))
+
+    assert [header for header, _ in blocks] == [b"ID,name\n"] * 2
+    assert blocks[0][1] == b'1,"multi\nline ""name"""\n2,plain\n'
+    assert blocks[1][1] == b'3,"a,b"\n'
+
+
+def test_parallel_scoring_matches_single_process(runtime, campaigns_csv, tmp_path):
+    single_path = tmp_path / "single.csv"
+    parallel_path = tmp_path / "parallel.csv"
+
+    score_csv(campaigns_csv, single_path, runtime, chunksize=2, progress=lambda *args: None)
+    summary = score_csv(
+        campaigns_csv,
+        parallel_path,
+        chunksize=2,
+        workers=2,
+        model_dir=ARTIFACTS_DIR,
+        progress=lambda *args: None,
+    )
+
+    assert summary["rows"] == 7 and summary["failed"] == 1
+    pd.testing.assert_frame_equal(pd.read_csv(parallel_path), pd.read_csv(single_path))
+
+
+def _math_thread_settings():
+    return {name: os.environ.get(name) for name in MATH_THREAD_VARIABLES}
+
+
+def test_scoring_workers_start_with_one_math_thread():
+    before = _math_thread_settings()
+
+    with _scoring_pool(ARTIFACTS_DIR, 2) as pool:
+        reported = [future.result() for future in [pool.submit(_math_thread_settings) for _ in range(4)]]
+
+    assert reported == [dict.fromkeys(MATH_THREAD_VARIABLES, "1")] * 4
+    assert _math_thread_settings() == before
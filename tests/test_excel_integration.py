@@ -11,10 +11,22 @@ Test script for Excel integration functions.
 """
 
 import json
+import sys
 from pathlib import Path
-from excel_integration import (
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from excel_integration import (  # noqa: E402
+    KICKSTARTER_SCORE_RANGE,
+    KICKSTARTER_SCORE_RANGE_ASYNC,
     KICKSTARTER_SUCCESS_PROBABILITY,
     KICKSTARTER_SUCCESS_SUMMARY,
+    CAMPAIGN_FIELDS,
+    predict_campaign,
+    predict_rows,
+    score_predict_sheet,
 )
 
 # Test campaigns
@@ -106,5 +118,160 @@ def test_excel_functions():
     print("=" * 80)
 
 
+def _table(campaigns):
+    """Lay campaigns out the way Excel passes a range: header row, then values."""
+    header = list(campaigns[0].keys())
+    return [header] + [[campaign.get(name) for name in header] for campaign in campaigns]
+
+
+def test_score_range_matches_single_cell_udf():
+    campaigns = [case["data"] for case in TEST_CAMPAIGNS]
+    table = _table(campaigns)
+
+    scored = KICKSTARTER_SCORE_RANGE(table, model_dir="./artifacts")
+
+    assert len(scored) == len(campaigns)
+    for row, campaign in zip(scored, campaigns):
+        expected = KICKSTARTER_SUCCESS_PROBABILITY(json.dumps(campaign), model_dir="./artifacts")
+        assert abs(row[0] - expected) < 1e-5
+
+
+def test_score_range_keeps_blank_and_invalid_rows_aligned():
+    campaigns = [case["data"] for case in TEST_CAMPAIGNS]
+    table = _table(campaigns)
+    width = len(table[0])
+    table.insert(2, [None] * width)
+    table.append([campaigns[0][name] if name != "backers" else "lots" for name in table[0]])
+
+    scored = KICKSTARTER_SCORE_RANGE_ASYNC(table, model_dir="./artifacts")
+
+    assert len(scored) == len(table) - 1
+    assert scored[1] == [""]
+    assert isinstance(scored[0][0], float) and isinstance(scored[2][0], float)
+    assert scored[-1][0].startswith("Error:") and "backers" in scored[-1][0]
+
+
+def test_typed_entry_points_match_json_udf():
+    import numpy as np
+
+    campaigns = [case["data"] for case in TEST_CAMPAIGNS]
+    expected = [
+        KICKSTARTER_SUCCESS_PROBABILITY(json.dumps(campaign), model_dir="./artifacts") for campaign in campaigns
+    ]
+    rows = [tuple(campaign[name] for name in CAMPAIGN_FIELDS) for campaign in campaigns]
+
+    from_dicts = [predict_campaign(campaign, model_dir="./artifacts") for campaign in campaigns]
+    from_tuples, errors = predict_rows(rows, model_dir="./artifacts")
+    from_array, _ = predict_rows(np.array(rows, dtype=object), model_dir="./artifacts")
+    [single], _ = predict_rows(rows[0], model_dir="./artifacts")
+
+    assert errors == [None] * len(campaigns)
+    np.testing.assert_allclose(from_dicts, expected, atol=1e-5)
+    np.testing.assert_allclose(from_tuples, expected, atol=1e-5)
+    np.testing.assert_allclose(from_array, expected, atol=1e-5)
+    assert abs(single - expected[0]) < 1e-5
+
+
+def test_artifact_checks_are_rate_limited(monkeypatch):
+    import excel_integration
+    from model_registry import ModelRegistry
+
+    checks = []
+    monkeypatch.setattr(ModelRegistry, "refresh", lambda registry: checks.append(registry) or False)
+    rows = [tuple(TEST_CAMPAIGNS[0]["data"][name] for name in CAMPAIGN_FIELDS)]
+
+    monkeypatch.setattr(excel_integration, "REFRESH_INTERVAL", 3600.0)
+    for _ in range(5):
+        predict_rows(rows, model_dir="./artifacts")
+    assert checks == []
+
+    monkeypatch.setattr(excel_integration, "REFRESH_INTERVAL", 0.0)
+    predict_rows(rows, model_dir="./artifacts")
+    assert len(checks) == 1
+
+
+def test_rows_with_bad_values_or_wrong_width_are_reported():
+    campaign = TEST_CAMPAIGNS[0]["data"]
+    row = [campaign[name] for name in CAMPAIGN_FIELDS]
+
+    probabilities, errors = predict_rows([row, ["lots" if v == row[2] else v for v in row]], model_dir="./artifacts")
+
+    assert errors[0] is None and "backers" in errors[1]
+    with pytest.raises(ValueError):
+        predict_rows([row[:-1]], model_dir="./artifacts")
+
+
+class _FakeRange:
+    def __init__(self, sheet, first, last=None):
+        self.sheet, self.first, self.last = sheet, first, last or first
+
+    def options(self, **kwargs):
+        return self
+
+    @property
+    def value(self):
+        self.sheet.calls.append("read")
+        (top, left), (bottom, right) = self.first, self.last
+        return [[self.sheet.cells.get((row, col)) for col in range(left, right + 1)] for row in range(top, bottom + 1)]
+
+    @value.setter
+    def value(self, rows):
+        self.sheet.calls.append("write")
+        top, left = self.first
+        for offset, row in enumerate(rows):
+            for col_offset, value in enumerate(row):
+                self.sheet.cells[(top + offset, left + col_offset)] = value
+
+
+class _FakeSheet:
+    """Minimal stand-in for an xlwings sheet that records every range read and write."""
+
+    def __init__(self, table):
+        self.calls = []
+        self.cells = {(r + 1, c + 1): value for r, row in enumerate(table) for c, value in enumerate(row)}
+        self.used_range = type("UsedRange", (), {"last_cell": type("Cell", (), {"row": len(table)})})()
+
+    def range(self, first, last=None):
+        return _FakeRange(self, first, last)
+
+
+def test_predict_sheet_is_scored_with_one_read_and_one_write():
+    campaigns = [case["data"] for case in TEST_CAMPAIGNS] * 200
+    table = _table(campaigns)
+    table.insert(3, [None] * len(table[0]))
+    sheet = _FakeSheet(table)
+
+    values, timings = score_predict_sheet(sheet, model_dir="./artifacts")
+
+    assert sheet.calls == ["read", "write"]
+    assert timings["rows"] == len(campaigns)
+    assert len(values) == len(table) - 1 and values[2] == ""
+    assert [sheet.cells[(row, 12)] for row in range(2, len(table) + 1)] == values
+    expected = KICKSTARTER_SCORE_RANGE(table, model_dir="./artifacts")
+    assert values == [value for (value,) in expected]
+
+
+def test_vba_predict_keeps_returning_the_first_probability(monkeypatch):
+    import excel_integration
+
+    campaigns = [case["data"] for case in TEST_CAMPAIGNS]
+    sheet = _FakeSheet(_table(campaigns))
+
+    class _FakeBook:
+        sheets = {"Predict": sheet}
+
+        class app:
+            status_bar = None
+
+    monkeypatch.setattr(excel_integration.xw.Book, "caller", staticmethod(lambda: _FakeBook), raising=False)
+
+    values = excel_integration.vba_predict_sheet(model_dir="./artifacts")
+    probability = excel_integration.vba_predict(model_dir="./artifacts")
+
+    assert isinstance(probability, float) and probability == values[0]
+    assert len(values) == len(campaigns)
+    assert _FakeBook.app.status_bar.startswith("Kickstarter: scored 3 campaigns")
+
+
 if __name__ == "__main__":
     test_excel_functions()
@@ -0,0 +1,84 @@
+"""
+Tests for the sharded out-of-core feature store.
+
+Run from project root:
+    python -m pytest tests/test_feature_store.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+sys.path.insert(0, str(PROJECT_ROOT / "benchmarks"))
+
+from feature_store import FeatureStore, build_feature_store  # noqa: E402
+from model_pipeline import preprocess_features, train_model_from_store  # noqa: E402
+from synthetic import synthetic_campaigns  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def campaigns_csv(tmp_path_factory):
+    frame = synthetic_campaigns(1500, seed=11)
+    frame["state"] = np.where(frame["pledged"] >= frame["goal"], "successful", "failed")
+    # Rows the in-memory path drops or fills, so the store has to do the same.
+    frame.loc[::50, "state"] = "canceled"
+    frame.loc[::70, "usd pledged"] = np.nan
+    path = tmp_path_factory.mktemp("store") / "campaigns.csv"
+    frame.to_csv(path, index=False)
+    return path
+
+
+def test_store_matches_in_memory_preprocessing(campaigns_csv, tmp_path):
+    from sklearn.preprocessing import StandardScaler
+
+    store = build_feature_store(campaigns_csv, tmp_path, chunksize=400, test_size=0.0, validation_split=0.0)
+    features, labels, feature_columns = preprocess_features(pd.read_csv(campaigns_csv))
+    expected = StandardScaler().fit_transform(features)
+
+    assert store.feature_columns == feature_columns
+    assert len(store.shard_paths("train")) == 4
+    stored_features, stored_labels = store.load("train")
+    np.testing.assert_allclose(stored_features, expected, rtol=1e-4, atol=1e-4)
+    np.testing.assert_array_equal(stored_labels, labels.to_numpy())
+
+
+def test_split_assignment_does_not_depend_on_chunksize(campaigns_csv, tmp_path):
+    small = build_feature_store(campaigns_csv, tmp_path / "small", chunksize=300)
+    large = build_feature_store(campaigns_csv, tmp_path / "large", chunksize=5000)
+
+    for split in ("train", "validation", "test"):
+        assert small.rows(split) == large.rows(split)
+        assert small.class_counts(split) == large.class_counts(split)
+        np.testing.assert_allclose(small.load(split)[0], large.load(split)[0], atol=1e-5)
+    assert sum(small.rows(split) for split in ("train", "validation", "test")) == 1500 - 30
+
+
+def test_shuffled_batches_cover_every_row_once(campaigns_csv, tmp_path):
+    store = build_feature_store(campaigns_csv, tmp_path, chunksize=300)
+    ordered = store.load("train")[0]
+    batches = list(store.iter_batches("train", 64, rng=np.random.default_rng(0)))
+
+    shuffled = np.concatenate([features for features, _ in batches])
+    assert max(len(features) for features, _ in batches) <= 64
+    assert not np.array_equal(shuffled, ordered)
+    np.testing.assert_array_equal(np.sort(shuffled, axis=0), np.sort(ordered, axis=0))
+
+
+def test_training_streams_the_store(campaigns_csv, tmp_path):
+    build_feature_store(campaigns_csv, tmp_path, chunksize=500)
+
+    model, scaler, feature_columns, metrics = train_model_from_store(tmp_path, batch_size=128, epochs=2)
+
+    assert model.input_shape[1] == len(feature_columns) == len(scaler.mean_)
+    assert {"accuracy", "auc", "samples_per_second"} <= set(metrics)
+    assert metrics["epochs_trained"] == 2
+
+
+def test_missing_manifest_is_reported(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        FeatureStore(tmp_path)
@@ -0,0 +1,69 @@
+"""
+Tests for the parallel hyperparameter search.
+
+Run from project root:
+    python -m pytest tests/test_hyperparameter_search.py
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+sys.path.insert(0, str(PROJECT_ROOT / "benchmarks"))
+
+from hyperparameter_search import (  # noqa: E402
+    BASELINE_CONFIGURATION,
+    LEADERBOARD_FILENAME,
+    run_search,
+    sample_configurations,
+)
+from kickstarter_runtime import load_runtime  # noqa: E402
+from synthetic import synthetic_campaigns  # noqa: E402
+
+
+def test_configurations_are_reproducible_and_start_with_the_baseline():
+    configurations = sample_configurations(8, seed=3)
+
+    assert configurations == sample_configurations(8, seed=3)
+    assert configurations[0] == BASELINE_CONFIGURATION
+    assert len({json.dumps(configuration, sort_keys=True) for configuration in configurations}) == 8
+    assert all(3e-4 <= configuration["learning_rate"] <= 3e-3 for configuration in configurations)
+
+
+def test_successive_halving_saves_the_best_trial(tmp_path):
+    frame = synthetic_campaigns(800, seed=9)
+    frame["state"] = np.where(frame["pledged"] >= frame["goal"], "successful", "failed")
+    csv_path = tmp_path / "campaigns.csv"
+    frame.to_csv(csv_path, index=False)
+    output_dir = tmp_path / "artifacts"
+
+    leaderboard = run_search(
+        csv_path,
+        output_dir,
+        strategy="halving",
+        trials=4,
+        min_epochs=1,
+        max_epochs=2,
+        eta=2,
+        jobs=1,
+        cache_dir=tmp_path / "cache",
+    )
+
+    assert len(leaderboard) == 4
+    assert [result["rung"] for result in leaderboard] == [1, 1, 0, 0]
+    # Survivors continue from their first-rung models instead of starting over.
+    assert [result["initial_epoch"] for result in leaderboard] == [1, 1, 0, 0]
+    assert all(result["epochs_trained"] <= result["epochs"] for result in leaderboard)
+    assert leaderboard[0]["val_auc"] >= leaderboard[1]["val_auc"]
+    assert all(result["inference_us_per_row"] > 0 and result["parameters"] > 0 for result in leaderboard)
+
+    with open(output_dir / LEADERBOARD_FILENAME, "r", encoding="utf-8") as file:
+        saved = json.load(file)
+    assert saved["winner"] == leaderboard[0]["trial"]
+    runtime = load_runtime(output_dir)
+    hidden_units = leaderboard[0]["configuration"]["hidden_units"]
+    assert [kernel.shape[1] for kernel, _, _ in runtime.predictor.layers[:-1]] == hidden_units
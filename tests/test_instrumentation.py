@@ -0,0 +1,76 @@
+"""
+Tests for the stage timing histograms and Prometheus exposition.
+
+Run from project root:
+    python -m pytest tests/test_instrumentation.py
+"""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from instrumentation import MetricsRegistry  # noqa: E402
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.1, 0.5, 3.0):
+        registry.observe("latency_seconds", seconds, {"stage": "encode"})
+
+    text = registry.render_prometheus()
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{stage="encode",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{stage="encode",le="1"} 3' in text
+    assert 'latency_seconds_bucket{stage="encode",le="+Inf"} 4' in text
+    assert 'latency_seconds_sum{stage="encode"} 3.65' in text
+    assert 'latency_seconds_count{stage="encode"} 4' in text
+
+
+def test_stages_record_latency_and_rows():
+    registry = MetricsRegistry()
+
+    with registry.stage("encode", rows=10):
+        pass
+    with registry.stage("read_upload") as timer:
+        timer.rows = 3
+
+    @registry.timed("forward")
+    def forward(value):
+        return value * 2
+
+    assert forward(21) == 42
+    summary = registry.stage_summary()
+    assert summary["encode"]["count"] == 1 and summary["encode"]["rows"] == 10
+    assert summary["read_upload"]["rows"] == 3
+    assert summary["forward"]["count"] == 1 and summary["forward"]["rows"] == 0
+
+
+def test_counters_gauges_and_label_escaping():
+    registry = MetricsRegistry()
+    registry.describe("requests_total", "Requests served.")
+    registry.increment("requests_total", labels={"endpoint": "/upload", "status": 200})
+    registry.increment("requests_total", labels={"status": 200, "endpoint": "/upload"})
+    registry.add_gauge("in_flight", 1)
+    registry.add_gauge("in_flight", -1)
+    registry.set_gauge("model_info", 1, {"version": 'a"b'})
+
+    text = registry.render_prometheus()
+
+    assert "# HELP requests_total Requests served.\n# TYPE requests_total counter" in text
+    assert 'requests_total{endpoint="/upload",status="200"} 2' in text
+    assert "in_flight 0" in text
+    assert 'model_info{version="a\\"b"} 1' in text
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+
+    with registry.stage("encode", rows=5) as timer:
+        timer.rows = 7
+    registry.increment("requests_total")
+
+    assert registry.stage_summary() == {}
+    assert registry.render_prometheus() == "\n"
@@ -0,0 +1,109 @@
+"""
+Tests for the web app's background job queue.
+
+Run from project root:
+    python -m pytest tests/test_jobs.py
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "webapp"))
+
+from jobs import JobQueue, QueueFullError  # noqa: E402
+
+
+def _write(text):
+    def save(path):
+        path.write_text(text, encoding="utf-8")
+
+    return save
+
+
+def _wait_for(queue, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.status(job_id)
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_job_reports_progress_and_stores_result(tmp_path):
+    def process(path, progress):
+        rows = path.read_text(encoding="utf-8").split(",")
+        for index in range(len(rows)):
+            progress(index + 1, len(rows))
+        return {"rows": rows}
+
+    queue = JobQueue(tmp_path, process, max_workers=1)
+    job_id = queue.submit("input.txt", _write("a,b,c"))
+
+    job = _wait_for(queue, job_id)
+    assert job["status"] == "done"
+    assert job["processed_rows"] == job["total_rows"] == 3
+    assert job["progress"] == 1.0
+    assert json.loads(queue.result_path(job_id).read_text()) == {"rows": ["a", "b", "c"]}
+    assert not (tmp_path / job_id / "input.txt").exists()
+    queue.close()
+
+
+def test_failed_job_records_error(tmp_path):
+    def process(path, progress):
+        raise ValueError("Missing required columns: goal")
+
+    queue = JobQueue(tmp_path, process, max_workers=1)
+    job = _wait_for(queue, queue.submit("input.csv", _write("x")))
+
+    assert job["status"] == "failed"
+    assert "goal" in job["error"]
+    queue.close()
+
+
+def test_full_queue_rejects_new_jobs(tmp_path):
+    release = threading.Event()
+
+    def process(path, progress):
+        release.wait(5)
+        return {}
+
+    queue = JobQueue(tmp_path, process, max_workers=1, max_pending=2)
+    first = queue.submit("a.csv", _write("x"))
+    queue.submit("b.csv", _write("x"))
+    with pytest.raises(QueueFullError):
+        queue.submit("c.csv", _write("x"))
+
+    release.set()
+    _wait_for(queue, first)
+    queue.close()
+    assert len(list(tmp_path.glob("*/results.json"))) == 2
+
+
+def test_jobs_are_removed_after_retention(tmp_path):
+    queue = JobQueue(tmp_path, lambda path, progress: {}, max_workers=1, retention_seconds=0)
+    job_id = queue.submit("input.csv", _write("x"))
+    _wait_for(queue, job_id)
+
+    assert queue.cleanup_expired() == 1
+    assert queue.status(job_id) is None
+    assert not (tmp_path / job_id).exists()
+    queue.close()
+
+
+def test_store_is_shared_between_queues(tmp_path):
+    queue = JobQueue(tmp_path, lambda path, progress: {"ok": True}, max_workers=1)
+    job_id = queue.submit("input.csv", _write("x"))
+    _wait_for(queue, job_id)
+
+    # A second worker process would open the same database and see the job.
+    other = JobQueue(tmp_path, lambda path, progress: {}, max_workers=1)
+    assert other.status(job_id)["status"] == "done"
+    queue.close()
+    other.close()
@@ -0,0 +1,165 @@
+"""
+Tests for the TensorFlow-free NumPy runtime.
+
+Run from project root:
+    python -m pytest tests/test_kickstarter_runtime.py
+"""
+
+import datetime
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from kickstarter_runtime import (  # noqa: E402
+    RUNTIME_BUNDLE_FILENAME,
+    load_runtime,
+    load_runtime_bundle,
+    parse_date_parts,
+)
+
+ARTIFACTS_DIR = PROJECT_ROOT / "artifacts"
+SAMPLE_FILES = sorted((PROJECT_ROOT / "data").glob("sample_campaign_*.json"))
+
+
+@pytest.fixture(scope="module")
+def campaigns():
+    samples = []
+    for path in SAMPLE_FILES:
+        with open(path, "r", encoding="utf-8") as file:
+            samples.append(json.load(file))
+    return samples
+
+
+def test_runtime_import_does_not_load_tensorflow():
+    code = (
+        "import sys; sys.path.insert(0, 'src'); "
+        "from pathlib import Path; import kickstarter_runtime as kr; "
+        "kr.load_runtime(Path('artifacts'), allow_keras_fallback=False); "
+        "heavy = [m for m in sys.modules if m.split('.')[0] in ('tensorflow', 'keras', 'sklearn')]; "
+        "print(','.join(heavy))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    assert output.stdout.strip() == ""
+
+
+def test_bundle_matches_keras_artifacts(campaigns, tmp_path):
+    from model_pipeline import export_runtime_bundle, load_artifacts, predict_success_probabilities
+
+    model, scaler, feature_columns = load_artifacts(ARTIFACTS_DIR)
+    bundle_path = export_runtime_bundle(model, scaler, feature_columns, tmp_path)
+    assert bundle_path == tmp_path / RUNTIME_BUNDLE_FILENAME
+
+    runtime = load_runtime_bundle(bundle_path)
+    probabilities, errors = runtime.predict_probabilities(campaigns)
+    expected, _ = predict_success_probabilities(
+        campaigns, model=model, scaler=scaler, feature_columns=feature_columns
+    )
+
+    assert errors == [None] * len(campaigns)
+    assert runtime.feature_columns == list(feature_columns)
+    np.testing.assert_allclose(probabilities, expected, atol=1e-6)
+
+    shipped = load_runtime(ARTIFACTS_DIR, allow_keras_fallback=False)
+    np.testing.assert_allclose(shipped.predict_probabilities(campaigns)[0], expected, atol=1e-6)
+
+
+def test_missing_pledge_score_does_not_depend_on_batch(campaigns, tmp_path):
+    from model_pipeline import export_runtime_bundle, load_artifacts
+
+    model, scaler, feature_columns = load_artifacts(ARTIFACTS_DIR)
+    exported = load_runtime_bundle(export_runtime_bundle(model, scaler, feature_columns, tmp_path))
+    shipped = load_runtime(ARTIFACTS_DIR, allow_keras_fallback=False)
+    assert exported.encoder.fill_values == shipped.encoder.fill_values
+    assert exported.encoder.fill_values["usd pledged"] == pytest.approx(
+        scaler.mean_[list(feature_columns).index("usd pledged")]
+    )
+
+    missing = dict(campaigns[0], **{"usd pledged": None})
+    alone, errors = exported.predict_probabilities([missing])
+    assert errors == [None]
+    for others in ([dict(campaigns[1], **{"usd pledged": 1e9})], campaigns, [dict(missing)]):
+        together, _ = exported.predict_probabilities([missing] + others)
+        assert together[0] == pytest.approx(alone[0], abs=1e-6)
+
+
+def test_shipped_artifacts_store_fill_values(tmp_path):
+    import pickle
+
+    with np.load(ARTIFACTS_DIR / RUNTIME_BUNDLE_FILENAME) as bundle:
+        arrays = dict(bundle)
+    assert arrays["fill_columns"].tolist() == ["usd pledged"]
+    with open(ARTIFACTS_DIR / "feature_encoder.pkl", "rb") as file:
+        encoder = pickle.load(file)
+    assert encoder.fill_values == {"usd pledged": pytest.approx(float(arrays["fill_values"][0]))}
+
+    # Bundles written before fill values were stored fall back to the scaler mean.
+    legacy_path = tmp_path / RUNTIME_BUNDLE_FILENAME
+    np.savez(legacy_path, **{name: value for name, value in arrays.items() if not name.startswith("fill_")})
+    legacy = load_runtime_bundle(legacy_path)
+    assert legacy.encoder.fill_values == {"usd pledged": pytest.approx(float(arrays["fill_values"][0]))}
+
+
+def test_missing_bundle_without_fallback_raises(tmp_path):
+    with pytest.raises(FileNotFoundError, match="export"):
+        load_runtime(tmp_path, allow_keras_fallback=False)
+
+
+def _reference_date_parts(values):
+    """Date components as produced before the fast parser, with pandas format inference."""
+    parsed = pd.DatetimeIndex(pd.to_datetime(values, errors="coerce"))
+    return np.column_stack([parsed.year, parsed.month, parsed.day]).astype(np.float64)
+
+
+DATE_COLUMNS_BY_FORMAT = {
+    "dates": ["2024-01-05", "2023-12-31", None, "garbage", "", np.nan, "2024-02-30", "2024-13-01",
+              "2000-02-29", "1900-02-29", "1600-01-01", "9999-12-31"],
+    "timestamps": ["2015-08-11 12:12:28", "2016-02-29 00:00:00", None, "2024-01-05 24:00:00",
+                   "2015-08-11 12:61:00", "2015-08-11 12:12:2x"],
+    "iso_t": ["2015-08-11T12:12:28", "2016-02-29T23:59:59", "nope"],
+    "us_dates": ["01/05/2024", "12/31/2023", None],
+    "objects": [datetime.datetime(2024, 1, 5, 10, 30), pd.Timestamp("2020-02-29"), datetime.date(2024, 3, 1), None],
+    "non_ascii": ["٢٠٢٤-٠١-٠٥", "2024-01-05"],
+}
+
+
+@pytest.mark.parametrize("name", sorted(DATE_COLUMNS_BY_FORMAT))
+def test_date_parts_match_pandas_for_single_format_columns(name):
+    values = np.array(DATE_COLUMNS_BY_FORMAT[name], dtype=object)
+
+    expected = _reference_date_parts(values)
+    # Large batches take the vectorised path, small ones the cached path, single values both.
+    np.testing.assert_array_equal(parse_date_parts(np.tile(values, 20)), np.tile(expected, (20, 1)))
+    np.testing.assert_array_equal(parse_date_parts(values), expected)
+    for value, row in zip(values, expected):
+        np.testing.assert_array_equal(parse_date_parts([value])[0], _reference_date_parts([value])[0])
+        np.testing.assert_array_equal(parse_date_parts([value])[0], row)
+
+
+def test_date_parts_of_kickstarter_columns_and_datetime_series():
+    sys.path.insert(0, str(PROJECT_ROOT / "benchmarks"))
+    from synthetic import synthetic_campaigns
+
+    frame = synthetic_campaigns(3000, seed=5)
+    for column in ("deadline", "launched"):
+        expected = _reference_date_parts(frame[column])
+        np.testing.assert_array_equal(parse_date_parts(frame[column]), expected)
+        np.testing.assert_array_equal(parse_date_parts(pd.to_datetime(frame[column])), expected)
+
+
+def test_mixed_date_formats_are_parsed_per_value():
+    # pandas infers one format from the first value and drops the rest; each value now stands alone.
+    values = ["2024-01-05", "2015-08-11 12:12:28", "01/02/2024"]
+
+    np.testing.assert_array_equal(
+        parse_date_parts(values), [[2024, 1, 5], [2015, 8, 11], [2024, 1, 2]]
+    )
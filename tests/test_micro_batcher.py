@@ -0,0 +1,128 @@
+"""
+Tests for the web app's request micro-batcher.
+
+Run from project root:
+    python -m pytest tests/test_micro_batcher.py
+"""
+
+import os
+import signal
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "webapp"))
+
+from micro_batcher import MicroBatcher  # noqa: E402
+
+
+class RecordingPredictor:
+    """Scores a campaign as its ``goal`` and remembers every batch size it saw."""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.lock = threading.Lock()
+
+    def __call__(self, campaigns):
+        with self.lock:
+            self.batch_sizes.append(len(campaigns))
+        probabilities = np.array([campaign["goal"] for campaign in campaigns], dtype=np.float64)
+        errors = [None if campaign["goal"] >= 0 else "negative goal" for campaign in campaigns]
+        return probabilities, errors
+
+
+def test_concurrent_requests_are_coalesced_and_split_back():
+    predictor = RecordingPredictor()
+    batcher = MicroBatcher(predictor, max_batch_size=64, max_wait=0.2)
+    results = {}
+    start = threading.Barrier(8)
+
+    def submit(worker):
+        campaigns = [{"goal": worker * 10 + index} for index in range(worker % 3 + 1)]
+        start.wait()
+        results[worker] = batcher.submit(campaigns)
+
+    threads = [threading.Thread(target=submit, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    for worker, (probabilities, errors) in results.items():
+        expected = [worker * 10 + index for index in range(worker % 3 + 1)]
+        np.testing.assert_array_equal(probabilities, expected)
+        assert errors == [None] * len(expected)
+
+    stats = batcher.stats()
+    assert len(predictor.batch_sizes) < 8
+    assert stats["requests"] == 8 and stats["queue_depth"] == 0
+    assert stats["rows_scored"] == sum(worker % 3 + 1 for worker in range(8))
+    assert sum(stats["batch_size_histogram"].values()) == stats["batches"]
+
+
+def test_full_batch_flushes_without_waiting():
+    predictor = RecordingPredictor()
+    batcher = MicroBatcher(predictor, max_batch_size=4, max_wait=10.0)
+
+    probabilities, errors = batcher.submit([{"goal": 1}] * 4)
+    batcher.close()
+
+    assert probabilities.tolist() == [1, 1, 1, 1]
+    assert batcher.stats()["direct_requests"] == 1
+
+
+def test_requests_are_only_batched_with_their_pinned_predictor():
+    old_model, new_model = RecordingPredictor(), RecordingPredictor()
+    batcher = MicroBatcher(max_batch_size=64, max_wait=0.2)
+    results = {}
+    start = threading.Barrier(6)
+
+    def submit(worker):
+        model = old_model if worker % 2 else new_model
+        start.wait()
+        results[worker] = batcher.submit([{"goal": worker}], model)
+
+    threads = [threading.Thread(target=submit, args=(worker,)) for worker in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    for worker, (probabilities, _) in results.items():
+        assert probabilities.tolist() == [worker]
+    # Each predictor saw exactly its own three rows.
+    assert sum(old_model.batch_sizes) == sum(new_model.batch_sizes) == 3
+    assert len(old_model.batch_sizes) + len(new_model.batch_sizes) < 6
+
+
+def test_predictor_failures_reach_the_caller():
+    def failing_predictor(campaigns):
+        raise RuntimeError("model unavailable")
+
+    batcher = MicroBatcher(failing_predictor, max_batch_size=8, max_wait=0.001)
+    with pytest.raises(RuntimeError, match="model unavailable"):
+        batcher.submit([{"goal": 1}])
+    batcher.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_batcher_keeps_working_in_forked_child():
+    batcher = MicroBatcher(RecordingPredictor(), max_batch_size=64, max_wait=0.001)
+    assert batcher.submit([{"goal": 0.25}])[0].tolist() == [0.25]
+
+    pid = os.fork()
+    if pid == 0:  # Child: the parent's background thread did not survive the fork.
+        signal.alarm(5)
+        probabilities, _ = batcher.submit([{"goal": 0.5}, {"goal": 0.75}])
+        os._exit(0 if probabilities.tolist() == [0.5, 0.75] else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    assert batcher.submit([{"goal": 1.0}])[0].tolist() == [1.0]
+    batcher.close()
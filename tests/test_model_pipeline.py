@@ -0,0 +1,272 @@
+"""
+Tests for the training and batch inference helpers in model_pipeline.
+
+Run from project root:
+    python -m pytest tests/test_model_pipeline.py
+"""
+
+import json
+import pickle
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from kickstarter_runtime import scaler_fill_values  # noqa: E402
+from model_pipeline import (  # noqa: E402
+    FeatureEncoder,
+    export_compiled_predictor,
+    load_artifacts,
+    load_feature_encoder,
+    make_dataset,
+    predict_success_probabilities,
+    predict_success_probability,
+    preprocess_features,
+    scaled_learning_rate,
+    train_model,
+)
+
+ARTIFACTS_DIR = PROJECT_ROOT / "artifacts"
+SAMPLE_FILES = sorted((PROJECT_ROOT / "data").glob("sample_campaign_*.json"))
+
+
+@pytest.fixture(scope="module")
+def artifacts():
+    return load_artifacts(ARTIFACTS_DIR)
+
+
+@pytest.fixture(scope="module")
+def campaigns():
+    samples = []
+    for path in SAMPLE_FILES:
+        with open(path, "r", encoding="utf-8") as file:
+            samples.append(json.load(file))
+    return samples
+
+
+def _reference_probability(campaign, model, scaler, feature_columns):
+    """Score one campaign the way the original per-row implementation did."""
+
+    features, _, _ = preprocess_features(pd.DataFrame([campaign]), feature_columns=feature_columns)
+    return float(model.predict(scaler.transform(features), verbose=0)[0][0])
+
+
+def test_batch_matches_single_row_path(artifacts, campaigns):
+    model, scaler, feature_columns = artifacts
+
+    probabilities, errors = predict_success_probabilities(
+        campaigns, model=model, scaler=scaler, feature_columns=feature_columns, batch_size=2
+    )
+
+    assert errors == [None] * len(campaigns)
+    expected = [_reference_probability(c, model, scaler, feature_columns) for c in campaigns]
+    np.testing.assert_allclose(probabilities, expected, rtol=1e-5, atol=1e-6)
+
+
+def test_batch_reports_per_row_errors(artifacts, campaigns):
+    model, scaler, feature_columns = artifacts
+    broken = dict(campaigns[0], goal="not a number")
+    frame = pd.DataFrame([campaigns[0], broken, campaigns[1]])
+
+    probabilities, errors = predict_success_probabilities(
+        frame, model=model, scaler=scaler, feature_columns=feature_columns
+    )
+
+    assert errors[0] is None and errors[2] is None
+    assert "goal" in errors[1]
+    assert np.isnan(probabilities[1])
+    assert np.isfinite(probabilities[[0, 2]]).all()
+
+
+def test_batch_keeps_rows_with_unscored_states(artifacts, campaigns):
+    model, scaler, feature_columns = artifacts
+    rows = [dict(campaign, state="live") for campaign in campaigns]
+
+    probabilities, errors = predict_success_probabilities(
+        rows, model=model, scaler=scaler, feature_columns=feature_columns
+    )
+
+    assert len(probabilities) == len(rows)
+    assert errors == [None] * len(rows)
+
+
+def test_single_prediction_raises_on_invalid_campaign(artifacts, campaigns):
+    model, scaler, feature_columns = artifacts
+
+    with pytest.raises(ValueError, match="backers"):
+        predict_success_probability(
+            dict(campaigns[0], backers=None),
+            model=model,
+            scaler=scaler,
+            feature_columns=feature_columns,
+        )
+
+
+def _parity_rows(campaigns):
+    """Campaigns exercising unknown categories, missing values and timestamps."""
+
+    rows = [dict(campaign) for campaign in campaigns]
+    rows.append(dict(campaigns[0], category="Not A Category", country="ZZ", currency=None))
+    rows.append(dict(campaigns[1], deadline="2015-10-09", launched="2015-08-11 12:12:28"))
+    rows.append({"goal": 1000, "category": "Poetry", "main_category": "Publishing", "name": "x", "ID": 7})
+    rows.append(dict(campaigns[2], **{"usd pledged": None, "usd_goal_real": 2500.5}))
+    return rows
+
+
+def test_feature_encoder_matches_get_dummies_path(artifacts, campaigns):
+    _, scaler, feature_columns = artifacts
+    rows = _parity_rows(campaigns)
+    encoder = FeatureEncoder(feature_columns, scaler_fill_values(feature_columns, scaler.mean_))
+
+    reference, _, _ = preprocess_features(
+        pd.DataFrame(rows), feature_columns=feature_columns, fill_values=encoder.fill_values
+    )
+    expected = reference.to_numpy(dtype=np.float64).astype(np.float32)
+
+    for batch in (rows, pd.DataFrame(rows)):
+        encoded = encoder.transform(batch)
+        assert encoded.dtype == np.float32
+        np.testing.assert_array_equal(encoded, expected)
+
+
+def test_feature_encoder_round_trips_through_artifacts(artifacts):
+    _, _, feature_columns = artifacts
+
+    encoder = load_feature_encoder(ARTIFACTS_DIR, feature_columns)
+    restored = pickle.loads(pickle.dumps(encoder))
+
+    assert restored.feature_columns == list(feature_columns)
+    assert restored.fill_values == encoder.fill_values
+    assert restored.category_index == FeatureEncoder(feature_columns).category_index
+
+
+def test_compiled_predictor_matches_keras(artifacts, campaigns):
+    model, scaler, feature_columns = artifacts
+    encoder = FeatureEncoder(feature_columns)
+    rng = np.random.default_rng(34)
+
+    features = encoder.transform(_parity_rows(campaigns)[:3])
+    noise = rng.normal(size=(64, encoder.n_features)).astype(np.float32)
+    features = np.vstack([features, features[:1] + noise * scaler.scale_.astype(np.float32)])
+
+    keras_output = model.predict(
+        scaler.transform(pd.DataFrame(features, columns=feature_columns)), verbose=0
+    ).reshape(-1)
+    compiled = export_compiled_predictor(model, scaler)
+
+    assert compiled.input_dim == encoder.n_features
+    np.testing.assert_allclose(compiled.predict(features, batch_size=16), keras_output, atol=1e-5)
+
+
+# Generous enough for slow CI machines, but well below the cost of importing TensorFlow.
+COLD_START_BUDGET_SECONDS = 5.0
+
+
+def test_predict_cli_cold_start_stays_light():
+    command = [
+        sys.executable,
+        str(PROJECT_ROOT / "src" / "model_pipeline.py"),
+        "--profile-startup",
+        "predict",
+        "--model-dir",
+        str(ARTIFACTS_DIR),
+        "--json-path",
+        str(SAMPLE_FILES[0]),
+    ]
+    start = time.perf_counter()
+    completed = subprocess.run(command, capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+
+    assert "Predicted success probability" in completed.stdout
+    assert "load runtime" in completed.stderr
+    assert "import tensorflow" not in completed.stderr
+    assert elapsed < COLD_START_BUDGET_SECONDS, f"cold start took {elapsed:.2f}s"
+
+
+def test_importing_model_pipeline_skips_heavy_dependencies():
+    code = (
+        "import sys; sys.path.insert(0, 'src'); import model_pipeline; "
+        "print(','.join(m for m in sys.modules if m.split('.')[0] in ('tensorflow', 'keras', 'sklearn')))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    assert completed.stdout.strip() == ""
+
+
+@pytest.fixture(scope="module")
+def training_csv(tmp_path_factory):
+    sys.path.insert(0, str(PROJECT_ROOT / "benchmarks"))
+    from synthetic import synthetic_campaigns
+
+    # Enough rows that the test-set AUC varies by about 0.01 between seeds.
+    frame = synthetic_campaigns(20000, seed=7)
+    frame["state"] = np.where(frame["pledged"] >= frame["goal"], "successful", "failed")
+    path = tmp_path_factory.mktemp("training") / "campaigns.csv"
+    frame.to_csv(path, index=False)
+    return path
+
+
+def test_tfdata_pipeline_matches_numpy_training(training_csv, tmp_path):
+    results = {
+        pipeline: train_model(training_csv, batch_size=256, epochs=3, input_pipeline=pipeline, cache_dir=tmp_path)
+        for pipeline in ("numpy", "tfdata")
+    }
+
+    for model, scaler, feature_columns, metrics in results.values():
+        assert {"loss", "accuracy", "auc", "epoch_seconds", "samples_per_second", "preprocess_seconds"} <= set(metrics)
+        assert metrics["epochs_trained"] >= 1
+        assert metrics["samples_per_second"] > 0
+        assert model.input_shape[1] == len(feature_columns) == len(scaler.mean_)
+    # Same split, scaler and class weights; only shuffling and batch order differ. Over six seeds
+    # both pipelines scored 0.85-0.88 AUC and never differed by more than 0.02.
+    assert min(metrics["auc"] for *_, metrics in results.values()) > 0.8
+    assert abs(results["numpy"][3]["auc"] - results["tfdata"][3]["auc"]) < 0.04
+
+
+def test_make_dataset_yields_the_batches_numpy_training_sees():
+    rng = np.random.default_rng(5)
+    n_rows, batch_size = 1000, 256
+    features = (rng.normal(size=(n_rows, 5)) * 10 + 3).astype(np.float32)
+    # The first column records each row's position, so shuffled rows can be traced back.
+    features = np.column_stack([np.arange(n_rows, dtype=np.float32), features])
+    labels = (rng.random(n_rows) < 0.3).astype(np.float32)
+    mean, scale = features.mean(axis=0), features.std(axis=0)
+    class_weights = {0: 0.7, 1: 1.8}
+    dataset_args = {"batch_size": batch_size, "mean": mean, "scale": scale, "class_weights": class_weights}
+
+    expected_shapes = [batch_size] * (n_rows // batch_size) + [n_rows % batch_size]
+    for shuffle in (False, True):
+        dataset = make_dataset(features, labels, shuffle=shuffle, **dataset_args)
+        for _ in range(2):
+            batches = list(dataset.as_numpy_iterator())
+            assert [len(batch_features) for batch_features, _, _ in batches] == expected_shapes
+            assert all(
+                batch_features.shape == (len(batch_labels), features.shape[1])
+                and batch_labels.shape == (len(batch_labels), 1)
+                and batch_weights.shape == (len(batch_labels),)
+                for batch_features, batch_labels, batch_weights in batches
+            )
+
+            scaled = np.concatenate([batch[0] for batch in batches])
+            rows = np.rint(scaled[:, 0] * scale[0] + mean[0]).astype(int)
+            assert sorted(rows) == list(range(n_rows))
+            assert (rows == np.arange(n_rows)).all() != shuffle
+            np.testing.assert_allclose(scaled, (features[rows] - mean) / scale, rtol=1e-5, atol=1e-5)
+            np.testing.assert_array_equal(np.concatenate([batch[1] for batch in batches])[:, 0], labels[rows])
+            np.testing.assert_allclose(
+                np.concatenate([batch[2] for batch in batches]),
+                np.where(labels[rows] == 1, class_weights[1], class_weights[0]),
+            )
+
+
+def test_scaled_learning_rate_keeps_base_batch_unchanged():
+    assert scaled_learning_rate(64) == pytest.approx(1e-3)
+    assert scaled_learning_rate(1024) == pytest.approx(4e-3)
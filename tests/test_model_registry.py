@@ -0,0 +1,137 @@
+"""
+Tests for the hot-reloadable model registry.
+
+Run from project root:
+    python -m pytest tests/test_model_registry.py
+"""
+
+import json
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from kickstarter_runtime import RUNTIME_BUNDLE_FILENAME, save_runtime_bundle  # noqa: E402
+from model_registry import ModelRegistry  # noqa: E402
+
+ARTIFACTS_DIR = PROJECT_ROOT / "artifacts"
+SAMPLE_FILES = sorted((PROJECT_ROOT / "data").glob("sample_campaign_*.json"))
+
+
+@pytest.fixture(scope="module")
+def campaigns():
+    samples = []
+    for path in SAMPLE_FILES:
+        with open(path, "r", encoding="utf-8") as file:
+            samples.append(json.load(file))
+    return samples
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    directory = tmp_path / "artifacts"
+    directory.mkdir()
+    shutil.copy(ARTIFACTS_DIR / RUNTIME_BUNDLE_FILENAME, directory)
+    return directory
+
+
+def _retrain(model_dir, output_shift):
+    """Rewrite the bundle with a shifted output bias, standing in for a retrained model."""
+
+    with np.load(ARTIFACTS_DIR / RUNTIME_BUNDLE_FILENAME) as bundle:
+        layers = [
+            (bundle[f"kernel_{index}"], bundle[f"bias_{index}"], str(activation))
+            for index, activation in enumerate(bundle["activations"])
+        ]
+        kernel, bias, activation = layers[-1]
+        layers[-1] = (kernel, bias + output_shift, activation)
+        save_runtime_bundle(
+            model_dir / RUNTIME_BUNDLE_FILENAME,
+            layers,
+            bundle["scaler_mean"],
+            bundle["scaler_scale"],
+            bundle["feature_columns"].tolist(),
+        )
+
+
+def test_reload_swaps_in_new_version_and_keeps_old_resident(model_dir, campaigns):
+    registry = ModelRegistry(model_dir, max_versions=2)
+    old_version = registry.active_version
+    old_runtime = registry.get()
+    before, _ = old_runtime.predict_probabilities(campaigns)
+
+    _retrain(model_dir, 2.0)
+    assert registry.refresh() is True
+
+    new_version = registry.active_version
+    assert new_version != old_version
+    after, _ = registry.get().predict_probabilities(campaigns)
+    assert (after > before).all()
+    # Requests holding the previous runtime keep working, and it stays addressable for A/B scoring.
+    np.testing.assert_array_equal(old_runtime.predict_probabilities(campaigns)[0], before)
+    assert registry.get(old_version) is old_runtime
+    assert [entry["active"] for entry in registry.versions()] == [False, True]
+
+
+def test_unchanged_artifacts_do_not_reload(model_dir):
+    registry = ModelRegistry(model_dir)
+    runtime = registry.get()
+
+    assert registry.refresh() is False
+    assert registry.get() is runtime
+
+
+def test_oldest_inactive_version_is_evicted(model_dir):
+    registry = ModelRegistry(model_dir, max_versions=2)
+    first = registry.active_version
+    _retrain(model_dir, 1.0)
+    registry.refresh()
+    registry.activate(first)
+    _retrain(model_dir, 2.0)
+    registry.load(model_dir, activate=False)
+
+    versions = [entry["version"] for entry in registry.versions()]
+    assert len(versions) == 2
+    assert first in versions and registry.active_version == first
+    with pytest.raises(LookupError):
+        registry.get("not-a-version")
+
+
+def test_refresh_keeps_manually_activated_version(model_dir):
+    registry = ModelRegistry(model_dir, max_versions=2)
+    first = registry.active_version
+    _retrain(model_dir, 1.0)
+    registry.refresh()
+
+    registry.activate(first)
+    assert registry.refresh() is False
+    assert registry.active_version == first
+
+
+def test_watcher_reloads_and_survives_broken_artifacts(model_dir, campaigns):
+    registry = ModelRegistry(model_dir)
+    original = registry.active_version
+    registry.start_watching(interval=0.05)
+    try:
+        (model_dir / RUNTIME_BUNDLE_FILENAME).write_bytes(b"not a bundle")
+        deadline = time.monotonic() + 5
+        while registry.last_error is None and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert registry.last_error is not None
+        assert registry.active_version == original
+        registry.get().predict_probabilities(campaigns)
+
+        _retrain(model_dir, 1.0)
+        deadline = time.monotonic() + 5
+        while registry.active_version == original and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert registry.active_version != original
+        assert registry.last_error is None
+    finally:
+        registry.stop_watching()
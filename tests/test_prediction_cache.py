@@ -0,0 +1,153 @@
+"""
+Tests for the content-addressed prediction cache.
+
+Run from project root:
+    python -m pytest tests/test_prediction_cache.py
+"""
+
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from kickstarter_runtime import RUNTIME_BUNDLE_FILENAME, artifact_version, load_runtime  # noqa: E402
+from prediction_cache import PredictionCache, campaign_key  # noqa: E402
+
+ARTIFACTS_DIR = PROJECT_ROOT / "artifacts"
+SAMPLE_FILES = sorted((PROJECT_ROOT / "data").glob("sample_campaign_*.json"))
+
+
+@pytest.fixture(scope="module")
+def runtime():
+    return load_runtime(ARTIFACTS_DIR, allow_keras_fallback=False)
+
+
+@pytest.fixture(scope="module")
+def campaigns():
+    samples = []
+    for path in SAMPLE_FILES:
+        with open(path, "r", encoding="utf-8") as file:
+            samples.append(json.load(file))
+    return samples
+
+
+class CountingPredictor:
+    """Wraps a runtime and records every batch it is asked to score."""
+
+    def __init__(self, runtime):
+        self.runtime = runtime
+        self.batches = []
+
+    def __call__(self, campaigns):
+        self.batches.append(len(campaigns))
+        return self.runtime.predict_probabilities(campaigns)
+
+
+def test_repeated_campaigns_are_served_from_cache(runtime, campaigns):
+    predictor = CountingPredictor(runtime)
+    cache = PredictionCache(max_entries=100)
+    broken = dict(campaigns[0], goal="n/a")
+    expected, expected_errors = runtime.predict_probabilities(campaigns + [broken])
+
+    first = cache.predict(campaigns + [broken], predictor, "v1")
+    second = cache.predict(campaigns + [broken], predictor, "v1")
+
+    for probabilities, errors in (first, second):
+        np.testing.assert_array_equal(probabilities, expected)
+        assert errors == expected_errors
+    assert predictor.batches == [len(campaigns) + 1]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (len(campaigns) + 1, len(campaigns) + 1)
+
+
+def test_duplicates_in_one_call_are_scored_once(runtime, campaigns):
+    predictor = CountingPredictor(runtime)
+    cache = PredictionCache(max_entries=100)
+
+    probabilities, _ = cache.predict([campaigns[0], campaigns[1], campaigns[0]], predictor, "v1")
+
+    assert predictor.batches == [2]
+    assert probabilities[0] == probabilities[2]
+
+
+def test_key_ignores_numeric_type_and_key_order(campaigns):
+    campaign = campaigns[0]
+    reordered = dict(reversed(list(campaign.items())))
+    as_floats = {name: float(value) if isinstance(value, int) else value for name, value in campaign.items()}
+    as_numpy = {name: np.int64(value) if isinstance(value, int) else value for name, value in campaign.items()}
+
+    key = campaign_key(campaign, "v1")
+    assert campaign_key(reordered, "v1") == key
+    assert campaign_key(as_floats, "v1") == key
+    assert campaign_key(as_numpy, "v1") == key
+    assert campaign_key(dict(campaign, goal=campaign["goal"] + 1), "v1") != key
+    assert campaign_key(campaign, "v2") != key
+
+
+def test_new_model_version_misses(runtime, campaigns):
+    predictor = CountingPredictor(runtime)
+    cache = PredictionCache(max_entries=100)
+
+    cache.predict(campaigns, predictor, "v1")
+    cache.predict(campaigns, predictor, "v2")
+
+    assert predictor.batches == [len(campaigns), len(campaigns)]
+
+
+def test_least_recently_used_entries_are_evicted(runtime, campaigns):
+    predictor = CountingPredictor(runtime)
+    cache = PredictionCache(max_entries=2)
+    first, second, third = campaigns[:3]
+
+    cache.predict([first], predictor, "v1")
+    cache.predict([second], predictor, "v1")
+    cache.predict([first], predictor, "v1")  # Refreshes ``first``.
+    cache.predict([third], predictor, "v1")  # Evicts ``second``.
+    cache.predict([first], predictor, "v1")
+    cache.predict([second], predictor, "v1")
+
+    assert predictor.batches == [1, 1, 1, 1]
+    assert cache.stats()["evictions"] == 2
+
+
+def test_expired_entries_are_rescored(runtime, campaigns):
+    predictor = CountingPredictor(runtime)
+    cache = PredictionCache(max_entries=100, ttl=0)
+
+    cache.predict(campaigns[:1], predictor, "v1")
+    cache.predict(campaigns[:1], predictor, "v1")
+
+    assert predictor.batches == [1, 1]
+
+
+def test_large_batches_bypass_cache(runtime, campaigns):
+    predictor = CountingPredictor(runtime)
+    cache = PredictionCache(max_entries=100, max_batch_rows=2)
+
+    cache.predict(campaigns[:3], predictor, "v1")
+    cache.predict(campaigns[:3], predictor, "v1")
+
+    assert predictor.batches == [3, 3]
+    assert cache.stats()["size"] == 0
+    assert cache.stats()["bypassed_rows"] == 6
+
+
+def test_artifact_version_follows_contents(tmp_path):
+    shutil.copy(ARTIFACTS_DIR / RUNTIME_BUNDLE_FILENAME, tmp_path)
+    before = artifact_version(tmp_path)
+    assert load_runtime(tmp_path).version == before
+
+    # Touching the file keeps the version; rewriting its contents changes it.
+    bundle = tmp_path / RUNTIME_BUNDLE_FILENAME
+    stat = bundle.stat()
+    os.utime(bundle, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert artifact_version(tmp_path) == before
+    bundle.write_bytes(bundle.read_bytes() + b"\0")
+    assert artifact_version(tmp_path) != before
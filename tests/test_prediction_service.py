@@ -0,0 +1,128 @@
+"""
+Tests for the persistent prediction daemon and its client.
+
+Run from project root:
+    python -m pytest tests/test_prediction_service.py
+"""
+
+import errno
+import json
+import socket
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from kickstarter_runtime import load_runtime  # noqa: E402
+from prediction_service import PredictionClient, create_server, parse_address  # noqa: E402
+
+ARTIFACTS_DIR = PROJECT_ROOT / "artifacts"
+SAMPLE_FILES = sorted((PROJECT_ROOT / "data").glob("sample_campaign_*.json"))
+
+
+@pytest.fixture(scope="module")
+def runtime():
+    return load_runtime(ARTIFACTS_DIR, allow_keras_fallback=False)
+
+
+@pytest.fixture(scope="module")
+def campaigns():
+    samples = []
+    for path in SAMPLE_FILES:
+        with open(path, "r", encoding="utf-8") as file:
+            samples.append(json.load(file))
+    return samples
+
+
+@pytest.fixture(params=["tcp", "unix"])
+def server_address(request, runtime, tmp_path):
+    if request.param == "unix" and not hasattr(__import__("socketserver"), "ThreadingUnixStreamServer"):
+        pytest.skip("Unix sockets are not available on this platform")
+
+    address = "127.0.0.1:0" if request.param == "tcp" else str(tmp_path / "predict.sock")
+    server = create_server(parse_address(address), runtime)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    bound = server.server_address
+    yield f"{bound[0]}:{bound[1]}" if isinstance(bound, tuple) else bound
+    server.shutdown()
+    server.server_close()
+
+
+def test_parse_address():
+    assert parse_address("127.0.0.1:8765") == ("127.0.0.1", 8765)
+    assert parse_address("8765") == ("127.0.0.1", 8765)
+    assert parse_address("/tmp/kickstarter.sock") == "/tmp/kickstarter.sock"
+
+
+def test_client_matches_local_runtime(server_address, runtime, campaigns):
+    broken = dict(campaigns[0], goal="n/a")
+    expected, expected_errors = runtime.predict_probabilities(campaigns + [broken])
+
+    with PredictionClient(server_address) as client:
+        assert client.ping()
+        probabilities, errors = client.predict_probabilities(campaigns + [broken])
+        # The same connection keeps serving follow-up requests.
+        single = client.predict_probability(campaigns[1])
+
+    assert errors == expected_errors
+    # Cached rows may have been scored in a different batch; float32 rounding differs slightly.
+    np.testing.assert_allclose(probabilities, expected, atol=1e-5)
+    assert single == pytest.approx(expected[1], abs=1e-5)
+
+
+def test_bad_request_reports_error_and_keeps_connection(server_address, campaigns):
+    with PredictionClient(server_address) as client:
+        with pytest.raises(RuntimeError, match="campaign"):
+            client.request({"unexpected": True})
+        assert client.ping()
+
+
+def test_repeated_requests_hit_the_cache(server_address, campaigns):
+    with PredictionClient(server_address) as client:
+        before = client.cache_stats()
+        first = client.predict_probability(campaigns[0])
+        second = client.predict_probability(campaigns[0])
+        after = client.cache_stats()
+
+    assert first == second
+    assert after["hits"] >= before["hits"] + 1
+
+
+def test_requests_can_pin_a_resident_model_version(server_address, runtime, campaigns):
+    with PredictionClient(server_address) as client:
+        [model] = client.models()
+        pinned = client.request({"campaign": campaigns[0], "model_version": model["version"]})
+        with pytest.raises(RuntimeError, match="not loaded"):
+            client.request({"campaign": campaigns[0], "model_version": "missing"})
+
+    assert model["active"] is True
+    assert pinned["errors"] == [None]
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="requires Unix sockets")
+def test_unix_socket_path_is_only_replaced_when_stale(runtime, tmp_path):
+    regular_file = tmp_path / "notes.txt"
+    regular_file.write_text("keep me", encoding="utf-8")
+    with pytest.raises(OSError, match="not a socket") as excinfo:
+        create_server(str(regular_file), runtime)
+    assert excinfo.value.errno == errno.EADDRINUSE
+    assert regular_file.read_text(encoding="utf-8") == "keep me"
+
+    socket_path = tmp_path / "predict.sock"
+    running = create_server(str(socket_path), runtime)
+    try:
+        with pytest.raises(OSError, match="already listening"):
+            create_server(str(socket_path), runtime)
+    finally:
+        running.server_close()
+
+    # The closed server left its socket file behind; nothing answers on it any more.
+    assert socket_path.exists()
+    replacement = create_server(str(socket_path), runtime)
+    replacement.server_close()
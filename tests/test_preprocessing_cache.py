@@ -0,0 +1,80 @@
+"""
+Tests for the content-addressed preprocessing cache.
+
+Run from project root:
+    python -m pytest tests/test_preprocessing_cache.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+sys.path.insert(0, str(PROJECT_ROOT / "benchmarks"))
+
+from model_pipeline import load_training_data, preprocess_features  # noqa: E402
+from preprocessing_cache import PREPROCESSING_VERSION, cache_key, load_or_build  # noqa: E402
+from synthetic import synthetic_campaigns  # noqa: E402
+
+
+@pytest.fixture
+def campaigns_csv(tmp_path):
+    frame = synthetic_campaigns(400, seed=5)
+    frame["state"] = np.where(frame["pledged"] >= frame["goal"], "successful", "failed")
+    path = tmp_path / "campaigns.csv"
+    frame.to_csv(path, index=False)
+    return path
+
+
+class CountingBuilder:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, csv_path):
+        self.calls += 1
+        return load_training_data(csv_path)
+
+
+def test_second_load_hits_the_cache(campaigns_csv, tmp_path):
+    build = CountingBuilder()
+    cache_dir = tmp_path / "cache"
+
+    first = load_or_build(campaigns_csv, build, cache_dir=cache_dir)
+    second = load_or_build(campaigns_csv, build, cache_dir=cache_dir)
+
+    assert build.calls == 1
+    assert (first[3], second[3]) == (False, True)
+    assert isinstance(second[0], np.memmap)
+    np.testing.assert_array_equal(first[0], second[0])
+    np.testing.assert_array_equal(first[1], second[1])
+    assert first[2] == second[2]
+
+
+def test_cached_features_match_preprocess_features(campaigns_csv, tmp_path):
+    load_or_build(campaigns_csv, load_training_data, cache_dir=tmp_path)
+    features, labels, feature_columns, hit = load_or_build(campaigns_csv, load_training_data, cache_dir=tmp_path)
+
+    expected, expected_labels, expected_columns = preprocess_features(pd.read_csv(campaigns_csv))
+    assert hit
+    assert feature_columns == expected_columns
+    np.testing.assert_allclose(features, expected.to_numpy(dtype=np.float64), rtol=1e-6)
+    np.testing.assert_array_equal(labels, expected_labels.to_numpy())
+
+
+def test_key_changes_with_contents_and_version(campaigns_csv, tmp_path):
+    build = CountingBuilder()
+    load_or_build(campaigns_csv, build, cache_dir=tmp_path)
+    load_or_build(campaigns_csv, build, cache_dir=tmp_path, version=PREPROCESSING_VERSION + 1)
+    assert build.calls == 2
+
+    original_key = cache_key(campaigns_csv)
+    frame = pd.read_csv(campaigns_csv)
+    frame.loc[0, "goal"] += 1
+    frame.to_csv(campaigns_csv, index=False)
+    assert cache_key(campaigns_csv) != original_key
+    load_or_build(campaigns_csv, build, cache_dir=tmp_path)
+    assert build.calls == 3
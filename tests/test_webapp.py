@@ -0,0 +1,201 @@
+"""
+Tests for the Flask web app routes.
+
+Run from project root:
+    python -m pytest tests/test_webapp.py
+"""
+
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "webapp"))
+
+SAMPLE_FILES = sorted((PROJECT_ROOT / "data").glob("sample_campaign_*.json"))
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    # Keep the job database and result files out of the source tree.
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("JOB_DIR", str(tmp_path_factory.mktemp("jobs")))
+        import app as webapp
+
+    webapp.app.config["TESTING"] = True
+    return webapp.app.test_client()
+
+
+@pytest.fixture(scope="module")
+def campaigns():
+    samples = []
+    for path in SAMPLE_FILES:
+        with open(path, "r", encoding="utf-8") as file:
+            samples.append(json.load(file))
+    return samples
+
+
+def _ndjson(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_upload_scores_every_row(client, campaigns):
+    payload = json.dumps(campaigns + [dict(campaigns[0], goal="n/a")]).encode()
+    response = client.post("/upload", data={"file": (io.BytesIO(payload), "campaigns.json")})
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body["total_campaigns"] == len(campaigns) + 1
+    assert all("probability" in result for result in body["results"][:-1])
+    assert "goal" in body["results"][-1]["error"]
+
+
+def test_api_predict_streams_json_array(client, campaigns):
+    response = client.post("/api/predict?chunk_size=2", json=campaigns * 3)
+
+    results = _ndjson(response)
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert [result["row"] for result in results] == list(range(1, len(campaigns) * 3 + 1))
+    assert all(0 <= result["probability"] <= 100 for result in results)
+
+
+def test_api_predict_accepts_ndjson_with_bad_lines(client, campaigns):
+    body = "\n".join([json.dumps(campaigns[0]), "{not json", json.dumps([1, 2]), json.dumps(campaigns[1])])
+    response = client.post("/api/predict", data=body, content_type="application/x-ndjson")
+
+    results = _ndjson(response)
+    assert [result["row"] for result in results] == [1, 2, 3, 4]
+    assert "probability" in results[0] and "probability" in results[3]
+    assert "Invalid JSON" in results[1]["error"]
+    assert "JSON object" in results[2]["error"]
+
+
+def test_api_predict_rejects_non_array_payload(client):
+    response = client.post("/api/predict", data="42", content_type="application/json")
+    assert response.status_code == 400
+
+
+def _wait_for_job(client, status_url, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(status_url).get_json()
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError("job did not finish")
+
+
+def test_upload_job_returns_immediately_and_serves_results(client, campaigns):
+    payload = json.dumps(campaigns * 5).encode()
+    response = client.post("/jobs", data={"file": (io.BytesIO(payload), "campaigns.json")})
+
+    assert response.status_code == 202
+    job = response.get_json()
+    assert response.headers["Location"].endswith(job["status_url"])
+
+    status = _wait_for_job(client, job["status_url"])
+    assert status["status"] == "done"
+    assert status["processed_rows"] == len(campaigns) * 5
+
+    result = client.get(job["result_url"])
+    body = result.get_json()
+    assert result.status_code == 200
+    assert body["total_campaigns"] == len(campaigns) * 5
+    assert [row["row"] for row in body["results"]] == list(range(1, len(campaigns) * 5 + 1))
+
+
+def test_upload_job_with_missing_columns_fails(client, campaigns):
+    payload = json.dumps([{"name": "no features"}]).encode()
+    job = client.post("/jobs", data={"file": (io.BytesIO(payload), "campaigns.json")}).get_json()
+
+    status = _wait_for_job(client, job["status_url"])
+    result = client.get(job["result_url"])
+
+    assert status["status"] == "failed"
+    assert result.status_code == 422
+    assert "Missing required columns" in result.get_json()["error"]
+
+
+def test_unknown_job_is_404(client):
+    assert client.get("/jobs/does-not-exist").status_code == 404
+    assert client.get("/jobs/does-not-exist/result").status_code == 404
+
+
+@pytest.mark.skipif(not Path("/proc/self/smaps_rollup").exists(), reason="requires Linux /proc")
+def test_memory_report_describes_this_process(client, monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    assert client.get("/api/memory").status_code == 403
+
+    report = client.get("/api/memory", headers=ADMIN_HEADERS).get_json()
+
+    assert report["available"] is True
+    assert report["master"] is None
+    [worker] = report["workers"]
+    assert worker["pid"] == report["pid"]
+    assert worker["rss_kb"] >= worker["shared_kb"] > 0
+    assert 0 < worker["shared_fraction"] <= 1
+
+
+ADMIN_HEADERS = {"X-Admin-Token": "secret"}
+
+
+def test_admin_endpoints_fail_closed(client, monkeypatch):
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    assert client.get("/admin/models").status_code == 403
+    assert client.get("/admin/models", headers=ADMIN_HEADERS).status_code == 403
+
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    assert client.post("/admin/reload", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert client.get("/admin/models", headers=ADMIN_HEADERS).status_code == 200
+
+
+def test_cache_stats_require_admin_token(client, campaigns, monkeypatch):
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    assert client.get("/api/cache_stats", headers=ADMIN_HEADERS).status_code == 403
+
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    assert client.get("/api/cache_stats").status_code == 403
+    client.post("/api/predict", json=campaigns)
+    stats = client.get("/api/cache_stats", headers=ADMIN_HEADERS).get_json()
+    assert stats["hits"] + stats["misses"] >= len(campaigns)
+
+
+def test_admin_reload_keeps_serving_and_lists_versions(client, campaigns, monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    reloaded = client.post("/admin/reload", headers=ADMIN_HEADERS).get_json()
+    models = client.get("/admin/models", headers=ADMIN_HEADERS).get_json()
+
+    assert reloaded["version"] == reloaded["active_version"] == models["active_version"]
+    assert [entry["version"] for entry in models["models"] if entry["active"]] == [reloaded["version"]]
+    pinned = client.post(f"/api/predict?model_version={reloaded['version']}", json=campaigns)
+    assert all("probability" in result for result in _ndjson(pinned))
+
+
+def test_unknown_model_version_is_rejected(client, campaigns, monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    response = client.post("/api/predict?model_version=missing", json=campaigns)
+    assert response.status_code == 400
+    assert "missing" in response.get_json()["error"]
+    assert client.post("/admin/activate", json={"version": "missing"}, headers=ADMIN_HEADERS).status_code == 404
+
+
+def test_metrics_endpoint_exposes_stages_and_requests(client, campaigns):
+    payload = json.dumps(campaigns).encode()
+    client.post("/upload", data={"file": (io.BytesIO(payload), "campaigns.json")})
+    client.get("/jobs/does-not-exist")
+
+    response = client.get("/metrics")
+    text = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert 'kickstarter_stage_seconds_count{stage="read_upload"}' in text
+    assert 'kickstarter_stage_seconds_bucket{stage="encode",le="+Inf"}' in text
+    assert 'kickstarter_http_requests_total{endpoint="/jobs/<job_id>",method="GET",status="404"}' in text
+    assert "kickstarter_uploads_in_flight 0" in text
+    assert 'kickstarter_model_info{version="' in text
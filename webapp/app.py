@@ -11,12 +11,15 @@ Features:
 - Clean, modern UI
 """
 
+import hmac
 import json
 import os
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 import pandas as pd
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, g, render_template, request, jsonify, send_file, stream_with_context, url_for
 from werkzeug.utils import secure_filename
 import sys
 
@@ -24,26 +27,157 @@ import sys
 parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir / "src"))
 
-from model_pipeline import load_artifacts, predict_success_probability
+from instrumentation import get_metrics, stage
+from jobs import JobQueue, QueueFullError
+from memory_report import memory_report
+from micro_batcher import MicroBatcher
+from model_registry import ModelRegistry
+from prediction_cache import get_prediction_cache
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = Path(__file__).parent / 'uploads'
+app.config['JOB_FOLDER'] = Path(os.environ.get('JOB_DIR', app.config['UPLOAD_FOLDER'] / 'jobs'))
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['ALLOWED_EXTENSIONS'] = {'xlsx', 'xls', 'csv', 'json'}
 
 # Create upload folder if it doesn't exist
 app.config['UPLOAD_FOLDER'].mkdir(exist_ok=True)
 
-# Load model artifacts once at startup
+# Load the TensorFlow-free prediction runtime once at startup. Under gunicorn with
+# preload_app (see gunicorn.conf.py) this runs once in the master and the forked
+# workers share the loaded weights. The registry hot-reloads the model when the
+# artifacts change and keeps MODEL_VERSIONS versions resident for A/B requests.
 MODEL_DIR = parent_dir / "artifacts"
 print(f"Loading model from: {MODEL_DIR}")
-model, scaler, feature_columns = load_artifacts(MODEL_DIR)
-print(f"Model loaded successfully!")
+registry = ModelRegistry(MODEL_DIR, max_versions=int(os.environ.get('MODEL_VERSIONS', 2)))
+if float(os.environ.get('MODEL_WATCH_INTERVAL', 5)) > 0:
+    registry.start_watching(float(os.environ.get('MODEL_WATCH_INTERVAL', 5)))
+print(f"Model {registry.active_version} loaded successfully!")
+
+# Coalesce campaigns from concurrent requests into batched forward passes, one model version per batch
+batcher = MicroBatcher(
+    max_batch_size=int(os.environ.get('BATCH_MAX_SIZE', 256)),
+    max_wait=float(os.environ.get('BATCH_MAX_WAIT_MS', 5)) / 1000
+)
+
+# Repeated campaigns are answered from the shared prediction cache without queueing
+prediction_cache = get_prediction_cache()
+
+# Stage latencies, request counters and gauges served at /metrics (per worker process)
+metrics = get_metrics()
+metrics.describe('kickstarter_http_requests_total', 'HTTP requests by endpoint, method and status.')
+metrics.describe('kickstarter_http_request_seconds', 'Time to produce an HTTP response, by endpoint.')
+metrics.describe('kickstarter_uploads_in_flight', 'Uploads and background jobs currently being scored.')
+metrics.describe('kickstarter_model_info', 'Active model version (always 1).')
+
+def score_campaigns(campaigns, model_version=None):
+    """Score campaigns through the prediction cache, batching misses with other requests
+
+    ``model_version`` pins a resident model version (A/B scoring); unknown
+    versions raise ``LookupError``. The runtime is looked up once, so the
+    model that scores the misses is the one whose version keys the cache.
+    """
+    model = registry.get(model_version)
+    return prediction_cache.predict(
+        campaigns, lambda rows: batcher.submit(rows, model.predict_probabilities), model.version
+    )
+
+REQUIRED_COLUMNS = ['goal', 'pledged', 'backers', 'usd pledged', 'category',
+                    'main_category', 'currency', 'country', 'deadline', 'launched']
+
+# Rows scored between two progress updates of a background job
+JOB_CHUNK_SIZE = 1000
+
+class InvalidUploadError(ValueError):
+    """Uploaded file could be read but does not describe campaigns"""
+
+    def __init__(self, message, required=None):
+        super().__init__(message)
+        self.required = required
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
+def read_campaign_file(file, filename):
+    """Read an uploaded Excel, CSV or JSON file and check it has the required columns"""
+    with stage('read_upload') as timer:
+        if filename.endswith('.csv'):
+            df = pd.read_csv(file)
+        elif filename.endswith('.json'):
+            # Read JSON content and handle both list and dict formats
+            json_content = json.load(file)
+            if isinstance(json_content, list):
+                df = pd.DataFrame(json_content)
+            elif isinstance(json_content, dict):
+                # If it's a dict with list values, use it directly
+                # If it's a dict with scalar values, wrap in a list
+                if all(isinstance(v, (list, tuple)) for v in json_content.values()):
+                    df = pd.DataFrame(json_content)
+                else:
+                    df = pd.DataFrame([json_content])
+            else:
+                raise InvalidUploadError('Invalid JSON format. Expected a list of objects or a dictionary')
+        else:
+            df = pd.read_excel(file)
+        timer.rows = len(df)
+
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing_columns:
+        raise InvalidUploadError(
+            f'Missing required columns: {", ".join(missing_columns)}',
+            required=REQUIRED_COLUMNS
+        )
+    return df
+
+@contextmanager
+def upload_in_flight():
+    """Count an upload or background job in the in-flight gauge while it is scored"""
+    metrics.add_gauge('kickstarter_uploads_in_flight', 1)
+    try:
+        yield
+    finally:
+        metrics.add_gauge('kickstarter_uploads_in_flight', -1)
+
+def format_result(row, campaign_data, probability, error):
+    """Build the per-campaign result entry returned to clients"""
+    name = campaign_data.get('name', f'Campaign {row}')
+    if error is not None:
+        return {'row': row, 'campaign': name, 'error': error}
+
+    probability = float(probability)
+    verdict = "Likely Success" if probability >= 0.5 else "Needs Improvement"
+    confidence = "High" if (probability >= 0.7 or probability <= 0.3) else "Medium"
+    goal = campaign_data.get('goal')
+
+    return {
+        'row': row,
+        'campaign': name,
+        'goal': float(goal) if pd.notna(goal) else 0,
+        'category': str(campaign_data.get('category', '')),
+        'country': str(campaign_data.get('country', '')),
+        'probability': round(probability * 100, 2),
+        'verdict': verdict,
+        'confidence': confidence
+    }
+
+@app.before_request
+def start_request_timer():
+    """Remember when the request started for the request latency histogram"""
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count the request and observe its latency, labelled by route rule rather than URL"""
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    metrics.increment('kickstarter_http_requests_total', labels={
+        'endpoint': endpoint, 'method': request.method, 'status': response.status_code
+    })
+    if 'request_start' in g:
+        metrics.observe('kickstarter_http_request_seconds', time.perf_counter() - g.request_start,
+                        labels={'endpoint': endpoint})
+    return response
+
 @app.route('/')
 def index():
     """Main page with file upload interface"""
@@ -64,69 +198,17 @@ def upload_file():
         return jsonify({'error': 'Invalid file type. Please upload Excel (.xlsx, .xls), CSV, or JSON files'}), 400
     
     try:
-        # Read the uploaded file
-        if file.filename.endswith('.csv'):
-            df = pd.read_csv(file)
-        elif file.filename.endswith('.json'):
-            # Read JSON content and handle both list and dict formats
-            json_content = json.load(file)
-            if isinstance(json_content, list):
-                df = pd.DataFrame(json_content)
-            elif isinstance(json_content, dict):
-                # If it's a dict with list values, use it directly
-                # If it's a dict with scalar values, wrap in a list
-                if all(isinstance(v, (list, tuple)) for v in json_content.values()):
-                    df = pd.DataFrame(json_content)
-                else:
-                    df = pd.DataFrame([json_content])
-            else:
-                return jsonify({'error': 'Invalid JSON format. Expected a list of objects or a dictionary'}), 400
-        else:
-            df = pd.read_excel(file)
-        
-        # Validate required columns
-        required_columns = ['goal', 'pledged', 'backers', 'usd pledged', 'category', 
-                          'main_category', 'currency', 'country', 'deadline', 'launched']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        
-        if missing_columns:
-            return jsonify({
-                'error': f'Missing required columns: {", ".join(missing_columns)}',
-                'required': required_columns
-            }), 400
-        
-        # Process each campaign
-        results = []
-        for idx, row in df.iterrows():
-            campaign_data = row.to_dict()
-            
-            try:
-                probability = predict_success_probability(
-                    campaign_data, 
-                    model=model, 
-                    scaler=scaler, 
-                    feature_columns=feature_columns
-                )
-                
-                verdict = "Likely Success" if probability >= 0.5 else "Needs Improvement"
-                confidence = "High" if (probability >= 0.7 or probability <= 0.3) else "Medium"
-                
-                results.append({
-                    'row': idx + 1,
-                    'campaign': campaign_data.get('name', f'Campaign {idx + 1}'),
-                    'goal': float(campaign_data['goal']) if pd.notna(campaign_data['goal']) else 0,
-                    'category': str(campaign_data['category']),
-                    'country': str(campaign_data['country']),
-                    'probability': round(float(probability) * 100, 2),
-                    'verdict': verdict,
-                    'confidence': confidence
-                })
-            except Exception as e:
-                results.append({
-                    'row': idx + 1,
-                    'campaign': campaign_data.get('name', f'Campaign {idx + 1}'),
-                    'error': str(e)
-                })
+        with upload_in_flight():
+            df = read_campaign_file(file, file.filename)
+
+            # Score every campaign in a single batched pass, shared with concurrent requests
+            campaigns = df.to_dict(orient='records')
+            probabilities, errors = score_campaigns(campaigns, request.args.get('model_version'))
+
+        results = [
+            format_result(idx + 1, campaign_data, probabilities[idx], errors[idx])
+            for idx, campaign_data in enumerate(campaigns)
+        ]
         
         return jsonify({
             'success': True,
@@ -134,9 +216,175 @@ def upload_file():
             'results': results
         })
     
+    except InvalidUploadError as e:
+        body = {'error': str(e)}
+        if e.required:
+            body['required'] = e.required
+        return jsonify(body), 400
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'Error processing file: {str(e)}'}), 500
 
+def score_upload(path, progress):
+    """Score a stored upload in chunks for a background job, reporting progress"""
+    with upload_in_flight():
+        with open(path, 'rb') as file:
+            df = read_campaign_file(file, path.name)
+        campaigns = df.to_dict(orient='records')
+        progress(0, len(campaigns))
+
+        results = []
+        for start in range(0, len(campaigns), JOB_CHUNK_SIZE):
+            chunk = campaigns[start:start + JOB_CHUNK_SIZE]
+            probabilities, errors = score_campaigns(chunk)
+            results.extend(
+                format_result(start + idx + 1, campaign_data, probabilities[idx], errors[idx])
+                for idx, campaign_data in enumerate(chunk)
+            )
+            progress(len(results), len(campaigns))
+
+    return {
+        'success': True,
+        'total_campaigns': len(campaigns),
+        'results': results
+    }
+
+# Large uploads are scored on a bounded background pool; requests only enqueue them
+job_queue = JobQueue(
+    app.config['JOB_FOLDER'],
+    score_upload,
+    max_workers=int(os.environ.get('JOB_WORKERS', 2)),
+    max_pending=int(os.environ.get('JOB_MAX_PENDING', 16)),
+    retention_seconds=float(os.environ.get('JOB_RETENTION_HOURS', 24)) * 3600
+)
+
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    """Queue an uploaded file for background scoring and return its job ID"""
+    if 'file' not in request.files:
+        return jsonify({'error': 'No file uploaded'}), 400
+    
+    file = request.files['file']
+    
+    if file.filename == '':
+        return jsonify({'error': 'No file selected'}), 400
+    
+    if not allowed_file(file.filename):
+        return jsonify({'error': 'Invalid file type. Please upload Excel (.xlsx, .xls), CSV, or JSON files'}), 400
+
+    filename = secure_filename(file.filename) or 'upload.' + file.filename.rsplit('.', 1)[1].lower()
+    try:
+        job_id = job_queue.submit(filename, file.save)
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
+
+    status_url = url_for('job_status', job_id=job_id)
+    return jsonify({
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': status_url,
+        'result_url': url_for('job_result', job_id=job_id)
+    }), 202, {'Location': status_url}
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Report the status and progress of a background job"""
+    job = job_queue.status(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    """Return the results of a finished job (same shape as /upload)"""
+    job = job_queue.status(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    if job['status'] == 'failed':
+        return jsonify({'error': f"Error processing file: {job['error']}", 'status': 'failed'}), 422
+    if job['status'] != 'done':
+        return jsonify({'error': 'Job is not finished yet', 'status': job['status']}), 409
+    return send_file(job_queue.result_path(job_id), mimetype='application/json')
+
+def _iter_ndjson_campaigns(stream):
+    """Yield (campaign, error) pairs from an NDJSON body without reading it all at once"""
+    for line in iter(stream.readline, b''):
+        if not line.strip():
+            continue
+        try:
+            campaign = json.loads(line)
+        except ValueError as e:
+            yield None, f'Invalid JSON line: {e}'
+            continue
+        if isinstance(campaign, dict):
+            yield campaign, None
+        else:
+            yield None, 'Each line must be a JSON object describing one campaign'
+
+def _score_chunk(chunk, model_version=None):
+    """Score a list of (row, campaign, parse_error) entries and yield NDJSON lines"""
+    valid = [campaign for _, campaign, parse_error in chunk if parse_error is None]
+    scored = iter(zip(*score_campaigns(valid, model_version))) if valid else iter(())
+    for row, campaign, parse_error in chunk:
+        if parse_error is None:
+            probability, error = next(scored)
+            result = format_result(row, campaign, probability, error)
+        else:
+            result = {'row': row, 'error': parse_error}
+        yield json.dumps(result, default=str) + '\n'
+
+def _score_stream(items, chunk_size, model_version=None):
+    """Score (campaign, parse_error) pairs in chunks, yielding one NDJSON line per campaign"""
+    chunk = []
+    for row, (campaign, parse_error) in enumerate(items, start=1):
+        chunk.append((row, campaign, parse_error))
+        if len(chunk) >= chunk_size:
+            yield from _score_chunk(chunk, model_version)
+            chunk = []
+    if chunk:
+        yield from _score_chunk(chunk, model_version)
+
+@app.route('/api/predict', methods=['POST'])
+def api_predict():
+    """Score a JSON array or NDJSON body and stream results back as NDJSON
+
+    Results are scored and sent in chunks of ``chunk_size`` rows (query
+    parameter, default 500), so the first lines arrive before the whole
+    payload has been scored and the server never holds the full result list.
+    """
+    chunk_size = request.args.get('chunk_size', default=500, type=int)
+    if chunk_size is None or chunk_size < 1:
+        return jsonify({'error': 'chunk_size must be a positive integer'}), 400
+    model_version = request.args.get('model_version')
+    try:
+        registry.get(model_version)
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 400
+
+    content_type = (request.content_type or '').lower()
+    if 'ndjson' in content_type or 'jsonlines' in content_type or request.args.get('format') == 'ndjson':
+        items = _iter_ndjson_campaigns(request.stream)
+    else:
+        try:
+            payload = json.loads(request.get_data())
+        except ValueError as e:
+            return jsonify({'error': f'Invalid JSON body: {e}'}), 400
+        if isinstance(payload, dict):
+            payload = [payload]
+        if not isinstance(payload, list):
+            return jsonify({'error': 'Expected a JSON array of campaign objects or NDJSON lines'}), 400
+        items = (
+            (campaign, None) if isinstance(campaign, dict)
+            else (None, 'Each item must be a JSON object describing one campaign')
+            for campaign in payload
+        )
+
+    return Response(
+        stream_with_context(_score_stream(items, chunk_size, model_version)),
+        mimetype='application/x-ndjson'
+    )
+
 @app.route('/download_results', methods=['POST'])
 def download_results():
     """Download prediction results as Excel file"""
@@ -239,10 +487,97 @@ def health():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'model_loaded': model is not None,
+        'model_loaded': registry.active_version is not None,
+        'model_version': registry.active_version,
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/api/batcher_stats')
+def batcher_stats():
+    """Queue depth and batch-size metrics of the request micro-batcher"""
+    return jsonify(batcher.stats())
+
+def _admin_allowed():
+    """Admin endpoints require an X-Admin-Token header matching ADMIN_TOKEN
+
+    They fail closed: without ADMIN_TOKEN every admin request is refused
+    (the artifact watcher still picks up new models).
+    """
+    token = os.environ.get('ADMIN_TOKEN')
+    return bool(token) and hmac.compare_digest(request.headers.get('X-Admin-Token', ''), token)
+
+@app.route('/admin/models')
+def admin_models():
+    """List the resident model versions and which one is active"""
+    if not _admin_allowed():
+        return jsonify({'error': 'Missing or invalid admin token (set ADMIN_TOKEN to enable admin endpoints)'}), 403
+    return jsonify({
+        'active_version': registry.active_version,
+        'last_error': registry.last_error,
+        'models': registry.versions()
+    })
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """Load the current artifacts, warm them up and swap them in
+
+    Requests keep being served by the previous model while the new one
+    loads. Send ``{"activate": false}`` to keep the new version resident
+    for ``model_version`` requests without making it the default.
+    """
+    if not _admin_allowed():
+        return jsonify({'error': 'Missing or invalid admin token (set ADMIN_TOKEN to enable admin endpoints)'}), 403
+    options = request.get_json(silent=True) or {}
+    try:
+        version = registry.load(MODEL_DIR, activate=bool(options.get('activate', True)))
+    except Exception as e:
+        registry.last_error = f'{type(e).__name__}: {e}'
+        return jsonify({'error': f'Reload failed: {e}', 'active_version': registry.active_version}), 500
+    return jsonify({
+        'version': version,
+        'active_version': registry.active_version,
+        'models': registry.versions()
+    })
+
+@app.route('/admin/activate', methods=['POST'])
+def admin_activate():
+    """Make a resident model version the default"""
+    if not _admin_allowed():
+        return jsonify({'error': 'Missing or invalid admin token (set ADMIN_TOKEN to enable admin endpoints)'}), 403
+    version = (request.get_json(silent=True) or {}).get('version')
+    if not version:
+        return jsonify({'error': 'Expected {"version": "<model version>"}'}), 400
+    try:
+        registry.activate(version)
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    return jsonify({'active_version': registry.active_version, 'models': registry.versions()})
+
+@app.route('/api/cache_stats')
+def cache_stats():
+    """Hit/miss counters of the prediction cache, behind the admin token"""
+    if not _admin_allowed():
+        return jsonify({'error': 'Missing or invalid admin token (set ADMIN_TOKEN to enable admin endpoints)'}), 403
+    return jsonify(prediction_cache.stats())
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Stage latencies, request counters and gauges of this worker in Prometheus text format"""
+    metrics.clear_gauge('kickstarter_model_info')
+    metrics.set_gauge('kickstarter_model_info', 1, {'version': registry.active_version})
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/memory')
+def memory_usage():
+    """Resident and shared memory of the gunicorn master and each worker
+
+    Process ids and memory layout are operator data, so this sits behind
+    the admin token like the ``/admin`` endpoints.
+    """
+    if not _admin_allowed():
+        return jsonify({'error': 'Missing or invalid admin token (set ADMIN_TOKEN to enable admin endpoints)'}), 403
+    return jsonify(memory_report())
+
 @app.route('/report')
 def academic_report():
     """Display academic report page"""
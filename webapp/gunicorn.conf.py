@@ -0,0 +1,26 @@
+"""
+Gunicorn settings for the prediction web app.
+
+``preload_app`` imports ``app`` (and loads the prediction runtime) once in
+the master; the workers are forked from it and share the model weights as
+copy-on-write pages instead of each loading a private copy. See
+``/api/memory`` for per-worker resident and shared memory.
+
+    gunicorn -c gunicorn.conf.py app:app
+"""
+
+import gc
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+# Threaded workers let the micro-batcher coalesce concurrent requests within each worker.
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") != "0"
+
+
+def pre_fork(server, worker):
+    # Move everything loaded so far out of the collector's reach; otherwise the
+    # first collection in a worker writes to every object header and un-shares
+    # the pages holding them.
+    gc.freeze()
@@ -0,0 +1,218 @@
+"""
+Background scoring jobs for large uploads.
+
+Scoring a 16 MB spreadsheet inside the request ties up a gunicorn worker for
+the whole file and can run into worker timeouts. ``JobQueue`` stores the
+upload, records a job in a local SQLite database and scores it on a small
+thread pool, so the request returns a job ID straight away. Clients poll the
+job for progress and fetch the result file once it is done.
+
+The SQLite store lives next to the uploads, so every gunicorn worker on the
+host sees the same jobs whichever worker accepted the upload. Finished jobs
+and their files are removed once they are older than the retention period.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+JOB_STATUSES = ("queued", "running", "done", "failed")
+RESULT_FILENAME = "results.json"
+
+# Receives (processed_rows, total_rows) while a job is being scored.
+ProgressFn = Callable[[int, int], None]
+ProcessFn = Callable[[Path, ProgressFn], Dict[str, object]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    total_rows INTEGER,
+    processed_rows INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+)
+"""
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the job queue already holds ``max_pending`` unfinished jobs."""
+
+
+class JobStore:
+    """Job records in a SQLite database shared by every worker process on the host."""
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def create(self, job_id: str, filename: str) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO jobs (id, status, filename, pid, created_at) VALUES (?, 'queued', ?, ?, ?)",
+                (job_id, filename, os.getpid(), time.time()),
+            )
+
+    def update(self, job_id: str, **fields: object) -> None:
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as connection:
+            connection.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id: str) -> Optional[Dict[str, object]]:
+        with self._connect() as connection:
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def finished_before(self, cutoff: float) -> List[str]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT id FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (cutoff,)
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def delete(self, job_id: str) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobQueue:
+    """Score uploaded files on a bounded pool of background threads."""
+
+    def __init__(
+        self,
+        job_dir: Path,
+        process_fn: ProcessFn,
+        *,
+        max_workers: int = 2,
+        max_pending: int = 16,
+        retention_seconds: float = 24 * 3600,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_pending < max_workers:
+            raise ValueError("max_pending must be at least max_workers")
+        self.job_dir = Path(job_dir)
+        self.process_fn = process_fn
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self.store = JobStore(self.job_dir / "jobs.sqlite3")
+
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="upload-job")
+
+    def submit(self, filename: str, save_upload: Callable[[Path], None]) -> str:
+        """Store an upload and queue it for scoring.
+
+        Args:
+            filename: Original (sanitised) file name; its extension selects the reader.
+            save_upload: Callback writing the uploaded bytes to the path it is given.
+
+        Returns:
+            The new job ID.
+
+        Raises:
+            QueueFullError: If ``max_pending`` jobs are already queued or running.
+        """
+
+        self.cleanup_expired()
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError(f"Too many jobs in progress (limit {self.max_pending}); try again shortly")
+
+        job_id = uuid.uuid4().hex
+        try:
+            input_path = self.job_dir / job_id / filename
+            input_path.parent.mkdir(parents=True)
+            save_upload(input_path)
+            self.store.create(job_id, filename)
+            self._executor.submit(self._run, job_id, input_path)
+        except BaseException:
+            self._slots.release()
+            raise
+        return job_id
+
+    def _run(self, job_id: str, input_path: Path) -> None:
+        try:
+            self.store.update(job_id, status="running", started_at=time.time())
+
+            def progress(processed: int, total: int) -> None:
+                self.store.update(job_id, processed_rows=processed, total_rows=total)
+
+            result = self.process_fn(input_path, progress)
+            result_path = self.result_path(job_id)
+            partial_path = result_path.with_suffix(".partial")
+            with open(partial_path, "w", encoding="utf-8") as file:
+                json.dump(result, file, default=str)
+            partial_path.replace(result_path)
+            input_path.unlink(missing_ok=True)
+            self.store.update(job_id, status="done", finished_at=time.time())
+        except Exception as exc:
+            self.store.update(job_id, status="failed", error=str(exc), finished_at=time.time())
+        finally:
+            self._slots.release()
+
+    def status(self, job_id: str) -> Optional[Dict[str, object]]:
+        """Return the job record with a ``progress`` fraction, or ``None`` for unknown IDs."""
+
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        if job["status"] in ("queued", "running") and not _process_alive(job["pid"]):
+            # The worker that owned the job exited (restart or timeout) before finishing it.
+            self.store.update(
+                job_id, status="failed", error="Worker stopped before the job finished", finished_at=time.time()
+            )
+            job = self.store.get(job_id)
+
+        total = job["total_rows"]
+        if job["status"] == "done":
+            job["progress"] = 1.0
+        else:
+            job["progress"] = job["processed_rows"] / total if total else 0.0
+        del job["pid"]
+        return job
+
+    def result_path(self, job_id: str) -> Path:
+        return self.job_dir / job_id / RESULT_FILENAME
+
+    def cleanup_expired(self) -> int:
+        """Delete finished jobs older than the retention period; returns how many were removed."""
+
+        expired = self.store.finished_before(time.time() - self.retention_seconds)
+        for job_id in expired:
+            shutil.rmtree(self.job_dir / job_id, ignore_errors=True)
+            self.store.delete(job_id)
+        return len(expired)
+
+    def close(self) -> None:
+        """Finish running jobs and stop the pool."""
+
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,99 @@
+"""
+Per-process memory usage of the web app, read from ``/proc``.
+
+With ``preload_app`` the gunicorn master loads the prediction runtime before
+forking, so the model weights live in copy-on-write pages that every worker
+shares. ``memory_report`` shows how much of each worker's resident set is
+shared with its siblings and how much is private to it.
+
+Only Linux exposes ``/proc/<pid>/smaps_rollup``; elsewhere the report is
+empty and ``available`` is ``False``.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROC = Path("/proc")
+
+# smaps_rollup fields summed into each reported value, in kB.
+_FIELDS = {
+    "rss_kb": ("Rss",),
+    "pss_kb": ("Pss",),
+    "shared_kb": ("Shared_Clean", "Shared_Dirty"),
+    "private_kb": ("Private_Clean", "Private_Dirty"),
+}
+
+
+def read_smaps_rollup(pid: int) -> Optional[Dict[str, int]]:
+    """Return RSS, PSS, shared and private memory of ``pid`` in kB, or ``None`` if unreadable."""
+
+    try:
+        text = (PROC / str(pid) / "smaps_rollup").read_text()
+    except OSError:
+        return None
+
+    values: Dict[str, int] = {}
+    for line in text.splitlines():
+        name, _, rest = line.partition(":")
+        parts = rest.split()
+        if parts and parts[0].isdigit():
+            values[name] = int(parts[0])
+    return {key: sum(values.get(name, 0) for name in names) for key, names in _FIELDS.items()}
+
+
+def _command_line(pid: int) -> str:
+    try:
+        return (PROC / str(pid) / "cmdline").read_bytes().replace(b"\0", b" ").decode(errors="replace").strip()
+    except OSError:
+        return ""
+
+
+def _child_pids(parent: int) -> List[int]:
+    children = []
+    for entry in PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name is wrapped in parentheses and may contain spaces.
+        fields = stat.rpartition(")")[2].split()
+        if len(fields) > 1 and int(fields[1]) == parent:
+            children.append(int(entry.name))
+    return sorted(children)
+
+
+def memory_report() -> Dict[str, object]:
+    """Describe the memory of this process, and of the gunicorn master and workers when preforked.
+
+    Returns:
+        ``available``, ``pid`` of the answering process, ``master`` (or
+        ``None`` outside gunicorn), ``workers`` and ``totals``. Each process
+        entry holds ``pid``, ``rss_kb``, ``pss_kb``, ``shared_kb``,
+        ``private_kb`` and ``shared_fraction``. ``totals.pss_kb`` is the real
+        footprint of the whole group, since shared pages are split across
+        the processes mapping them.
+    """
+
+    pid = os.getpid()
+    if read_smaps_rollup(pid) is None:
+        return {"available": False, "pid": pid, "master": None, "workers": [], "totals": {}}
+
+    parent = os.getppid()
+    under_gunicorn = "gunicorn" in _command_line(parent)
+    worker_pids = _child_pids(parent) if under_gunicorn else [pid]
+
+    def describe(process_id: int) -> Optional[Dict[str, object]]:
+        usage = read_smaps_rollup(process_id)
+        if usage is None:
+            return None
+        usage["shared_fraction"] = round(usage["shared_kb"] / usage["rss_kb"], 3) if usage["rss_kb"] else 0.0
+        return {"pid": process_id, **usage}
+
+    master = describe(parent) if under_gunicorn else None
+    workers = [entry for entry in map(describe, worker_pids) if entry is not None]
+    group = workers + ([master] if master else [])
+    totals = {key: sum(entry[key] for entry in group) for key in _FIELDS}
+    return {"available": True, "pid": pid, "master": master, "workers": workers, "totals": totals}
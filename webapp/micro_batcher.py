@@ -0,0 +1,238 @@
+"""
+Request coalescing for the Flask web app.
+
+Each upload or API call used to run its own tiny forward pass, so many small
+concurrent requests spent most of their time in per-call overhead. The
+``MicroBatcher`` queues campaigns from concurrent requests and scores them in
+one batched pass once ``max_batch_size`` rows are waiting or the oldest
+request has waited ``max_wait`` seconds, then hands every request its own
+slice of the results.
+
+Each request can pin the scorer it must be answered by (for example one
+model version's ``predict_probabilities``). Only requests pinned to the same
+scorer share a batch, so a model swap between ``submit`` and the flush never
+scores a request with a different model than the caller chose.
+
+Requests that are already at least ``max_batch_size`` rows are scored
+directly in the calling thread; coalescing would only delay them.
+
+Threads do not survive ``fork``, so a batcher created in a preloading
+gunicorn master starts a fresh background thread in each forked worker.
+"""
+
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+PredictFn = Callable[[List[Dict[str, object]]], Tuple[np.ndarray, List[Optional[str]]]]
+
+
+class _PendingRequest:
+    __slots__ = ("campaigns", "predict_fn", "enqueued_at", "done", "probabilities", "errors", "exception")
+
+    def __init__(self, campaigns: List[Dict[str, object]], predict_fn: PredictFn) -> None:
+        self.campaigns = campaigns
+        self.predict_fn = predict_fn
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.probabilities: Optional[np.ndarray] = None
+        self.errors: Optional[List[Optional[str]]] = None
+        self.exception: Optional[BaseException] = None
+
+
+class MicroBatcher:
+    """Coalesce concurrent prediction requests into batched forward passes."""
+
+    def __init__(
+        self,
+        predict_fn: Optional[PredictFn] = None,
+        *,
+        max_batch_size: int = 256,
+        max_wait: float = 0.005,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self._closed = False
+        self._start()
+        if hasattr(os, "register_at_fork"):
+            reference = weakref.ref(self)
+            os.register_at_fork(after_in_child=lambda: _restart_after_fork(reference))
+
+    def _start(self) -> None:
+        """Create the queue, counters and background thread."""
+
+        self._queue: Deque[_PendingRequest] = deque()
+        self._queued_rows = 0
+        self._condition = threading.Condition()
+
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._rows_scored = 0
+        self._requests = 0
+        self._direct_requests = 0
+        self._largest_batch = 0
+        self._flush_reasons = {"size": 0, "timeout": 0}
+        # Bucket upper bounds are powers of two up to max_batch_size.
+        self._size_buckets = [2 ** power for power in range(self.max_batch_size.bit_length())]
+        if self._size_buckets[-1] < self.max_batch_size:
+            self._size_buckets.append(self.max_batch_size)
+        self._size_histogram = [0] * len(self._size_buckets)
+
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self, campaigns: Sequence[Dict[str, object]], predict_fn: Optional[PredictFn] = None
+    ) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """Score ``campaigns`` and block until their results are ready.
+
+        Args:
+            campaigns: Campaign dictionaries.
+            predict_fn: Scorer to use instead of the batcher's default. Only
+                requests with an equal ``predict_fn`` are batched together.
+        """
+
+        campaigns = list(campaigns)
+        predict_fn = predict_fn or self.predict_fn
+        if predict_fn is None:
+            raise ValueError("MicroBatcher has no default predict_fn; pass one to submit()")
+        with self._stats_lock:
+            self._requests += 1
+        if not campaigns:
+            return np.empty(0, dtype=np.float64), []
+        if len(campaigns) >= self.max_batch_size:
+            with self._stats_lock:
+                self._direct_requests += 1
+            return predict_fn(campaigns)
+
+        pending = _PendingRequest(campaigns, predict_fn)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.append(pending)
+            self._queued_rows += len(campaigns)
+            self._condition.notify()
+
+        pending.done.wait()
+        if pending.exception is not None:
+            raise pending.exception
+        return pending.probabilities, pending.errors
+
+    def _take_batch(self) -> Tuple[List[_PendingRequest], str]:
+        """Wait for work, then collect requests until the size or wait limit is hit."""
+
+        with self._condition:
+            while not self._queue and not self._closed:
+                self._condition.wait()
+            if not self._queue:
+                return [], "closed"
+
+            deadline = self._queue[0].enqueued_at + self.max_wait
+            while self._queued_rows < self.max_batch_size and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            # Batch the oldest request with the next ones for the same scorer; the rest keep their order.
+            predict_fn = self._queue[0].predict_fn
+            batch: List[_PendingRequest] = []
+            waiting: Deque[_PendingRequest] = deque()
+            rows = 0
+            for request in self._queue:
+                if request.predict_fn == predict_fn and (
+                    not batch or rows + len(request.campaigns) <= self.max_batch_size
+                ):
+                    batch.append(request)
+                    rows += len(request.campaigns)
+                else:
+                    waiting.append(request)
+            self._queue = waiting
+            self._queued_rows -= rows
+            reason = "size" if rows >= self.max_batch_size or self._queue else "timeout"
+            return batch, reason
+
+    def _run(self) -> None:
+        while True:
+            batch, reason = self._take_batch()
+            if not batch:
+                return
+
+            campaigns = [campaign for request in batch for campaign in request.campaigns]
+            try:
+                probabilities, errors = batch[0].predict_fn(campaigns)
+            except BaseException as exc:  # Surface the failure to every waiting request.
+                for request in batch:
+                    request.exception = exc
+                    request.done.set()
+                continue
+
+            offset = 0
+            for request in batch:
+                size = len(request.campaigns)
+                request.probabilities = probabilities[offset : offset + size]
+                request.errors = errors[offset : offset + size]
+                offset += size
+                request.done.set()
+            self._record_batch(len(campaigns), reason)
+
+    def _record_batch(self, size: int, reason: str) -> None:
+        with self._stats_lock:
+            self._batches += 1
+            self._rows_scored += size
+            self._largest_batch = max(self._largest_batch, size)
+            self._flush_reasons[reason] += 1
+            for index, upper_bound in enumerate(self._size_buckets):
+                if size <= upper_bound:
+                    self._size_histogram[index] += 1
+                    break
+
+    def stats(self) -> Dict[str, object]:
+        """Return queue depth and batch-size metrics."""
+
+        with self._condition:
+            queue_depth = len(self._queue)
+            queued_rows = self._queued_rows
+        with self._stats_lock:
+            return {
+                "queue_depth": queue_depth,
+                "queued_rows": queued_rows,
+                "requests": self._requests,
+                "direct_requests": self._direct_requests,
+                "batches": self._batches,
+                "rows_scored": self._rows_scored,
+                "mean_batch_size": self._rows_scored / self._batches if self._batches else 0.0,
+                "largest_batch": self._largest_batch,
+                "flush_reasons": dict(self._flush_reasons),
+                "batch_size_histogram": {
+                    f"<={upper_bound}": count
+                    for upper_bound, count in zip(self._size_buckets, self._size_histogram)
+                },
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+    def close(self) -> None:
+        """Score anything still queued, then stop the background thread."""
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+
+def _restart_after_fork(reference: "weakref.ref[MicroBatcher]") -> None:
+    """Give a forked child its own queue and background thread."""
+
+    batcher = reference()
+    if batcher is not None and not batcher._closed:
+        batcher._start()